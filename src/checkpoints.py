@@ -0,0 +1,177 @@
+"""
+Periodic, atomic training checkpoints and resume for ``train.py``.
+
+A checkpoint directory holds one zip per save (SB3's format: policy weights,
+optimizer state and the step counter), the matching ``VecNormalize`` stats when
+the run normalizes, and ``latest.json`` naming the newest complete pair, plus
+any extra training state (e.g. the curriculum stage) under ``"state"``::
+
+    checkpoints/parallel_1/
+        ckpt_000020480.zip
+        vecnormalize_000020480.pkl
+        latest.json
+
+Every file is written to a temporary name and renamed into place, and
+``latest.json`` is replaced last, so a run killed mid-save still resumes from
+the previous checkpoint.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import VecEnv, VecNormalize
+
+
+MANIFEST = "latest.json"
+
+
+def _replace(tmp: Path, final: Path) -> None:
+    with open(tmp, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, final)
+
+
+def save_checkpoint(
+    model,
+    ckpt_dir: str | Path,
+    *,
+    run_name: str,
+    keep: int = 3,
+    state: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """
+    Write ``model`` (and its VecNormalize, if any) and point ``latest.json`` at it.
+    ``state`` (JSON-friendly) is stored in the manifest for ``resolve_checkpoint``.
+    """
+    ckpt_dir = Path(ckpt_dir)
+    ckpt_dir.mkdir(parents=True, exist_ok=True)
+    step = int(model.num_timesteps)
+
+    model_path = ckpt_dir / f"ckpt_{step:09d}.zip"
+    tmp = model_path.with_name(model_path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        model.save(f)
+    _replace(tmp, model_path)
+
+    vecnorm_name = None
+    vecnorm = model.get_vec_normalize_env()
+    if vecnorm is not None:
+        vecnorm_path = ckpt_dir / f"vecnormalize_{step:09d}.pkl"
+        tmp = vecnorm_path.with_name(vecnorm_path.name + ".tmp")
+        vecnorm.save(str(tmp))
+        _replace(tmp, vecnorm_path)
+        vecnorm_name = vecnorm_path.name
+
+    manifest = {
+        "step": step,
+        "model": model_path.name,
+        "vecnormalize": vecnorm_name,
+        "run_name": run_name,
+    }
+    if state:
+        manifest["state"] = state
+    tmp = ckpt_dir / (MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    _replace(tmp, ckpt_dir / MANIFEST)
+
+    if keep > 0:
+        _prune(ckpt_dir, keep)
+    return model_path
+
+
+def _prune(ckpt_dir: Path, keep: int) -> None:
+    for pattern in ("ckpt_*.zip", "vecnormalize_*.pkl"):
+        for old in sorted(ckpt_dir.glob(pattern))[:-keep]:
+            old.unlink(missing_ok=True)
+
+
+def resolve_checkpoint(path: str | Path) -> Tuple[Path, Optional[Path], Dict[str, Any]]:
+    """
+    Return ``(model_zip, vecnormalize_pkl or None, manifest)`` for a checkpoint
+    directory (via ``latest.json``) or a single ``ckpt_*.zip``.
+    """
+    path = Path(path)
+    if path.is_dir():
+        manifest_path = path / MANIFEST
+        if not manifest_path.is_file():
+            raise FileNotFoundError(f"no {MANIFEST} in {path}")
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        vecnorm = manifest.get("vecnormalize")
+        return path / manifest["model"], (path / vecnorm) if vecnorm else None, manifest
+    if not path.is_file():
+        raise FileNotFoundError(path)
+    step = path.stem.rpartition("_")[2]
+    vecnorm = path.with_name(f"vecnormalize_{step}.pkl")
+    return path, vecnorm if vecnorm.is_file() else None, {"model": path.name}
+
+
+def load_checkpoint(path: str | Path, venv: VecEnv, **kwargs: Any):
+    """
+    Load a PPO checkpoint onto ``venv``. If the checkpoint has VecNormalize stats,
+    ``venv`` is wrapped with them (training mode on). Returns ``(model, venv)``.
+    """
+    from stable_baselines3 import PPO
+
+    model_path, vecnorm_path, _ = resolve_checkpoint(path)
+    if isinstance(venv, VecNormalize):
+        venv = venv.venv
+    if vecnorm_path is not None:
+        venv = VecNormalize.load(str(vecnorm_path), venv)
+        venv.training = True
+    model = PPO.load(model_path, env=venv, **kwargs)
+    return model, venv
+
+
+class CheckpointCallback(BaseCallback):
+    """
+    Save every ``save_freq`` timesteps. Saves happen at rollout boundaries, right
+    after a policy update, so a resumed run starts a fresh rollout from a
+    consistent policy/optimizer state.
+    """
+
+    def __init__(
+        self,
+        ckpt_dir: str | Path,
+        save_freq: int,
+        *,
+        run_name: str,
+        keep: int = 3,
+        state: Optional[Dict[str, Callable[[], Any]]] = None,
+        verbose: int = 0,
+    ):
+        super().__init__(verbose)
+        # name -> callable returning JSON-friendly state saved with each checkpoint.
+        self.state = dict(state or {})
+        self.ckpt_dir = Path(ckpt_dir)
+        self.save_freq = save_freq
+        self.run_name = run_name
+        self.keep = keep
+        self._last_save = 0
+
+    def _on_training_start(self) -> None:
+        self._last_save = self.model.num_timesteps
+
+    def _on_rollout_start(self) -> None:
+        if self.save_freq > 0 and self.model.num_timesteps - self._last_save >= self.save_freq:
+            self._save()
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_training_end(self) -> None:
+        if self.model.num_timesteps != self._last_save:
+            self._save()
+
+    def _save(self) -> None:
+        state = {name: get() for name, get in self.state.items()}
+        path = save_checkpoint(self.model, self.ckpt_dir, run_name=self.run_name, keep=self.keep, state=state)
+        self._last_save = self.model.num_timesteps
+        if self.verbose:
+            print(f"checkpoint: {path}")
@@ -0,0 +1,164 @@
+"""
+Client side of ``server.py``: an asyncio connection that mirrors a session's
+state from the server's diffs, and a small pygame viewer built on it.
+
+    python server.py &
+    python client.py --seed 7
+
+Viewer keys: arrows move, z next bench tile, x place, c pick up, d dump.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from game.main import GameConfig
+from game.src.game.cursor import (
+    DUMP,
+    MOVE_DOWN,
+    MOVE_LEFT,
+    MOVE_RIGHT,
+    MOVE_UP,
+    NEXT_TILE,
+    PICK_UP,
+    PLACE,
+)
+
+
+class RemoteState:
+    """Local mirror of one session, kept current by applying diffs."""
+
+    def __init__(self, state: Dict[str, Any]):
+        self.cells: Dict[Tuple[int, int], str] = {(r, c): ch for r, c, ch in state["cells"]}
+        self.bench: str = state["bench"]
+        self.valid = bool(state["valid"])
+        self.victory = bool(state["win"])
+        self.bank: int = state["bank"]
+        self.cursor: List[int] = list(state["cur"])
+
+    def apply(self, diff: Dict[str, Any]) -> None:
+        for r, c in diff.get("del", ()):
+            self.cells.pop((r, c), None)
+        for r, c, ch in diff.get("add", ()):
+            self.cells[(r, c)] = ch
+        if "bench" in diff:
+            self.bench = diff["bench"]
+        if "valid" in diff:
+            self.valid = bool(diff["valid"])
+        if "win" in diff:
+            self.victory = bool(diff["win"])
+        if "bank" in diff:
+            self.bank = diff["bank"]
+        if "cur" in diff:
+            self.cursor = list(diff["cur"])
+
+
+class GameClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765) -> "GameClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, **msg: Any) -> Dict[str, Any]:
+        msg["id"] = next(self._ids)
+        async with self._lock:
+            self._writer.write(json.dumps(msg, separators=(",", ":")).encode() + b"\n")
+            await self._writer.drain()
+            reply = json.loads(await self._reader.readline())
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "request failed"))
+        return reply
+
+    async def new_session(self, seed: Optional[int] = None, tiles: int = 21, sparse: bool = False):
+        reply = await self.request(op="new", seed=seed, tiles=tiles, sparse=sparse)
+        return reply["session"], RemoteState(reply["state"])
+
+    async def act(self, session: int, *actions: int) -> Dict[str, Any]:
+        reply = await self.request(op="act", session=session, actions=list(actions))
+        return reply["diff"]
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def view(host: str, port: int, seed: Optional[int], tiles: int) -> None:
+    import pygame
+
+    keymap = {
+        pygame.K_UP: MOVE_UP,
+        pygame.K_DOWN: MOVE_DOWN,
+        pygame.K_LEFT: MOVE_LEFT,
+        pygame.K_RIGHT: MOVE_RIGHT,
+        pygame.K_z: NEXT_TILE,
+        pygame.K_x: PLACE,
+        pygame.K_c: PICK_UP,
+        pygame.K_d: DUMP,
+    }
+    client = await GameClient.connect(host, port)
+    session, state = await client.new_session(seed=seed, tiles=tiles)
+
+    pygame.init()
+    screen = pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+    font = pygame.font.Font(None, 24)
+    d = GameConfig.DIVIDER
+    running = True
+    try:
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key in keymap:
+                    state.apply(await client.act(session, keymap[event.key]))
+
+            screen.fill(GameConfig.BACKGROUND_COLOR)
+            if state.victory:
+                tile_color = "yellow"
+            else:
+                tile_color = "green" if state.valid else "red"
+            for (r, c), ch in state.cells.items():
+                rect = pygame.Rect(c * d, r * d, d - 2, d - 2)
+                pygame.draw.rect(screen, tile_color, rect)
+                text = font.render(ch, True, GameConfig.FONT_COLOR)
+                screen.blit(text, text.get_rect(center=rect.center))
+            row, col, selected = state.cursor
+            pygame.draw.rect(screen, "red", pygame.Rect(col * d, row * d, d, d), 2)
+            y = GameConfig.SCREEN_HEIGHT - GameConfig.BENCH_HEIGHT + 30
+            for k, ch in enumerate(state.bench):
+                rect = pygame.Rect(20 + k * 25, y, 20, 20)
+                pygame.draw.rect(screen, GameConfig.TILE_COLOR, rect)
+                if k == selected:
+                    pygame.draw.rect(screen, "red", rect, 2)
+                text = font.render(ch, True, GameConfig.FONT_COLOR)
+                screen.blit(text, text.get_rect(center=rect.center))
+            info = font.render(f"bank: {state.bank}", True, "white")
+            screen.blit(info, (GameConfig.SCREEN_WIDTH - 150, y))
+            pygame.display.flip()
+            await asyncio.sleep(1 / 60)
+    finally:
+        pygame.quit()
+        await client.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Play a BananaGraml server session in a pygame window.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--tiles", type=int, default=21)
+    args = parser.parse_args(argv)
+    asyncio.run(view(args.host, args.port, args.seed, args.tiles))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Curriculum for PPO training: a list of stages, easiest first, promoted on the
+rolling success rate (``info["is_success"]``, i.e. the bank was emptied) of
+episodes played under the current stage.
+
+Stages are applied to every env in the running ``VecEnv`` through
+``env_method("set_curriculum", ...)``, so envs, buffers and the policy are kept;
+each env picks the new stage up at its next reset. Set ``"curriculum"`` in the
+training JSON::
+
+    "curriculum": [
+        {"starting_tiles_on_bench": 4, "board_limit": [9, 15], "promote_at": 0.5,
+         "letter_counts": {"A": 3, "E": 3, "I": 2, "O": 2, "T": 3, "S": 3, "R": 2, "N": 2}},
+        {"starting_tiles_on_bench": 8, "board_limit": [13, 25], "promote_at": 0.3},
+        {"starting_tiles_on_bench": 21}
+    ]
+
+``letter_counts`` replaces the tile distribution (standard set when omitted) and
+``board_limit`` keeps the crosshair inside a centred (rows, cols) region.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import VecEnv
+
+
+@dataclass(frozen=True)
+class CurriculumStage:
+    starting_tiles_on_bench: int
+    letter_counts: Optional[Dict[str, int]] = None
+    board_limit: Optional[Tuple[int, int]] = None
+    # Promote once the success rate over the last min_episodes episodes reaches this.
+    promote_at: float = 0.5
+    min_episodes: int = 100
+
+    def env_kwargs(self) -> Dict[str, Any]:
+        return {
+            "starting_tiles_on_bench": self.starting_tiles_on_bench,
+            "letter_counts": self.letter_counts,
+            "board_limit": self.board_limit,
+        }
+
+
+def parse_stages(raw: Sequence[Mapping[str, Any]]) -> List[CurriculumStage]:
+    stages = []
+    for i, entry in enumerate(raw):
+        unknown = set(entry) - set(CurriculumStage.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"curriculum stage {i}: unknown keys {sorted(unknown)}")
+        letter_counts = entry.get("letter_counts")
+        board_limit = entry.get("board_limit")
+        stage = CurriculumStage(
+            starting_tiles_on_bench=int(entry["starting_tiles_on_bench"]),
+            letter_counts=None
+            if letter_counts is None
+            else {str(k).upper(): int(v) for k, v in letter_counts.items()},
+            board_limit=None if board_limit is None else (int(board_limit[0]), int(board_limit[1])),
+            promote_at=float(entry.get("promote_at", 0.5)),
+            min_episodes=int(entry.get("min_episodes", 100)),
+        )
+        if stage.letter_counts is not None and sum(stage.letter_counts.values()) < stage.starting_tiles_on_bench:
+            raise ValueError(f"curriculum stage {i}: letter_counts hold fewer tiles than starting_tiles_on_bench")
+        if stage.min_episodes < 1:
+            raise ValueError(f"curriculum stage {i}: min_episodes must be at least 1")
+        stages.append(stage)
+    if not stages:
+        raise ValueError("curriculum needs at least one stage")
+    return stages
+
+
+class CurriculumScheduler:
+    """Tracks the current stage's rolling success rate and decides promotions."""
+
+    def __init__(self, stages: Sequence[CurriculumStage], start: int = 0, results: Sequence[bool] = ()):
+        self.stages = list(stages)
+        self.index = min(max(start, 0), len(self.stages) - 1)
+        self._results: deque = deque((bool(r) for r in results), maxlen=self.stage.min_episodes)
+
+    def state(self) -> Dict[str, Any]:
+        """JSON-friendly stage and success window, for checkpoints (``from_state``)."""
+        return {"index": self.index, "results": [int(r) for r in self._results]}
+
+    @classmethod
+    def from_state(cls, stages: Sequence[CurriculumStage], state: Optional[Mapping[str, Any]]) -> "CurriculumScheduler":
+        if not state:
+            return cls(stages)
+        return cls(stages, int(state.get("index", 0)), state.get("results", ()))
+
+    @property
+    def stage(self) -> CurriculumStage:
+        return self.stages[self.index]
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        return sum(self._results) / len(self._results) if self._results else None
+
+    def record(self, success: bool) -> bool:
+        """Record one finished episode; True when this promoted to the next stage."""
+        self._results.append(bool(success))
+        if (
+            self.index + 1 < len(self.stages)
+            and len(self._results) >= self.stage.min_episodes
+            and self.success_rate >= self.stage.promote_at
+        ):
+            self.index += 1
+            self._results = deque(maxlen=self.stage.min_episodes)
+            return True
+        return False
+
+
+class CurriculumCallback(BaseCallback):
+    """
+    Feeds finished episodes to a ``CurriculumScheduler`` and pushes promotions to
+    the training envs. Call ``apply(venv)`` once before ``learn()`` so the first
+    episodes already run the first stage (SB3 resets the envs before callbacks start).
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[CurriculumStage],
+        start: int = 0,
+        verbose: int = 0,
+        *,
+        state: Optional[Mapping[str, Any]] = None,
+    ):
+        super().__init__(verbose)
+        # state: CurriculumScheduler.state() from a checkpoint; overrides start.
+        self.scheduler = (
+            CurriculumScheduler.from_state(stages, state) if state is not None else CurriculumScheduler(stages, start)
+        )
+
+    def state(self) -> Dict[str, Any]:
+        return self.scheduler.state()
+
+    def apply(self, venv: VecEnv) -> None:
+        venv.env_method("set_curriculum", stage=self.scheduler.index, **self.scheduler.stage.env_kwargs())
+
+    def _on_step(self) -> bool:
+        current = self.scheduler.index
+        for done, info in zip(self.locals["dones"], self.locals["infos"]):
+            # Episodes begun under an earlier stage don't count toward this one.
+            if done and info.get("curriculum_stage", current) == current:
+                if self.scheduler.record(info.get("is_success", False)):
+                    self.apply(self.training_env)
+                    if self.verbose:
+                        print(f"curriculum: stage {self.scheduler.index} at {self.num_timesteps} steps")
+                    break
+        self.logger.record("curriculum/stage", self.scheduler.index)
+        rate = self.scheduler.success_rate
+        if rate is not None:
+            self.logger.record("curriculum/success_rate", rate)
+        return True
@@ -0,0 +1,314 @@
+"""
+Generate ``(obs, action, reward, done)`` transitions from headless
+``BananaGramlEnvironment`` games for imitation pretraining.
+
+Games run across a process pool. Each shard is a fixed batch of episodes with
+its own seed range, written atomically and recorded in ``index.json`` once
+complete, so an interrupted run resumes from the first missing shard::
+
+    python datagen.py --out data/random --shards 64 --episodes-per-shard 16 --workers 8
+
+Policies are pluggable: ``--policy random`` or ``--policy package.module:factory``
+where ``factory(seed)`` returns a callable ``policy(obs, env) -> action``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from training_config import TrainingConfig, env_kwargs, load_training_config
+
+
+INDEX_FILE = "index.json"
+OBS_KEYS = ("board_grid", "bench_letters", "cross_hair_position", "board_valid")
+SHARD_FORMATS = ("npz", "npy")
+
+Policy = Callable[[Dict[str, Any], Any], int]
+
+
+@dataclass(frozen=True)
+class ShardTask:
+    shard_id: int
+    episodes: int
+    seed: int
+    policy: str
+    fmt: str
+    out_dir: str
+    max_episode_steps: int
+    env_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+def obs_keys(cfg: TrainingConfig) -> Tuple[str, ...]:
+    """Observation keys of the env ``cfg`` describes (``OBS_KEYS`` plus optional ones)."""
+    return OBS_KEYS + (("bench_utility",) if cfg.dump_helper else ())
+
+
+def random_policy(seed: int) -> Policy:
+    rng = np.random.default_rng(seed)
+
+    def _act(obs: Dict[str, Any], env) -> int:
+        return int(rng.integers(env.action_space.n))
+
+    return _act
+
+
+_BUILTIN_POLICIES = {"random": random_policy}
+
+
+def load_policy(spec: str, seed: int) -> Policy:
+    """Resolve ``random`` or ``module:factory`` into a policy callable."""
+    if spec in _BUILTIN_POLICIES:
+        return _BUILTIN_POLICIES[spec](seed)
+    if ":" not in spec:
+        raise ValueError(f"Unknown policy {spec!r}; use one of {sorted(_BUILTIN_POLICIES)} or module:factory")
+    module_name, attr = spec.split(":", 1)
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory(seed)
+
+
+def shard_name(shard_id: int, fmt: str) -> str:
+    base = f"shard_{shard_id:06d}"
+    return base + ".npz" if fmt == "npz" else base
+
+
+def init_headless_worker() -> None:
+    # Workers never open a window; must be set before pygame initialises.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def _play_episodes(task: ShardTask) -> Dict[str, np.ndarray]:
+    from env import BananaGramlEnvironment
+
+    env = BananaGramlEnvironment(render_mode=None, **task.env_kwargs)
+    policy = load_policy(task.policy, task.seed)
+    keys = tuple(env.observation_space.spaces)
+    columns: Dict[str, List[Any]] = {f"obs_{k}": [] for k in keys}
+    columns.update(action=[], reward=[], done=[])
+    try:
+        for ep in range(task.episodes):
+            obs, _ = env.reset(seed=task.seed + ep)
+            for t in range(task.max_episode_steps):
+                action = policy(obs, env)
+                # env reuses its observation buffers, so copy before stepping.
+                for k in keys:
+                    columns[f"obs_{k}"].append(np.array(obs[k], copy=True))
+                obs, reward, terminated, truncated, _ = env.step(action)
+                done = terminated or truncated or t == task.max_episode_steps - 1
+                columns["action"].append(action)
+                columns["reward"].append(reward)
+                columns["done"].append(done)
+                if terminated or truncated:
+                    break
+    finally:
+        env.close()
+
+    arrays = {f"obs_{k}": np.stack(columns[f"obs_{k}"]) for k in keys}
+    arrays["action"] = np.asarray(columns["action"], dtype=np.int64)
+    arrays["reward"] = np.asarray(columns["reward"], dtype=np.float32)
+    arrays["done"] = np.asarray(columns["done"], dtype=np.bool_)
+    return arrays
+
+
+def write_shard(arrays: Dict[str, np.ndarray], out_dir: Path, shard_id: int, fmt: str) -> Path:
+    """
+    Write one shard atomically: a temporary file/dir is renamed into place, so a
+    crash never leaves a truncated shard behind under its final name.
+    """
+    final = out_dir / shard_name(shard_id, fmt)
+    tmp = out_dir / (".tmp_" + final.name)
+    if fmt == "npz":
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, final)
+    else:
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir()
+        for key, arr in arrays.items():
+            np.save(tmp / f"{key}.npy", arr)
+        if final.exists():
+            shutil.rmtree(final)
+        os.replace(tmp, final)
+    return final
+
+
+def _run_task(task: ShardTask) -> Dict[str, Any]:
+    arrays = _play_episodes(task)
+    path = write_shard(arrays, Path(task.out_dir), task.shard_id, task.fmt)
+    return {
+        "shard_id": task.shard_id,
+        "path": path.name,
+        "transitions": int(arrays["action"].shape[0]),
+        "episodes": int(arrays["done"].sum()),
+        "seed": task.seed,
+    }
+
+
+def load_index(out_dir: Path) -> Dict[str, Any]:
+    path = out_dir / INDEX_FILE
+    if not path.is_file():
+        return {"shards": []}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_index(out_dir: Path, index: Dict[str, Any]) -> None:
+    tmp = out_dir / (INDEX_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp, out_dir / INDEX_FILE)
+
+
+def resume_index(out_dir: Path, index: Dict[str, Any], **settings: Any) -> None:
+    """
+    Record ``settings`` in ``index``. Shards already written under other
+    settings (another seed, policy, env config or observation layout) can't be
+    mixed with new ones, so a mismatch on resume raises instead.
+    """
+    # as index.json will hold them (tuples come back as lists).
+    settings = json.loads(json.dumps(settings))
+    if index["shards"]:
+        changed = []
+        for key, value in settings.items():
+            old = index.get(key, value)
+            if isinstance(old, dict) and isinstance(value, dict):
+                changed += [
+                    f"{key}.{k}: {old.get(k)!r} -> {value.get(k)!r}"
+                    for k in sorted(set(old) | set(value))
+                    if old.get(k) != value.get(k)
+                ]
+            elif old != value:
+                changed.append(f"{key}: {old!r} -> {value!r}")
+        if changed:
+            raise ValueError(f"{out_dir} holds shards made with other settings ({'; '.join(changed)})")
+    index.update(settings)
+
+
+def pending_tasks(
+    out_dir: Path,
+    index: Dict[str, Any],
+    *,
+    shards: int,
+    episodes_per_shard: int,
+    base_seed: int,
+    policy: str,
+    fmt: str,
+    cfg: TrainingConfig,
+) -> Iterator[ShardTask]:
+    done = {s["shard_id"] for s in index["shards"]}
+    for shard_id in range(shards):
+        if shard_id in done:
+            continue
+        yield ShardTask(
+            shard_id=shard_id,
+            episodes=episodes_per_shard,
+            # Disjoint seed ranges per shard keep resumed runs identical to uninterrupted ones.
+            seed=base_seed + shard_id * episodes_per_shard,
+            policy=policy,
+            fmt=fmt,
+            out_dir=str(out_dir),
+            max_episode_steps=cfg.max_episode_steps,
+            env_kwargs=env_kwargs(cfg),
+        )
+
+
+def generate(
+    out_dir: Path,
+    *,
+    shards: int,
+    episodes_per_shard: int,
+    workers: int,
+    base_seed: int = 0,
+    policy: str = "random",
+    fmt: str = "npz",
+    cfg: Optional[TrainingConfig] = None,
+) -> Dict[str, Any]:
+    if fmt not in SHARD_FORMATS:
+        raise ValueError(f"fmt must be one of {SHARD_FORMATS}, got {fmt!r}")
+    if cfg is None:
+        cfg = load_training_config()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    index = load_index(out_dir)
+    resume_index(
+        out_dir,
+        index,
+        format=fmt,
+        policy=policy,
+        obs_keys=list(obs_keys(cfg)),
+        episodes_per_shard=episodes_per_shard,
+        base_seed=base_seed,
+        env_kwargs=env_kwargs(cfg),
+        max_episode_steps=cfg.max_episode_steps,
+    )
+    tasks = list(
+        pending_tasks(
+            out_dir,
+            index,
+            shards=shards,
+            episodes_per_shard=episodes_per_shard,
+            base_seed=base_seed,
+            policy=policy,
+            fmt=fmt,
+            cfg=cfg,
+        )
+    )
+    if not tasks:
+        save_index(out_dir, index)
+        return index
+
+    # spawn: forked workers would inherit the parent's pygame and RNG state.
+    ctx = get_context("spawn")
+    with ctx.Pool(processes=max(1, workers), initializer=init_headless_worker) as pool:
+        for entry in pool.imap_unordered(_run_task, tasks):
+            index["shards"].append(entry)
+            index["shards"].sort(key=lambda s: s["shard_id"])
+            save_index(out_dir, index)
+            print(
+                f"shard {entry['shard_id']:06d}: {entry['transitions']} transitions "
+                f"({len(index['shards'])}/{shards})"
+            )
+    return index
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate BananaGraml transitions for imitation pretraining.")
+    parser.add_argument("--out", type=str, required=True, help="Output directory for shards and index.json.")
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--episodes-per-shard", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0, help="Base seed; shard k uses seeds from seed + k * episodes-per-shard.")
+    parser.add_argument("--policy", type=str, default="random", help="'random' or module:factory.")
+    parser.add_argument("--format", type=str, default="npz", choices=SHARD_FORMATS,
+                        help="npz: compressed; npy: one raw .npy per key, memory-mappable.")
+    parser.add_argument("--config", type=str, default=None, help="Training JSON for env settings.")
+    args = parser.parse_args(argv)
+
+    cfg = load_training_config(args.config)
+    index = generate(
+        Path(args.out),
+        shards=args.shards,
+        episodes_per_shard=args.episodes_per_shard,
+        workers=args.workers,
+        base_seed=args.seed,
+        policy=args.policy,
+        fmt=args.format,
+        cfg=cfg,
+    )
+    total = sum(s["transitions"] for s in index["shards"])
+    print(f"{len(index['shards'])} shards, {total} transitions in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import math
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import gymnasium as gym
 import numpy as np
@@ -7,7 +8,8 @@ import pygame
 import pygame.locals as locals
 
 from game.main import Game, GameConfig
-from game.src.game.model import BananaGramlModel
+from game.src.game.model import BananaGramlModel, is_word
+from env_metrics import EnvMetrics
 
 
 
@@ -51,15 +53,113 @@ board_dimensions = (
 _BOARD_COLS = math.floor(GameConfig.BOARD_WIDTH // GameConfig.DIVIDER)
 _BOARD_ROWS = math.floor(GameConfig.BOARD_HEIGHT // GameConfig.DIVIDER)
 
-# Fast A–Z / a–z → 1–26 for observation encoding (avoids branches per cell).
-_LETTER_LUT = np.zeros(256, dtype=np.float32)
-for _c in range(ord("A"), ord("Z") + 1):
-    _LETTER_LUT[_c] = float(_c - ord("A") + 1)
-for _c in range(ord("a"), ord("z") + 1):
-    _LETTER_LUT[_c] = float(_c - ord("a") + 1)
-
 _BOARD_VALID_OBS = (np.int64(0), np.int64(1))
 
+_BOARD_BACKENDS = ("dense", "sparse")
+
+# "codes": (rows, cols) float32 of letter codes 1–26 (0 empty).
+# "onehot": (26, rows, cols) uint8 planes, plane k set where letter k+1 sits (for CNN policies).
+_BOARD_ENCODINGS = ("codes", "onehot")
+
+_ONE_HOT_CODES = np.arange(1, 27, dtype=np.uint8).reshape(26, 1, 1)
+
+# dtype of board_grid ("codes"), bench_letters and grid-index crosshairs.
+# uint8 stores a quarter of the bytes in rollout buffers and between workers.
+_OBS_DTYPES = {"float32": np.float32, "uint8": np.uint8}
+
+# "pixels": top-left pixel of the crosshair (as Game.cross_hair_position).
+# "normalized": the same divided by the screen size, in [0, 1].
+# "cell": (col, row) grid index.
+_CROSSHAIR_UNITS = ("pixels", "normalized", "cell")
+
+_CROSSHAIR_CELLS = (
+    GameConfig.SCREEN_WIDTH // GameConfig.DIVIDER,
+    GameConfig.SCREEN_HEIGHT // GameConfig.DIVIDER,
+)
+
+
+def _encode_board_codes(model: BananaGramlModel, out: np.ndarray) -> np.ndarray:
+    """
+    Copy the model's letter codes into ``out`` (any numeric dtype). Codes are
+    looked up once per tile when it is placed (``model.letter_codes``), so this
+    is an array copy, not a walk over the cells.
+    """
+    sparse = model.sparse_board
+    if sparse is not None:
+        return sparse.window_codes(out)
+    codes = model.letter_codes
+    if codes.shape != out.shape:
+        out.fill(0)
+        return out
+    np.copyto(out, codes)
+    return out
+
+
+def _crop_codes(codes: np.ndarray, row: int, col: int, out: np.ndarray) -> np.ndarray:
+    """
+    ``out.shape`` window of ``codes`` with (row, col) at its centre cell
+    (``out.shape // 2``, as ``SparseBoard.window_codes``). Off-board cells read 0.
+    """
+    out.fill(0)
+    h, w = out.shape
+    top, left = row - h // 2, col - w // 2
+    r0, c0 = max(top, 0), max(left, 0)
+    r1, c1 = min(top + h, codes.shape[0]), min(left + w, codes.shape[1])
+    if r0 < r1 and c0 < c1:
+        out[r0 - top : r1 - top, c0 - left : c1 - left] = codes[r0:r1, c0:c1]
+    return out
+
+
+def _encode_bench_codes(bench, out: np.ndarray) -> np.ndarray:
+    out.fill(0)
+    n = min(len(bench), out.shape[0])
+    if n:
+        out[:n] = np.fromiter((t.code for t in bench[:n]), dtype=np.uint8, count=n)
+    return out
+
+def observation_space(
+    max_bench_tiles: int,
+    *,
+    board_encoding: str = "codes",
+    obs_dtype: str = "float32",
+    crosshair_units: str = "pixels",
+    board_window: Optional[Tuple[int, int]] = None,
+    dump_helper: bool = False,
+) -> gym.spaces.Dict:
+    """The observation space of an env made with these options."""
+    dtype = _OBS_DTYPES[obs_dtype]
+    grid_shape = tuple(board_window) if board_window is not None else (_BOARD_ROWS, _BOARD_COLS)
+    if board_encoding == "onehot":
+        board_space = gym.spaces.Box(low=0, high=1, shape=(26, *grid_shape), dtype=np.uint8)
+    else:
+        board_space = gym.spaces.Box(low=0, high=26, shape=grid_shape, dtype=dtype)
+    if crosshair_units == "pixels":
+        cross_high, cross_dtype = (GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT), np.float32
+    elif crosshair_units == "normalized":
+        cross_high, cross_dtype = (1, 1), np.float32
+    else:
+        cross_high, cross_dtype = _CROSSHAIR_CELLS, dtype
+    spaces = {
+        "board_grid": board_space,
+        "bench_letters": gym.spaces.Box(
+            low=0,
+            high=26,
+            shape=(max_bench_tiles,),
+            dtype=dtype,
+        ),
+        "cross_hair_position": gym.spaces.Box(
+            low=np.zeros(2, dtype=cross_dtype),
+            high=np.array(cross_high, dtype=cross_dtype),
+            shape=(2,),
+            dtype=cross_dtype,
+        ),
+        "board_valid": gym.spaces.Discrete(2),
+    }
+    if dump_helper:
+        spaces["bench_utility"] = gym.spaces.Box(0.0, 1.0, shape=(max_bench_tiles,), dtype=np.float32)
+    return gym.spaces.Dict(spaces)
+
+
 _CURSOR_KEYS = (
     locals.K_UP,
     locals.K_DOWN,
@@ -69,7 +169,7 @@ _CURSOR_KEYS = (
 
 
 class BananaGramlEnvironment(gym.Env):
-    metadata = {"render_modes": ["human"], "render_fps": 60}
+    metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 60}
 
     def __init__(
         self,
@@ -77,17 +177,91 @@ class BananaGramlEnvironment(gym.Env):
         *,
         starting_tiles_on_bench: int = 10,
         max_bench_tiles: int = 32,
+        board_backend: str = "dense",
+        board_encoding: str = "codes",
+        obs_dtype: str = "float32",
+        crosshair_units: str = "pixels",
+        board_window: Optional[Tuple[int, int]] = None,
+        move_repeat: int = 1,
+        move_until_tile: bool = False,
+        dump_helper: bool = False,
+        record_dir: Optional[str] = None,
+        record_checkpoint_every: int = 100,
     ):
+        if render_mode is not None and render_mode not in self.metadata["render_modes"]:
+            raise ValueError(f"render_mode must be None or one of {self.metadata['render_modes']}, got {render_mode!r}")
         if max_bench_tiles < 1:
             raise ValueError("max_bench_tiles must be at least 1")
         if starting_tiles_on_bench < 0:
             raise ValueError("starting_tiles_on_bench must be non-negative")
+        if board_backend not in _BOARD_BACKENDS:
+            raise ValueError(f"board_backend must be one of {_BOARD_BACKENDS}, got {board_backend!r}")
+        if board_encoding not in _BOARD_ENCODINGS:
+            raise ValueError(f"board_encoding must be one of {_BOARD_ENCODINGS}, got {board_encoding!r}")
+        if obs_dtype not in _OBS_DTYPES:
+            raise ValueError(f"obs_dtype must be one of {tuple(_OBS_DTYPES)}, got {obs_dtype!r}")
+        if crosshair_units not in _CROSSHAIR_UNITS:
+            raise ValueError(f"crosshair_units must be one of {_CROSSHAIR_UNITS}, got {crosshair_units!r}")
+        if move_repeat < 1:
+            raise ValueError("move_repeat must be at least 1")
+        if board_window is not None:
+            board_window = tuple(int(n) for n in board_window)
+            if len(board_window) != 2 or min(board_window) < 1:
+                raise ValueError(f"board_window must be (rows, cols) >= 1, got {board_window!r}")
 
         self._max_bench_tiles = max_bench_tiles
-
-        self.model = BananaGramlModel(board_dimensions)
+        self._starting_tiles_on_bench = starting_tiles_on_bench
+        self._board_encoding = board_encoding
+        self._crosshair_units = crosshair_units
+        # Frame-skip for cursor moves: one move action goes move_repeat cells, or
+        # with move_until_tile up to the next tile / edge. Applied straight to the
+        # crosshair, with no per-cell events, snapshots or observations.
+        self._move_repeat = move_repeat
+        self._move_until_tile = move_until_tile
+        # Adds "bench_utility" (BananaGramlModel.tile_utilities, per bench slot)
+        # to the observation and action 7: dump the lowest-utility bench tile.
+        self._dump_helper = dump_helper
+        # Curriculum knobs (set_curriculum); take effect at the next reset().
+        self._pending_curriculum: Optional[Dict[str, Any]] = None
+        self._board_limit: Optional[Tuple[int, int, int, int]] = None
+        self._curriculum_stage: Optional[int] = None
+        self._applied_curriculum: Optional[Dict[str, Any]] = None
+
+        # Episode logs (replay.py): seed + one byte per action + state digests.
+        self._recorder = None
+        if record_dir is not None:
+            from replay import EpisodeRecorder
+
+            self._recorder = EpisodeRecorder.in_dir(
+                record_dir,
+                {
+                    "starting_tiles_on_bench": starting_tiles_on_bench,
+                    "max_bench_tiles": max_bench_tiles,
+                    "board_backend": board_backend,
+                    "board_encoding": board_encoding,
+                    "obs_dtype": obs_dtype,
+                    "crosshair_units": crosshair_units,
+                    "board_window": board_window,
+                    "move_repeat": move_repeat,
+                    "move_until_tile": move_until_tile,
+                    "dump_helper": dump_helper,
+                },
+                rendered=render_mode == "human",
+                checkpoint_every=record_checkpoint_every,
+            )
+        # Egocentric crop: board_grid is then a (rows, cols) window centred on
+        # the crosshair cell instead of the whole board.
+        self._board_window = board_window
+        grid_shape = board_window if board_window is not None else (_BOARD_ROWS, _BOARD_COLS)
+
+        # Placeholder deal; reset() reseeds the model from the env's np_random.
+        # "sparse": unbounded board; board_grid is then a window of the same
+        # shape cropped around the tile centroid.
+        self.model = BananaGramlModel(board_dimensions, sparse=board_backend == "sparse")
         self.model.init_bench(starting_tiles_on_bench)
-        self.game = Game(self.model)
+        # Only "human" opens a window. Otherwise the game draws offscreen (SDL
+        # dummy driver) and only when render() asks for an "rgb_array" frame.
+        self.game = Game(self.model, offscreen=render_mode != "human")
 
         """
         What are out observations:
@@ -97,30 +271,14 @@ class BananaGramlEnvironment(gym.Env):
         3. Valid words on the board
         4. The crosshair position
         """
-        self.observation_space = gym.spaces.Dict({
-            "board_grid": gym.spaces.Box(
-                low=0.0,
-                high=26.0,
-                shape=(_BOARD_ROWS, _BOARD_COLS),
-                dtype=np.float32,
-            ),
-            "bench_letters": gym.spaces.Box(
-                low=0.0,
-                high=26.0,
-                shape=(self._max_bench_tiles,),
-                dtype=np.float32,
-            ),
-            "cross_hair_position": gym.spaces.Box(
-                low=np.array([0.0, 0.0], dtype=np.float32),
-                high=np.array(
-                    [float(GameConfig.SCREEN_WIDTH), float(GameConfig.SCREEN_HEIGHT)],
-                    dtype=np.float32,
-                ),
-                shape=(2,),
-                dtype=np.float32,
-            ),
-            "board_valid": gym.spaces.Discrete(2),
-        })
+        self.observation_space = observation_space(
+            max_bench_tiles,
+            board_encoding=board_encoding,
+            obs_dtype=obs_dtype,
+            crosshair_units=crosshair_units,
+            board_window=board_window,
+            dump_helper=dump_helper,
+        )
 
         """
         These are all the possible actions the agent can take in 
@@ -132,18 +290,25 @@ class BananaGramlEnvironment(gym.Env):
         4. Move left 
         5. Interact with a tile
         7. Switch from bench to board
+        8. (dump_helper) Dump the least useful bench tile
         """
-        self.action_space = gym.spaces.Discrete(7)
+        self.action_space = gym.spaces.Discrete(8 if dump_helper else 7)
 
         self.render_mode = render_mode
 
         self.total_rewards = 0.0
         self._display_alive = True
+        # Running sums for MetricsCallback, collected through pop_metrics().
+        self.metrics = EnvMetrics()
+        self._episode_steps = 0
 
         # Reused each step to cut allocations (SB3 copies into its vec buffers).
-        self._board_grid_buf = np.zeros((_BOARD_ROWS, _BOARD_COLS), dtype=np.float32)
-        self._bench_buf = np.zeros((self._max_bench_tiles,), dtype=np.float32)
-        self._cross_buf = np.zeros((2,), dtype=np.float32)
+        spaces = self.observation_space
+        self._board_grid_buf = np.zeros(spaces["board_grid"].shape, dtype=spaces["board_grid"].dtype)
+        self._codes_buf = np.zeros(grid_shape, dtype=np.uint8)
+        self._bench_buf = np.zeros((self._max_bench_tiles,), dtype=spaces["bench_letters"].dtype)
+        self._utility_buf = np.zeros((self._max_bench_tiles,), dtype=np.float32)
+        self._cross_buf = np.zeros((2,), dtype=spaces["cross_hair_position"].dtype)
 
     def _compute_reward_delta(
         self, before: Dict[str, Any], after: Dict[str, Any], action: int
@@ -205,24 +370,28 @@ class BananaGramlEnvironment(gym.Env):
 
 
     def step(self, action):
+        started = time.perf_counter()
         action = int(action)
 
         before = self._reward_snapshot()
 
-        if action == 0:
-            self.move_cursor(0)
-        elif action == 1:
-            self.move_cursor(1)
-        elif action == 2:
-            self.move_cursor(2)
-        elif action == 3:
-            self.move_cursor(3)
+        if action in (0, 1, 2, 3):
+            if self._move_repeat > 1 or self._move_until_tile:
+                self.game.move_cross_hair(
+                    _CURSOR_KEYS[action],
+                    steps=self._move_repeat,
+                    until_tile=self._move_until_tile,
+                )
+            else:
+                self.move_cursor(action)
         elif action == 4:
             self.switch_focus_area()
         elif action in (5, 6):
             # Both indices post K_x (pick up, drop, or bench→board); kept as two IDs for
             # compatibility with policies trained with Discrete(7).
             self._press_interact_key()
+        elif action == 7:
+            self.game.dump_tile(self.model.dump_candidate())
 
         if self._display_alive:
             running = self.game.handle_events()
@@ -233,14 +402,45 @@ class BananaGramlEnvironment(gym.Env):
                 # handle_events() does not draw; without this the window stays black.
                 self.game.render()
 
+        if self._board_limit is not None:
+            self._clamp_cross_hair()
+
         after = self._reward_snapshot()
         reward, terminated, info = self._compute_reward_delta(before, after, action)
+        info["is_success"] = bool(self.model.victory)
+        if self._recorder is not None:
+            self._recorder.step(action, self)
+        if self._curriculum_stage is not None:
+            info["curriculum_stage"] = self._curriculum_stage
         self.total_rewards += reward
 
         obs = self._get_obs()
+        self._record_step_metrics(before, after, started)
         truncated = False
         return obs, reward, terminated, truncated, info
 
+    def _record_step_metrics(self, before: Dict[str, Any], after: Dict[str, Any], started: float) -> None:
+        m = self.metrics
+        self._episode_steps += 1
+        dn_board = after["_n_board"] - before["_n_board"]
+        m.add("placements", dn_board > 0)
+        m.add("pickups", dn_board < 0)
+        # A dump returns one tile to the bank and takes three.
+        m.add("dumps", dn_board == 0 and before["_n_bank"] - after["_n_bank"] == 2)
+        m.add("invalid_board", not after["board_valid"])
+        m.add("step_ms", (time.perf_counter() - started) * 1000.0)
+
+    def _record_episode_metrics(self) -> None:
+        m = self.metrics
+        m.add("episode_words", sum(1 for run in self.model.board_runs() if is_word(run)))
+        m.add("episode_tiles", len(self.model.tiles_on_board))
+        m.add("win_rate", bool(self.model.victory))
+        self._episode_steps = 0
+
+    def pop_metrics(self):
+        """Metric sums since the last call (see metrics.MetricsCallback)."""
+        return self.metrics.pop()
+
     def _press_interact_key(self) -> None:
         pygame.event.post(pygame.event.Event(locals.KEYDOWN, key=locals.K_x, mod=locals.KMOD_NONE))
 
@@ -260,61 +460,156 @@ class BananaGramlEnvironment(gym.Env):
         snap = m.get_game_state()
         snap["_n_board"] = len(m.tiles_on_board)
         snap["_n_bench"] = len(m.tiles_on_bench)
+        snap["_n_bank"] = m.tile_bank.get_current_size()
         snap["_victory"] = bool(m.victory)
         snap["_focus"] = g.focus_area
         snap["_holding"] = g.selected_tile is not None
         return snap
 
+    def _cursor_cell(self) -> Tuple[int, int]:
+        x, y = self.game.cross_hair_position
+        return int(y) // GameConfig.DIVIDER, int(x) // GameConfig.DIVIDER
+
+    def _observed_codes(self, out: np.ndarray) -> np.ndarray:
+        """Letter codes of the observed area into ``out``: the board, or the crosshair window."""
+        model = self.model
+        if self._board_window is None:
+            return _encode_board_codes(model, out)
+        row, col = self._cursor_cell()
+        if model.sparse_board is not None:
+            return model.sparse_board.window_codes(out, center=(row, col))
+        return _crop_codes(model.letter_codes, row, col, out)
+
     def _encode_board_grid(self) -> np.ndarray:
-        grid = self._board_grid_buf
-        grid.fill(0.0)
-        board = self.model.board
+        if self._board_encoding == "codes":
+            return self._observed_codes(self._board_grid_buf)
+        codes = self.model.letter_codes
         if (
-            len(board) != _BOARD_ROWS
-            or _BOARD_ROWS == 0
-            or len(board[0]) != _BOARD_COLS
+            self._board_window is not None
+            or self.model.sparse_board is not None
+            or codes.shape != self._codes_buf.shape
         ):
-            return grid
-        lut = _LETTER_LUT
-        for i in range(_BOARD_ROWS):
-            row = board[i]
-            grow = grid[i]
-            for j in range(_BOARD_COLS):
-                cell = row[j]
-                if cell is not None:
-                    ch = cell.get_value()
-                    if ch:
-                        grow[j] = lut[ord(ch[0])]
-        return grid
+            codes = self._observed_codes(self._codes_buf)
+        np.equal(codes, _ONE_HOT_CODES, out=self._board_grid_buf, casting="unsafe")
+        return self._board_grid_buf
 
     def _encode_bench_letters(self) -> np.ndarray:
-        buf = self._bench_buf
-        buf.fill(0.0)
-        bench = self.model.tiles_on_bench
-        n = min(len(bench), self._max_bench_tiles)
-        lut = _LETTER_LUT
-        for k in range(n):
-            ch = bench[k].get_value()
-            if ch:
-                buf[k] = lut[ord(ch[0])]
+        return _encode_bench_codes(self.model.tiles_on_bench, self._bench_buf)
+
+    def _encode_cross_hair(self) -> np.ndarray:
+        buf = self._cross_buf
+        x, y = self.game.cross_hair_position
+        if self._crosshair_units == "pixels":
+            buf[0], buf[1] = x, y
+        elif self._crosshair_units == "normalized":
+            buf[0] = min(x / GameConfig.SCREEN_WIDTH, 1.0)
+            buf[1] = min(y / GameConfig.SCREEN_HEIGHT, 1.0)
+        else:
+            row, col = self._cursor_cell()
+            buf[0] = min(col, _CROSSHAIR_CELLS[0])
+            buf[1] = min(row, _CROSSHAIR_CELLS[1])
+        return buf
+
+    def _encode_bench_utility(self) -> np.ndarray:
+        buf = self._utility_buf
+        utilities = self.model.tile_utilities()[: buf.shape[0]]
+        buf[: utilities.size] = utilities
+        buf[utilities.size :] = 0.0
         return buf
 
     def _get_obs(self) -> Dict[str, Any]:
-        pos = self.game.cross_hair_position
-        self._cross_buf[0] = float(pos[0])
-        self._cross_buf[1] = float(pos[1])
-        return {
+        obs = {
             "board_grid": self._encode_board_grid(),
             "bench_letters": self._encode_bench_letters(),
-            "cross_hair_position": self._cross_buf,
+            "cross_hair_position": self._encode_cross_hair(),
             "board_valid": _BOARD_VALID_OBS[1 if self.model.board_valid else 0],
         }
+        if self._dump_helper:
+            obs["bench_utility"] = self._encode_bench_utility()
+        return obs
+
+
+
+    def set_curriculum(
+        self,
+        starting_tiles_on_bench: int,
+        letter_counts: Optional[Mapping[str, int]] = None,
+        board_limit: Optional[Tuple[int, int]] = None,
+        stage: int = 0,
+    ) -> None:
+        """
+        Change the game for the next ``reset()`` without rebuilding the env
+        (called on every vec env through ``VecEnv.env_method``).
 
+        ``letter_counts`` replaces the standard tile distribution (None restores
+        it). ``board_limit`` (rows, cols) keeps the crosshair inside a centred
+        region of the board; observation shapes never change. ``stage`` is echoed
+        as ``info["curriculum_stage"]`` once it applies.
+        """
+        if starting_tiles_on_bench < 0:
+            raise ValueError("starting_tiles_on_bench must be non-negative")
+        if letter_counts is not None and sum(letter_counts.values()) < starting_tiles_on_bench:
+            raise ValueError("letter_counts must hold at least starting_tiles_on_bench tiles")
+        # As given, for replay logs.
+        args = {
+            "starting_tiles_on_bench": starting_tiles_on_bench,
+            "letter_counts": None if letter_counts is None else dict(letter_counts),
+            "board_limit": None if board_limit is None else list(board_limit),
+            "stage": stage,
+        }
+        if board_limit is not None:
+            rows, cols = (int(n) for n in board_limit)
+            # Rows/cols 0 and -1 stay off limits, like the solver and cursor.
+            rows = max(1, min(rows, _BOARD_ROWS - 2))
+            cols = max(1, min(cols, _BOARD_COLS - 2))
+            top = (_BOARD_ROWS - rows) // 2
+            left = (_BOARD_COLS - cols) // 2
+            board_limit = (top, top + rows - 1, left, left + cols - 1)
+        self._pending_curriculum = {
+            "starting_tiles_on_bench": starting_tiles_on_bench,
+            "letter_counts": None if letter_counts is None else dict(letter_counts),
+            "board_limit": board_limit,
+            "stage": stage,
+            "args": args,
+        }
 
+    def _clamp_cross_hair(self) -> None:
+        top, bottom, left, right = self._board_limit
+        d = GameConfig.DIVIDER
+        x, y = self.game.cross_hair_position
+        row = min(max(int(y) // d, top), bottom)
+        col = min(max(int(x) // d, left), right)
+        self.game.cross_hair_position = (col * d, row * d)
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
         self.total_rewards = 0.0
+        if self._recorder is not None:
+            self._recorder.end(self)
+        if self._episode_steps:
+            self._record_episode_metrics()
+        if self._pending_curriculum is not None:
+            stage = self._pending_curriculum
+            self._pending_curriculum = None
+            self._starting_tiles_on_bench = stage["starting_tiles_on_bench"]
+            self.model.letter_counts = stage["letter_counts"]
+            self._board_limit = stage["board_limit"]
+            self._curriculum_stage = stage["stage"]
+            self._applied_curriculum = stage["args"]
+        # The model's RNG is derived from gymnasium's np_random, so reset(seed=s)
+        # replays the same tile draws and later unseeded resets stay reproducible.
+        model_seed = int(self.np_random.integers(2**63 - 1))
+        if options and options.get("model_seed") is not None:
+            # Replays restart a logged game exactly.
+            model_seed = int(options["model_seed"])
+        self.model.reset(seed=model_seed, starting_tiles=self._starting_tiles_on_bench)
+        if self._recorder is not None:
+            self._recorder.begin(model_seed, self._applied_curriculum)
+        if self._display_alive:
+            pygame.event.clear()
+        self.game.reset()
+        if self._board_limit is not None:
+            self._clamp_cross_hair()
         obs = self._get_obs()
         if self._display_alive and self.render_mode == "human":
             self.game.render()
@@ -323,6 +618,11 @@ class BananaGramlEnvironment(gym.Env):
     def render(self):
         if self._display_alive and self.render_mode == "human":
             self.game.render()
+        elif self.render_mode == "rgb_array":
+            self.game.render()
+            return self.game.get_screen_rgb()
 
     def close(self):
+        if self._recorder is not None:
+            self._recorder.end(self)
         self.game.kill()
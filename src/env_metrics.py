@@ -0,0 +1,51 @@
+"""
+Env-side halves of the training metrics (see metrics.py): running sums kept by
+each ``BananaGramlEnvironment`` and the merge into scalars. Nothing here
+imports torch or stable-baselines3, so envs in worker processes stay light.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+
+Sums = Dict[str, Tuple[float, int]]
+
+
+class EnvMetrics:
+    """Running (sum, count) per metric name; ``pop()`` hands them over and starts again."""
+
+    __slots__ = ("_sums", "_counts")
+
+    def __init__(self):
+        self._sums: Dict[str, float] = defaultdict(float)
+        self._counts: Dict[str, int] = defaultdict(int)
+
+    def add(self, name: str, value: float) -> None:
+        self._sums[name] += value
+        self._counts[name] += 1
+
+    def pop(self) -> Sums:
+        out = {name: (self._sums[name], self._counts[name]) for name in self._sums}
+        self._sums.clear()
+        self._counts.clear()
+        return out
+
+
+def merge_metrics(parts: Iterable[Sums]) -> Sums:
+    """Add up the (sum, count) pairs of several envs."""
+    merged: Dict[str, List[float]] = {}
+    for part in parts:
+        for name, (total, count) in part.items():
+            entry = merged.setdefault(name, [0.0, 0])
+            entry[0] += total
+            entry[1] += count
+    return {name: (total, int(count)) for name, (total, count) in merged.items()}
+
+
+def to_scalars(sums: Sums, prefix: str = "env/") -> Dict[str, float]:
+    scalars = {prefix + name: total / count for name, (total, count) in sums.items() if count}
+    if "episode_tiles" in sums:
+        scalars[prefix + "episodes"] = float(sums["episode_tiles"][1])
+    return scalars
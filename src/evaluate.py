@@ -0,0 +1,331 @@
+"""
+Evaluate saved PPO checkpoints on many headless games with batched inference.
+
+Games run in worker processes (one pygame event queue per process, so envs in
+a worker are stepped in turn). The parent loads each policy once and serves
+actions: observations from all workers are stacked into one forward pass,
+flushed when ``--batch-size`` observations are waiting, when every live worker
+is waiting, or after ``--max-latency-ms``::
+
+    python evaluate.py runs/ckpt_a.zip runs/ckpt_b.zip --episodes 256 --workers 8
+
+Reports win rate, tiles placed, steps to victory and games/sec per checkpoint.
+With ``--video-dir`` every ``--video-every``-th episode is also rendered
+offscreen and saved as ``<video-dir>/<checkpoint>/episode_NNNNN.gif`` by a
+writer thread in each worker (see video.py); other episodes are never drawn.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from datagen import init_headless_worker, obs_keys
+from training_config import TrainingConfig, env_kwargs, load_training_config
+
+
+@dataclass(frozen=True)
+class EvalResult:
+    checkpoint: str
+    episodes: int
+    win_rate: float
+    mean_tiles_placed: float
+    mean_steps_to_victory: Optional[float]
+    games_per_sec: float
+    mean_batch_size: float
+
+
+def _worker(
+    wid: int,
+    episodes: int,
+    envs_per_worker: int,
+    seed: int,
+    cfg: TrainingConfig,
+    requests,
+    responses,
+    first_episode: int = 0,
+    video: Optional[Dict[str, Any]] = None,
+) -> None:
+    # Always tell the parent how the worker ended; it waits on "done" or "error".
+    try:
+        _play(wid, episodes, envs_per_worker, seed, cfg, requests, responses, first_episode, video)
+    except BaseException:
+        requests.put(("error", wid, traceback.format_exc()))
+    else:
+        requests.put(("done", wid, None))
+
+
+def _play(
+    wid: int,
+    episodes: int,
+    envs_per_worker: int,
+    seed: int,
+    cfg: TrainingConfig,
+    requests,
+    responses,
+    first_episode: int,
+    video: Optional[Dict[str, Any]],
+) -> None:
+    init_headless_worker()
+    from env import BananaGramlEnvironment
+
+    keys = obs_keys(cfg)
+    recorder = None
+    envs: List[Any] = []
+    try:
+        if video is not None:
+            from video import VideoRecorder
+
+            recorder = VideoRecorder(video["dir"], every=video["every"], fps=video["fps"], fmt=video["format"])
+        for _ in range(min(envs_per_worker, episodes)):
+            envs.append(BananaGramlEnvironment(render_mode=None if recorder is None else "rgb_array", **env_kwargs(cfg)))
+        started = 0
+        obs: List[Optional[Dict[str, Any]]] = []
+        steps = [0] * len(envs)
+        # (episode number, frames) of the episodes being recorded, per env.
+        clips: List[Optional[tuple]] = [None] * len(envs)
+
+        def begin(i: int, o: Dict[str, Any]) -> Dict[str, Any]:
+            episode = first_episode + started - 1
+            if recorder is not None and recorder.wants(episode):
+                clips[i] = (episode, [envs[i].render()])
+            return {k: np.array(v, copy=True) for k, v in o.items()}
+
+        for i, env in enumerate(envs):
+            o, _ = env.reset(seed=seed + started)
+            started += 1
+            obs.append(begin(i, o))
+
+        while True:
+            live = [i for i, o in enumerate(obs) if o is not None]
+            if not live:
+                break
+            batch = {k: np.stack([obs[i][k] for i in live]) for k in keys}
+            requests.put(("obs", wid, batch))
+            actions = responses.get()
+            for i, action in zip(live, actions):
+                env = envs[i]
+                o, _, terminated, truncated, _ = env.step(int(action))
+                steps[i] += 1
+                if clips[i] is not None:
+                    clips[i][1].append(env.render())
+                if terminated or truncated or steps[i] >= cfg.max_episode_steps:
+                    requests.put((
+                        "episode",
+                        wid,
+                        {
+                            "victory": bool(env.model.victory),
+                            "tiles_placed": len(env.model.tiles_on_board),
+                            "steps": steps[i],
+                        },
+                    ))
+                    steps[i] = 0
+                    if clips[i] is not None:
+                        episode, frames = clips[i]
+                        recorder.submit(f"episode_{episode:05d}", frames)
+                        clips[i] = None
+                    if started < episodes:
+                        o, _ = env.reset(seed=seed + started)
+                        started += 1
+                        obs[i] = begin(i, o)
+                    else:
+                        obs[i] = None
+                    continue
+                obs[i] = {k: np.array(v, copy=True) for k, v in o.items()}
+    finally:
+        for env in envs:
+            env.close()
+        if recorder is not None:
+            recorder.close()
+
+
+def evaluate_checkpoint(
+    path: str,
+    *,
+    episodes: int,
+    workers: int,
+    envs_per_worker: int = 4,
+    batch_size: int = 64,
+    max_latency_ms: float = 5.0,
+    seed: int = 0,
+    deterministic: bool = True,
+    cfg: Optional[TrainingConfig] = None,
+    video_dir: Optional[str] = None,
+    video_every: int = 10,
+    video_fps: int = 10,
+    video_format: str = "gif",
+) -> EvalResult:
+    from stable_baselines3 import PPO
+
+    if cfg is None:
+        cfg = load_training_config()
+    model = PPO.load(path, device="cpu")
+    workers = max(1, min(workers, episodes))
+
+    ctx = get_context("spawn")
+    requests = ctx.Queue()
+    responses = [ctx.Queue() for _ in range(workers)]
+    per_worker = [episodes // workers + (1 if w < episodes % workers else 0) for w in range(workers)]
+    video = None
+    if video_dir is not None and video_every > 0:
+        video = {
+            "dir": os.path.join(video_dir, os.path.splitext(os.path.basename(path))[0]),
+            "every": video_every,
+            "fps": video_fps,
+            "format": video_format,
+        }
+    procs = [
+        ctx.Process(
+            target=_worker,
+            args=(
+                w,
+                per_worker[w],
+                envs_per_worker,
+                seed + 1_000_000 * w,
+                cfg,
+                requests,
+                responses[w],
+                sum(per_worker[:w]),
+                video,
+            ),
+            daemon=True,
+        )
+        for w in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    # Timed from the first observation so process start-up isn't counted as play.
+    start: Optional[float] = None
+
+    live = workers
+    pending: List[tuple] = []
+    pending_obs = 0
+    first_wait = 0.0
+    batch_sizes: List[int] = []
+    results: List[Dict[str, Any]] = []
+    max_latency = max_latency_ms / 1000.0
+    keys = obs_keys(cfg)
+
+    def flush() -> None:
+        nonlocal pending, pending_obs
+        batch = {k: np.concatenate([b[k] for _, b in pending]) for k in keys}
+        actions, _ = model.predict(batch, deterministic=deterministic)
+        batch_sizes.append(pending_obs)
+        offset = 0
+        for wid, b in pending:
+            n = b[keys[0]].shape[0]
+            responses[wid].put(actions[offset : offset + n])
+            offset += n
+        pending, pending_obs = [], 0
+
+    while live:
+        timeout = None
+        if pending:
+            timeout = max(0.0, first_wait + max_latency - time.perf_counter())
+        try:
+            kind, wid, payload = requests.get(timeout=timeout)
+        except queue.Empty:
+            flush()
+            continue
+        if kind == "obs":
+            if start is None:
+                start = time.perf_counter()
+            if not pending:
+                first_wait = time.perf_counter()
+            pending.append((wid, payload))
+            pending_obs += payload[keys[0]].shape[0]
+        elif kind == "episode":
+            results.append(payload)
+        elif kind == "done":
+            live -= 1
+        elif kind == "error":
+            # the others may be waiting on actions that will never come.
+            for p in procs:
+                p.terminate()
+            raise RuntimeError(f"evaluation worker {wid} failed:\n{payload}")
+        # Nothing more can arrive once every live worker is waiting on us.
+        if pending and (pending_obs >= batch_size or len(pending) >= live):
+            flush()
+
+    elapsed = time.perf_counter() - start if start is not None else 0.0
+    for p in procs:
+        p.join()
+    if len(results) != episodes:
+        raise RuntimeError(f"{path}: workers finished {len(results)} of {episodes} episodes")
+
+    wins = [r for r in results if r["victory"]]
+    return EvalResult(
+        checkpoint=path,
+        episodes=len(results),
+        win_rate=len(wins) / max(1, len(results)),
+        mean_tiles_placed=float(np.mean([r["tiles_placed"] for r in results])) if results else 0.0,
+        mean_steps_to_victory=float(np.mean([r["steps"] for r in wins])) if wins else None,
+        games_per_sec=len(results) / elapsed if elapsed > 0 else 0.0,
+        mean_batch_size=float(np.mean(batch_sizes)) if batch_sizes else 0.0,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Evaluate PPO checkpoints with batched CPU inference.")
+    parser.add_argument("checkpoints", nargs="+", help="Saved SB3 PPO .zip files.")
+    parser.add_argument("--episodes", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--envs-per-worker", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stochastic", action="store_true", help="Sample actions instead of taking the mode.")
+    parser.add_argument("--torch-threads", type=int, default=None)
+    parser.add_argument("--config", type=str, default=None, help="Training JSON for env settings.")
+    parser.add_argument("--json", type=str, default=None, help="Also write results to this file.")
+    parser.add_argument("--video-dir", type=str, default=None, help="Record episodes here (offscreen).")
+    parser.add_argument("--video-every", type=int, default=10, help="Record every Nth episode.")
+    parser.add_argument("--video-fps", type=int, default=10)
+    parser.add_argument("--video-format", choices=("gif", "frames"), default="gif")
+    args = parser.parse_args(argv)
+
+    if args.torch_threads is not None:
+        import torch
+
+        torch.set_num_threads(args.torch_threads)
+
+    cfg = load_training_config(args.config)
+    results = []
+    for path in args.checkpoints:
+        res = evaluate_checkpoint(
+            path,
+            episodes=args.episodes,
+            workers=args.workers,
+            envs_per_worker=args.envs_per_worker,
+            batch_size=args.batch_size,
+            max_latency_ms=args.max_latency_ms,
+            seed=args.seed,
+            deterministic=not args.stochastic,
+            cfg=cfg,
+            video_dir=args.video_dir,
+            video_every=args.video_every,
+            video_fps=args.video_fps,
+            video_format=args.video_format,
+        )
+        results.append(res)
+        steps = "-" if res.mean_steps_to_victory is None else f"{res.mean_steps_to_victory:.1f}"
+        print(
+            f"{path}: win_rate={res.win_rate:.3f} tiles={res.mean_tiles_placed:.2f} "
+            f"steps_to_victory={steps} games/s={res.games_per_sec:.1f} batch={res.mean_batch_size:.1f}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import pygame
 import pygame.surfarray
 import numpy as np
 from .src.game.model import BananaGramlModel
+import os
 import sys
 from dataclasses import dataclass
 from typing import Tuple, List, Optional
@@ -424,12 +425,31 @@ class GameRenderer:
         return crosshair
 
 
+def use_offscreen_driver() -> None:
+    """
+    Switch the whole process to SDL's dummy video/audio drivers, so no Game
+    created afterwards opens a window. Meant for headless entry points
+    (BANANAGRAML_HEADLESS, pool workers); a no-op once pygame's display is up,
+    since the driver is fixed then.
+    """
+    if not pygame.display.get_init():
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
 class Game:
-    def __init__(self, model: BananaGramlModel):
+    def __init__(self, model: BananaGramlModel, offscreen: bool = False):
+        # offscreen: draw into a plain Surface instead of opening a window;
+        # render() then costs nothing until someone reads the frame.
+        self.offscreen = offscreen
         pygame.init()
-        self.screen = pygame.display.set_mode(
-            (GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT)
-        )
+        if offscreen and not pygame.display.get_init():
+            # No video driver (e.g. no X server): a window couldn't open here
+            # anyway, and the event queue needs the display subsystem.
+            use_offscreen_driver()
+            pygame.display.init()
+        size = (GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT)
+        self.screen = pygame.Surface(size) if offscreen else pygame.display.set_mode(size)
         self.clock = pygame.time.Clock()
         self.model = model
         self.drag_select = DragSelect()
@@ -450,6 +470,34 @@ class Game:
         self.bench_tiles = GameRenderer.render_bench_tiles(model, self.bench)
         self.selected_tile = None
 
+    def reset(self) -> None:
+        """Drop UI state left over from the previous game after ``model.reset()``."""
+        self.drag_select.clear_selection()
+        self.is_dragging = False
+        self.focus_area = "BOARD"
+        self.cross_hair_position = (0, 0)
+        self.bench_cross_hair_position_index = 0
+        self.bench_cross_hair_position = (100, 100)
+        self.cross_hair = GameRenderer.draw_cross_hair(self.cross_hair_position, 30, 30)
+        self.bench_tiles = GameRenderer.render_bench_tiles(self.model, self.bench)
+        self.selected_tile = None
+
+    def dump_tile(self, model_tile) -> bool:
+        """
+        Same as dropping ``model_tile``'s sprite on the dump area: the model
+        exchanges it and the bench sprites follow. False if nothing changed.
+        """
+        if model_tile is None or model_tile not in self.model.tiles_on_bench:
+            return False
+        self.model.dump(model_tile)
+        for tile in self.bench_tiles:
+            if tile.model_tile == model_tile:
+                tile.kill()
+        if self.selected_tile is not None and self.selected_tile.model_tile == model_tile:
+            self.selected_tile = None
+        self.bench_tiles = GameRenderer.render_bench_tiles(self.model, self.bench, self.bench_tiles)
+        return True
+
     def handle_events(self) -> bool:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -560,6 +608,42 @@ class Game:
         else:
             self.bench_cross_hair_position_index += 1
 
+    def cross_hair_limits(self) -> Tuple[int, int]:
+        """Largest (x, y) the arrow keys can take the board crosshair to."""
+        last = self.board_cells.sprites()[-1].rect.center
+        step = GameConfig.DIVIDER
+        # the arrow handlers move while the position is below these bounds.
+        bound_x, bound_y = last[0] - step, last[1] + step
+        return -(-bound_x // step) * step, -(-bound_y // step) * step
+
+    def move_cross_hair(self, key: int, steps: int = 1, until_tile: bool = False) -> None:
+        """
+        Same effect as pressing an arrow key ``steps`` times (or, on the board,
+        until the crosshair lands on a tile or reaches the edge), applied at once
+        instead of through the event queue.
+        """
+        if self.focus_area != "BOARD":
+            for _ in range(1 if until_tile else steps):
+                if key == pygame.K_LEFT:
+                    self.cycle_bench_cross_hair_left()
+                elif key == pygame.K_RIGHT:
+                    self.cycle_bench_cross_hair_right()
+            return
+        dr, dc = {
+            pygame.K_UP: (-1, 0),
+            pygame.K_DOWN: (1, 0),
+            pygame.K_LEFT: (0, -1),
+            pygame.K_RIGHT: (0, 1),
+        }[key]
+        d = GameConfig.DIVIDER
+        x, y = self.cross_hair_position
+        max_x, max_y = self.cross_hair_limits()
+        row, col = self.model.walk(
+            y // d, x // d, dr, dc, steps=steps, until_tile=until_tile,
+            bounds=(0, max_y // d, 0, max_x // d),
+        )
+        self.cross_hair_position = (col * d, row * d)
+
     def _handle_bench_keyboard_actions(self, event: pygame.event.Event) -> None:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_x:
@@ -686,7 +770,8 @@ class Game:
             )
             pygame.draw.rect(self.screen, "red", self.cross_hair, 2)
 
-        pygame.display.flip()
+        if not self.offscreen:
+            pygame.display.flip()
 
     def get_screen_rgb(self, max_width: int = 640) -> np.ndarray:
         """
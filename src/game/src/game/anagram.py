@@ -0,0 +1,156 @@
+"""
+- an anagram index over the dictionary for bench-letter queries.
+  every word is stored as a row of 26 letter counts, plus a 26-bit mask of
+  the letters it uses. "which words can the bench spell" is then a sub-multiset
+  test over the whole word list at once: the masks throw out any word with a
+  letter the bench doesn't have, and the count rows of the rest are compared
+  against the bench's counts. exact anagrams go through a sorted-letter
+  signature table.
+- the same build also tabulates letter statistics over the playable (2 to 8
+  letter) words: how many contain each letter, and how many have each pair of
+  letters side by side. BananaGramlModel.tile_utilities reads them to rank
+  bench tiles for dumping in O(bench) per call.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .model import dictionary
+
+_A = ord("A")
+# words longer than this rarely get played, so they don't shape letter stats.
+STATS_MAX_LEN = 8
+_BITS = (np.uint32(1) << np.arange(26, dtype=np.uint32)).astype(np.uint32)
+
+
+def letter_counts(letters: Iterable[str]) -> np.ndarray:
+    """26 letter counts (A..Z) of a string or an iterable of letters."""
+    counts = np.zeros(26, dtype=np.int16)
+    for letter in letters:
+        code = ord(letter[0].upper()) - _A if letter else -1
+        if 0 <= code < 26:
+            counts[code] += 1
+    return counts
+
+
+def signature(word: str) -> str:
+    return "".join(sorted(word.upper()))
+
+
+class AnagramIndex:
+    def __init__(self, words: Iterable[str]):
+        words = sorted({w.upper() for w in words if w.isascii() and w.isalpha()})
+        self.words: List[str] = words
+        self.lengths = np.fromiter((len(w) for w in words), dtype=np.int16, count=len(words))
+        codes = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).astype(np.intp) - _A
+        owner = np.repeat(np.arange(len(words), dtype=np.intp), self.lengths)
+        self.counts = (
+            np.bincount(owner * 26 + codes, minlength=len(words) * 26)
+            .reshape(len(words), 26)
+            .astype(np.uint8)
+        )
+        starts = np.zeros(len(words), dtype=np.intp)
+        np.cumsum(self.lengths[:-1], out=starts[1:])
+        self.masks = np.bitwise_or.reduceat(_BITS[codes], starts) if len(words) else np.zeros(0, np.uint32)
+        self._signatures: Optional[Dict[str, List[int]]] = None
+        self._letter_stats(codes, owner)
+
+    def _letter_stats(self, codes: np.ndarray, owner: np.ndarray) -> None:
+        """
+        letter_frequency[l]: share of playable words containing l, scaled so
+        the most common letter is 1. letter_affinity[l, m]: words with l and m
+        adjacent (either order), scaled to a max of 1.
+        """
+        playable = (self.lengths >= 2) & (self.lengths <= STATS_MAX_LEN)
+        frequency = (self.counts[playable] > 0).sum(axis=0).astype(np.float64)
+        self.letter_frequency = (frequency / max(frequency.max(), 1)).astype(np.float32)
+
+        adjacent = (owner[:-1] == owner[1:]) & playable[owner[:-1]]
+        pairs = codes[:-1][adjacent] * 26 + codes[1:][adjacent]
+        # a word counts once per pair however often it repeats it.
+        pairs = np.unique(owner[:-1][adjacent] * 676 + pairs) % 676
+        bigram = np.bincount(pairs, minlength=676).reshape(26, 26).astype(np.float64)
+        affinity = bigram + bigram.T - np.diag(np.diag(bigram))
+        self.letter_affinity = (affinity / max(affinity.max(), 1)).astype(np.float32)
+
+    def letter_utility(self, letters: np.ndarray, context: np.ndarray) -> np.ndarray:
+        """
+        utility in [0, 1] of tiles with letter indices `letters` (0-25) given
+        `context`, the 26 letter counts of the bench and board they sit among
+        (the tiles included): half how common the letter is, half how often it
+        sits next to the other context letters in words.
+        """
+        letters = np.asarray(letters, dtype=np.intp)
+        affinity = self.letter_affinity[letters]
+        others = context.sum() - 1
+        paired = (affinity @ context.astype(np.float32) - affinity[np.arange(letters.size), letters])
+        paired = paired / others if others > 0 else np.zeros(letters.size, dtype=np.float32)
+        return (0.5 * self.letter_frequency[letters] + 0.5 * paired).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def anagrams(self, letters: str) -> List[str]:
+        """dictionary words using exactly these letters."""
+        if self._signatures is None:
+            table = defaultdict(list)
+            for i, word in enumerate(self.words):
+                table[signature(word)].append(i)
+            self._signatures = dict(table)
+        return [self.words[i] for i in self._signatures.get(signature(letters), ())]
+
+    def spellable_indices(
+        self,
+        letters: Iterable[str],
+        *,
+        through: Optional[str] = None,
+        min_len: int = 2,
+        max_len: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        indices of the words spellable from `letters` (a sub-multiset of them).
+        with `through` (one board letter) the word may use that letter once
+        more than the bench holds, and has to: it's played through that tile.
+        """
+        bench = letter_counts(letters)
+        available = bench.copy()
+        if through is not None:
+            code = ord(through.upper()) - _A
+            available[code] += 1
+        if max_len is None:
+            max_len = int(available.sum())
+        mask = np.bitwise_or.reduce(_BITS[available > 0]) if available.any() else np.uint32(0)
+        candidates = np.flatnonzero(
+            ((self.masks & ~np.uint32(mask)) == 0)
+            & (self.lengths >= min_len)
+            & (self.lengths <= max_len)
+        )
+        counts = self.counts[candidates]
+        keep = np.all(counts <= available, axis=1)
+        if through is not None:
+            keep &= counts[:, code] > bench[code]
+        return candidates[keep]
+
+    def spellable(self, letters: Iterable[str], **kwargs) -> List[str]:
+        return [self.words[i] for i in self.spellable_indices(letters, **kwargs)]
+
+    def count_spellable(self, letters: Iterable[str], **kwargs) -> int:
+        return int(self.spellable_indices(letters, **kwargs).size)
+
+    def longest(self, letters: Iterable[str], **kwargs) -> Optional[str]:
+        found = self.spellable_indices(letters, **kwargs)
+        if not found.size:
+            return None
+        return self.words[int(found[np.argmax(self.lengths[found])])]
+
+
+_default_index: Optional[AnagramIndex] = None
+
+
+def default_index() -> AnagramIndex:
+    """the index over the game dictionary, built on first use."""
+    global _default_index
+    if _default_index is None:
+        _default_index = AnagramIndex(dictionary)
+    return _default_index
@@ -0,0 +1,133 @@
+"""
+- a model-level cursor for headless play (multiplayer env, game server).
+  it stands in for the pygame crosshair + bench selection and drives the
+  model directly, without events or sprites.
+"""
+from typing import List, Optional
+
+from .model import BananaGramlModel
+
+MOVE_UP = 0
+MOVE_DOWN = 1
+MOVE_LEFT = 2
+MOVE_RIGHT = 3
+NEXT_TILE = 4
+PLACE = 5
+PICK_UP = 6
+DUMP = 7
+
+N_ACTIONS = 8
+
+_MOVES = {
+    MOVE_UP: (-1, 0),
+    MOVE_DOWN: (1, 0),
+    MOVE_LEFT: (0, -1),
+    MOVE_RIGHT: (0, 1),
+}
+
+
+class CursorController:
+    """
+    the cursor stays off the outer ring of a dense board (build_words reads
+    past the edge there); on a sparse board it's unbounded.
+    """
+
+    def __init__(self, model: BananaGramlModel, move_repeat: int = 1, move_until_tile: bool = False):
+        self.model = model
+        # a move action goes move_repeat cells, or up to the next tile / edge.
+        self.move_repeat = move_repeat
+        self.move_until_tile = move_until_tile
+        self.reset()
+
+    def reset(self) -> None:
+        rows, cols = len(self.model.coordinates), len(self.model.coordinates[0])
+        self.row = rows // 2
+        self.col = cols // 2
+        self.selected = 0
+
+    def state(self):
+        """the cursor's own state, for restore() (the model is journaled separately)."""
+        return self.row, self.col, self.selected
+
+    def restore(self, state) -> None:
+        self.row, self.col, self.selected = state
+
+    def _bounds(self):
+        if self.model.sparse_board is None:
+            rows, cols = len(self.model.coordinates), len(self.model.coordinates[0])
+            return (1, rows - 2, 1, cols - 2)
+        return None
+
+    def legal_actions(self) -> List[int]:
+        """the actions apply() would not treat as a no-op right now."""
+        model = self.model
+        bench = model.tiles_on_bench
+        legal = []
+        bounds = self._bounds()
+        for action, (dr, dc) in _MOVES.items():
+            cell = model.walk(
+                self.row, self.col, dr, dc,
+                steps=self.move_repeat, until_tile=self.move_until_tile, bounds=bounds,
+            )
+            if cell != (self.row, self.col):
+                legal.append(action)
+        if len(bench) > 1:
+            legal.append(NEXT_TILE)
+        occupied = model.occupied(self.row, self.col)
+        if bench and not occupied:
+            legal.append(PLACE)
+        if occupied:
+            legal.append(PICK_UP)
+        if bench and model.tile_bank.can_dump():
+            legal.append(DUMP)
+        return legal
+
+    def _clamp(self) -> None:
+        if self.model.sparse_board is None:
+            rows, cols = len(self.model.coordinates), len(self.model.coordinates[0])
+            self.row = min(max(self.row, 1), rows - 2)
+            self.col = min(max(self.col, 1), cols - 2)
+        bench = self.model.tiles_on_bench
+        self.selected = min(self.selected, len(bench) - 1) if bench else 0
+
+    def apply(self, action: int) -> Optional[str]:
+        """
+        applies one action and returns what happened ("moved", "selected",
+        "placed", "picked_up", "dumped") or None if it was a no-op.
+        """
+        model = self.model
+        bench = model.tiles_on_bench
+        outcome = None
+        if action in _MOVES:
+            dr, dc = _MOVES[action]
+            before = (self.row, self.col)
+            self.row, self.col = self.model.walk(
+                self.row, self.col, dr, dc,
+                steps=self.move_repeat, until_tile=self.move_until_tile, bounds=self._bounds(),
+            )
+            self._clamp()
+            if (self.row, self.col) != before:
+                outcome = "moved"
+        elif action == NEXT_TILE:
+            if len(bench) > 1:
+                self.selected = (self.selected + 1) % len(bench)
+                outcome = "selected"
+        elif action == PLACE:
+            if bench and model.tile_at(self.row, self.col) is None:
+                model.place_tile_at(bench[min(self.selected, len(bench) - 1)], self.row, self.col)
+                outcome = "placed"
+        elif action == PICK_UP:
+            tile = model.tile_at(self.row, self.col)
+            if tile is not None:
+                model.return_tile_to_bench(tile)
+                outcome = "picked_up"
+        elif action == DUMP:
+            if bench:
+                n = len(bench)
+                model.dump(bench[min(self.selected, n - 1)])
+                if len(model.tiles_on_bench) != n:
+                    outcome = "dumped"
+        else:
+            raise ValueError(f"unknown action {action}")
+        self._clamp()
+        return outcome
@@ -5,50 +5,245 @@
 import math
 import random
 import uuid
+from functools import lru_cache, wraps
 from pathlib import Path
 
+import numpy as np
+
+from .sparse_board import SparseBoard
+
 _GAME_ROOT = Path(__file__).resolve().parents[2]
 
 dictionary = None
 with open(_GAME_ROOT / "dictionary.txt", encoding="utf-8") as f:
     dictionary = set(line.strip().upper() for line in f)
 
+# long episodes keep re-checking the same handful of runs, so remember the
+# answer per run string (upper-casing and hashing only happen on a miss).
+WORD_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def is_word(run: str) -> bool:
+    return run.upper() in dictionary
+
+
+def letter_code(value: str) -> int:
+    """A-Z / a-z -> 1-26, anything else -> 0 (the empty-cell code)."""
+    if not value:
+        return 0
+    code = ord(value[0].upper()) - ord("A") + 1
+    return code if 1 <= code <= 26 else 0
+
+
+def _journaled(method):
+    """
+    groups everything a public mutator changes into one journal entry, so one
+    undo() reverts the whole call (a placement and the peel it triggers, ...).
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._journal is None or self._entry is not None:
+            return method(self, *args, **kwargs)
+        self._entry = []
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            entry, self._entry = self._entry, None
+            if entry:
+                self._journal.append(entry)
+                self._redo.clear()
+
+    return wrapper
+
+
+# the coordinate grid only depends on the board dimensions and is never
+# mutated, so every model with the same dimensions shares one copy. this
+# keeps per-game memory down when a process hosts thousands of games.
+_COORDINATE_CACHE = {}
+
 
 class BananaGramlModel:
-    def __init__(self, BOARD_DIMENSIONS: (int, int, int)):
+    def __init__(
+        self,
+        BOARD_DIMENSIONS: (int, int, int),
+        seed=None,
+        sparse: bool = False,
+        tile_bank=None,
+    ):
         self.board_valid = True
         self.victory = False
-        self.coordinates = self.build_coordinates(coordinates=BOARD_DIMENSIONS)
-        self.coordinate_ref = self.build_coordinate_ref()
-        self.tile_bank = TileBank()
+        self.divider = BOARD_DIMENSIONS[2]
+        key = tuple(BOARD_DIMENSIONS)
+        if key not in _COORDINATE_CACHE:
+            self.coordinates = self.build_coordinates(coordinates=BOARD_DIMENSIONS)
+            _COORDINATE_CACHE[key] = (self.coordinates, self.build_coordinate_ref())
+        self.coordinates, self.coordinate_ref = _COORDINATE_CACHE[key]
+        # letter codes (see letter_code) mirroring self.board cell for cell,
+        # written wherever self.board is, so observations are array copies.
+        self.letter_codes = np.zeros(
+            (len(self.coordinates), len(self.coordinates[0]) if self.coordinates else 0),
+            dtype=np.uint8,
+        )
+        self.clean_board()
+        # sparse=True keeps the board as a hash of (row, col) -> tile with no
+        # edges; the dense self.board grid is then never filled in.
+        self.sparse_board = SparseBoard() if sparse else None
+        # every model owns its rng so games are reproducible per seed and
+        # forked workers never share the global random state. a tile_bank
+        # passed in (shared between players) brings its own rng.
+        # letter_counts (None = standard set) shapes the banks this model deals
+        # itself from; set it before reset() to change the next game's bank.
+        self.letter_counts = None
+        self._use_bank(seed, tile_bank)
         self.tiles_on_board = []  # need to make this the live board rep.
         self.tiles_on_bench = []
+        # number of board tiles self.board reflected after the last validation;
+        # lets place_tile_on_board take the incremental path safely.
+        self._validated_tiles = 0
+        # board.json is a debugging aid for the UI; headless engines running
+        # many games per process switch it off.
+        self.write_board_dump = True
+        # undo/redo journal (see start_journal); None while not recording.
+        self._journal = None
+        self._redo = []
+        self._entry = None
+
+    def _use_bank(self, seed, tile_bank):
+        # a shared bank changes under other players' moves, which this
+        # model's journal can't see; start_journal() refuses those models.
+        self._owns_bank = tile_bank is None
+        if tile_bank is None:
+            self.rng = random.Random(seed)
+            self.tile_bank = TileBank(self.rng, self.letter_counts)
+        else:
+            self.rng = tile_bank.rng
+            self.tile_bank = tile_bank
+
+    def reset(self, seed=None, starting_tiles: int = 0, tile_bank=None):
+        """
+        starts a fresh game in place (board, bench, bank), reseeding the rng.
+        the coordinate system is kept since it only depends on the dimensions.
+        """
+        if tile_bank is not None and self._journal is not None:
+            raise ValueError("a journaled model can't take a shared tile bank; stop_journal() first")
+        self.board_valid = True
+        self.victory = False
+        self.clean_board()
+        if self.sparse_board is not None:
+            self.sparse_board.clear()
+        self._use_bank(seed, tile_bank)
+        self.tiles_on_board = []
+        self.tiles_on_bench = []
+        self._validated_tiles = 0
+        self.init_bench(starting_tiles)
+        if self._journal is not None:
+            # a new game can't be undone into the old one.
+            self._journal = []
+            self._redo = []
 
     def board_tiles(self):
         return self.tiles_on_board
 
     # TODO finalize this.
     def validate(self):
+        if self.sparse_board is not None:
+            sparse = self.sparse_board
+            return not sparse.has_isolated_tile() and self.validate_keys(sparse.run_keys())
         # clean up the board and re-build it during each validate() call.
+        before = self._occupied_cells() if self._entry is not None else None
         self.clean_board()
         for tile in self.tiles_on_board:
             center = tile.model_tile.get_position()
             if center in self.coordinate_ref:
                 x, y = self.coordinate_ref[center]
                 self.board[x][y] = tile.model_tile
+                self.letter_codes[x, y] = tile.model_tile.code
+        if before is not None:
+            self._log_rebuild(before)
+        self._set("_validated_tiles", len(self.tiles_on_board))
+        from .runs import ACCELERATED, validate_codes
+
+        if ACCELERATED:
+            # compiled scan of letter_codes (runs.py); build_words otherwise.
+            return validate_codes(self.letter_codes)
         is_valid = self.build_words("", 0, 0, self.board)
         return is_valid
 
+    def validate_after_placing(self, model_tile, row: int, col: int) -> bool:
+        """
+        incremental validate() for one new tile on a board that was valid.
+
+        adding a tile can only create or extend the two runs through its cell,
+        and can't isolate any other tile, so only those runs are checked. falls
+        back to the full scan whenever a run touches the outer ring, where
+        build_words wraps around / reads past the edge.
+        """
+        board = self.board
+        rows, cols = len(board), len(board[0])
+        if not (self.board_valid and 0 < row < rows - 1 and 0 < col < cols - 1):
+            return self.validate()
+        self._log("cell", row, col, board[row][col], model_tile)
+        board[row][col] = model_tile
+        self.letter_codes[row, col] = model_tile.code
+        keys = self.run_keys_through(row, col, board)
+        if keys is None:
+            return self.validate()
+        self._set("_validated_tiles", len(self.tiles_on_board))
+        if not keys:
+            # no neighbours: an isolated tile.
+            return False
+        return self.validate_keys(keys)
+
+    def run_keys_through(self, row: int, col: int, board=None):
+        """
+        the word keys (wordkeys.py) of the maximal horizontal / vertical runs
+        (length >= 2) through a cell, or None if either run reaches the outer
+        ring of the board.
+        """
+        board = self.board if board is None else board
+        rows, cols = len(board), len(board[0])
+        keys = []
+        for dr, dc in ((0, 1), (1, 0)):
+            i, j = row, col
+            while board[i - dr][j - dc] is not None:
+                i, j = i - dr, j - dc
+                if i == 0 or j == 0:
+                    return None
+            key, length = 0, 0
+            while board[i][j] is not None:
+                if i == rows - 1 or j == cols - 1:
+                    return None
+                key = key << 5 | board[i][j].code
+                length += 1
+                i, j = i + dr, j + dc
+            if length >= 2:
+                keys.append(key)
+        return keys
+
+    def validate_keys(self, keys) -> bool:
+        """validate_words for runs given as word keys; no strings involved."""
+        from .wordkeys import default_keys
+
+        known = default_keys().key_set
+        for key in keys:
+            if key not in known:
+                return False
+        return True
+
     def validate_words(self, words: [str]) -> bool:
-        for word in words:
-            if not (self.check_dictionary(word.upper())):
+        """
+        batched check of every run in one pass, stopping at the first miss.
+        repeated runs are only looked up once.
+        """
+        for word in dict.fromkeys(words):
+            if not is_word(word):
                 return False
         return True
 
     def check_dictionary(self, word: str) -> bool:
-        if word in dictionary:
-            return True
-        return False
+        return is_word(word)
 
     def build_words(self, word: str, row: int, column: int, board=None):
         """
@@ -74,22 +269,24 @@ class BananaGramlModel:
                 we would be building out the string as we iterate.
         """
 
+        # runs are read as word keys (wordkeys.py), 5 bits per letter code,
+        # so no strings are built on the way to the dictionary.
         def check_row(i, j, board):
-            word = ""
+            key = 0
             while board[i][j] is not None:
-                word += board[i][j].get_value()
+                key = key << 5 | board[i][j].code
                 j += 1
-            return word
-            # return self.validate_words([word])
+            return key
 
         def check_col(i, j, board):
-            word = ""
+            key = 0
             while board[i][j] is not None:
-                word += board[i][j].get_value()
+                key = key << 5 | board[i][j].code
                 i += 1
-            return word
-            # return self.validate_words([word])
+            return key
 
+        # runs are collected and validated in one batch at the end; only the
+        # cheap isolation check exits early.
         all_words = []
         for i in range(row, len(board)):
             for j in range(column, len(board[0])):
@@ -105,19 +302,13 @@ class BananaGramlModel:
 
                     # met a top tile of a col.
                     if board[i + 1][j] is not None and board[i - 1][j] is None:
-                        word = check_col(i, j, board)
-                        if not self.validate_words([word]):
-                            return False
-                        all_words.append(word)
+                        all_words.append(check_col(i, j, board))
 
                     # met a leftest most tile on the board.
                     if board[i][j + 1] is not None and board[i][j - 1] is None:
-                        word = check_row(i, j, board)
-                        if not self.validate_words([word]):
-                            return False
-                        all_words.append(word)
+                        all_words.append(check_row(i, j, board))
 
-        return True
+        return self.validate_keys(all_words)
 
 
     # FIXME/TODO
@@ -129,34 +320,221 @@ class BananaGramlModel:
     and index in the tile. making it so that we don't have to loop through each cell of the board to find collision points.
     """
 
+    @_journaled
     def place_tile_on_board(self, tile, center):
-        tile.model_tile.set_position(center)
-        if tile in self.tiles_on_board:
-            self.tiles_on_board.remove(tile)
-        self.tiles_on_board.append(tile)
+        if self.sparse_board is not None:
+            return self._place_tile_sparse(tile, center)
+        self._set_position(tile.model_tile, center)
+        moved = tile in self.tiles_on_board
+        if moved:
+            self._remove_from(self.tiles_on_board, tile)
+        in_sync = self._validated_tiles == len(self.tiles_on_board)
+        self._append_to(self.tiles_on_board, tile)
 
         # remove the tile from the bench. if we take the tile from the bench and
         # place it on the board, we want to remove it from the bench.
         if tile.model_tile in self.tiles_on_bench:
-            self.tiles_on_bench.remove(tile.model_tile)
-        self.board_valid = self.validate()
+            self._remove_from(self.tiles_on_bench, tile.model_tile)
+        cell = self.coordinate_ref.get(center)
+        if (
+            not moved
+            and in_sync
+            and cell is not None
+            and self.board[cell[0]][cell[1]] is None
+        ):
+            self._set("board_valid", self.validate_after_placing(tile.model_tile, *cell))
+        else:
+            self._set("board_valid", self.validate())
         self.dump_board()  # dumps the coordinates etc into a json file for review.
         if len(self.tiles_on_bench) == 0 and self.board_valid:
             self.peel()
 
+    def _place_tile_sparse(self, tile, center):
+        self._set_position(tile.model_tile, center)
+        row, col = self.cell_for_center(center)
+        sparse = self.sparse_board
+        # every board tile has its own cell unless a move stacked one on another.
+        overlapping = len(sparse) < len(self.tiles_on_board)
+        moved = tile in self.tiles_on_board
+        if moved:
+            # like the dense backend: the moved tile goes last, so it's on top.
+            self._remove_from(self.tiles_on_board, tile)
+        self._append_to(self.tiles_on_board, tile)
+        if tile.model_tile in self.tiles_on_bench:
+            self._remove_from(self.tiles_on_bench, tile.model_tile)
+        occupant = sparse.get((row, col))
+        if overlapping or (occupant is not None and occupant != tile.model_tile):
+            # a group drag moves its tiles one at a time, onto each other's cells.
+            self._resync_sparse()
+            self._set("board_valid", self.validate())
+        else:
+            self._sparse_move(tile.model_tile, (row, col))
+            if self.board_valid and not moved:
+                # same reasoning as validate_after_placing, minus the edges.
+                keys = sparse.run_keys_through(row, col)
+                self._set("board_valid", bool(keys) and self.validate_keys(keys))
+            else:
+                self._set("board_valid", self.validate())
+        self.dump_board()
+        if len(self.tiles_on_bench) == 0 and self.board_valid:
+            self.peel()
+
+    def _sparse_move(self, model_tile, cell):
+        """moves a tile on the sparse board (None takes it off), journaled."""
+        previous = self.sparse_board.cell_of(model_tile)
+        if previous == cell:
+            return
+        if cell is None:
+            self.sparse_board.remove(model_tile)
+        else:
+            self.sparse_board.place(cell[0], cell[1], model_tile)
+        self._log("sparse", model_tile, previous, cell)
+
+    def _resync_sparse(self):
+        """
+        seats the board tiles the way validate() rebuilds the dense board: in
+        tiles_on_board order, a later tile covering an earlier one on the same
+        cell. covered tiles stay off the sparse board until their cell frees up.
+        """
+        top = {}
+        for tile in self.tiles_on_board:
+            top[self.cell_for_center(tile.model_tile.get_position())] = tile.model_tile
+        shown = {model_tile: cell for cell, model_tile in top.items()}
+        # take off everything that moves first, so no cell is ever claimed twice.
+        for tile in self.tiles_on_board:
+            if self.sparse_board.cell_of(tile.model_tile) != shown.get(tile.model_tile):
+                self._sparse_move(tile.model_tile, None)
+        for model_tile, cell in shown.items():
+            self._sparse_move(model_tile, cell)
+
+    def cell_for_center(self, center):
+        """
+        (row, col) for a pixel center. off the fixed grid this extends the same
+        spacing, so sparse boards can address cells the UI never drew.
+        """
+        if center in self.coordinate_ref:
+            return self.coordinate_ref[center]
+        return (center[1] // self.divider, center[0] // self.divider)
+
+    def place_tile_at(self, model_tile, row: int, col: int):
+        """
+        headless counterpart of place_tile_on_board: puts a bench tile on the
+        board cell (row, col) without needing a pygame sprite.
+        """
+        if self.sparse_board is not None:
+            d = self.divider
+            center = (col * d + d // 2, row * d + d // 2)
+        else:
+            center = self.coordinates[row][col].get_center()
+        placed = PlacedTile(model_tile)
+        self.place_tile_on_board(placed, center)
+        return placed
+
+    def occupied(self, row: int, col: int) -> bool:
+        if self.sparse_board is not None:
+            return (row, col) in self.sparse_board
+        codes = self.letter_codes
+        return 0 <= row < codes.shape[0] and 0 <= col < codes.shape[1] and codes[row, col] != 0
+
+    def walk(self, row: int, col: int, dr: int, dc: int, steps: int = 1, until_tile: bool = False, bounds=None):
+        """
+        the cell a cursor reaches moving from (row, col) by (dr, dc): `steps`
+        cells, or with until_tile up to the first occupied cell. it never leaves
+        bounds ((min_row, max_row, min_col, max_col), inclusive); bounds default
+        to the grid on a dense board and to the tiles' bounding box on a sparse
+        one. lets a frontend apply many cursor moves as one.
+        """
+        if bounds is None:
+            if self.sparse_board is None:
+                bounds = (0, self.letter_codes.shape[0] - 1, 0, self.letter_codes.shape[1] - 1)
+            elif until_tile:
+                box = self.sparse_board.bounding_box()
+                if box is None:
+                    return row, col
+                # one cell of slack so the cursor can step just past the tiles.
+                bounds = (
+                    min(box[0], row) - 1, max(box[1], row) + 1,
+                    min(box[2], col) - 1, max(box[3], col) + 1,
+                )
+        while until_tile or steps > 0:
+            r, c = row + dr, col + dc
+            if bounds is not None and not (bounds[0] <= r <= bounds[1] and bounds[2] <= c <= bounds[3]):
+                break
+            row, col = r, c
+            steps -= 1
+            if until_tile and self.occupied(row, col):
+                break
+        return row, col
+
+    def tile_at(self, row: int, col: int):
+        """the board entry (sprite or PlacedTile) on (row, col), or None."""
+        if self.sparse_board is not None:
+            model_tile = self.sparse_board.get((row, col))
+        else:
+            model_tile = self.board[row][col]
+        if model_tile is None:
+            return None
+        for tile in self.tiles_on_board:
+            if tile.model_tile == model_tile:
+                return tile
+        return None
+
+    @_journaled
+    def return_tile_to_bench(self, tile):
+        """takes a board tile back onto the bench and re-validates."""
+        if tile not in self.tiles_on_board:
+            return
+        self._remove_from(self.tiles_on_board, tile)
+        if self.sparse_board is not None:
+            self._sparse_move(tile.model_tile, None)
+            if len(self.sparse_board) < len(self.tiles_on_board):
+                # it may have been covering another tile.
+                self._resync_sparse()
+        self._append_to(self.tiles_on_bench, tile.model_tile)
+        self._set("board_valid", self.validate())
+        self.dump_board()
+
+    def board_runs(self):
+        """every maximal horizontal / vertical run of length >= 2, for either backend."""
+        if self.sparse_board is not None:
+            return self.sparse_board.runs()
+        out = []
+        for lines in (self.board, zip(*self.board)):
+            for line in lines:
+                run = []
+                for tile in line:
+                    if tile is not None:
+                        run.append(tile.get_value())
+                        continue
+                    if len(run) >= 2:
+                        out.append("".join(run))
+                    run = []
+                if len(run) >= 2:
+                    out.append("".join(run))
+        return out
+
+    def board_letters(self):
+        """((row, col), letter) for every tile on the board, for either backend."""
+        if self.sparse_board is not None:
+            return sorted(self.sparse_board.letters())
+        board = self.board
+        return [
+            ((i, j), board[i][j].get_value())
+            for i in range(len(board))
+            for j in range(len(board[0]))
+            if board[i][j] is not None
+        ]
 
 
     def dump_board(self):
+        if not self.write_board_dump:
+            return
         with open(_GAME_ROOT / "board.json", encoding="utf-8", mode="w") as f:
-            board = self.board
-            for i in range(0, len(board)):
-                for j in range(0, len(board[0])):
-                    if board[i][j] is not None:
-                        tile = board[i][j]
-                        f.write(tile.get_value())
-                        f.write(" has position: ")
-                        f.write(f"{i}, {j}")
-                        f.write("\n")
+            for (i, j), letter in self.board_letters():
+                f.write(letter)
+                f.write(" has position: ")
+                f.write(f"{i}, {j}")
+                f.write("\n")
 
     def init_bench(self, count):
         for i in range(0, count):
@@ -165,30 +543,211 @@ class BananaGramlModel:
     def remaining_tiles(self):
         return self.tile_bank.get_all_remaining_tiles()
 
+    @_journaled
     def peel(self):
+        bank = self.tile_bank.bank
         token = self.tile_bank.peel()
         if token is not None:
-            self.tiles_on_bench.append(token)
+            self._log("delete", bank, len(bank), token)
+            self._append_to(self.tiles_on_bench, token)
         else:
-            self.victory = True
+            self._set("victory", True)
 
+    @_journaled
     def dump(self, token):
         if token in self.tiles_on_bench:
-            self.tiles_on_bench.remove(token)
+            self._remove_from(self.tiles_on_bench, token)
         elif token in self.tiles_on_board:
-            self.tiles_on_board.remove(token)
+            self._remove_from(self.tiles_on_board, token)
         if self.tile_bank.can_dump():
-            self.tile_bank.dump(token)
+            rng_state = self.tile_bank.rng.getstate() if self._entry is not None else None
+            index = self.tile_bank.dump(token)
+            if rng_state is not None:
+                self._log("rng", rng_state, self.tile_bank.rng.getstate())
+            self._log("insert", self.tile_bank.bank, index, token)
             for i in range(0, 3):
-                peeled_tile = self.tile_bank.peel()
-                self.tiles_on_bench.append(peeled_tile)
+                self.peel()
         else:
-            self.tiles_on_bench.append(peeled_tile)
+            # not enough tiles left to exchange: the tile goes back to the bench.
+            self._append_to(self.tiles_on_bench, token)
+
+    # --- undo / redo -----------------------------------------------------
+    #
+    # while the journal is on, every public mutator (place_tile_on_board,
+    # place_tile_at, return_tile_to_bench, peel, dump) logs the primitive
+    # changes it makes -- list inserts/deletes, board cells, sparse cells,
+    # attributes, the bank rng -- as one entry. undo() replays an entry's
+    # changes backwards and redo() forwards, so both cost as much as the
+    # original call changed rather than a copy of the whole game. search code
+    # can then try a move and take it back instead of deep-copying the model:
+    #
+    #     model.start_journal()
+    #     mark = model.mark()
+    #     model.place_tile_at(tile, row, col)
+    #     ...
+    #     model.rollback(mark)
+    #
+    # only a model that owns its bank can be journaled; reset() clears the
+    # journal since a new game can't be undone into the old one. undo(),
+    # redo() and rollback() write board.json once per call, not per entry.
+
+    def start_journal(self):
+        """start recording mutations (dropping any earlier journal)."""
+        if not self._owns_bank:
+            raise ValueError("only a model that owns its tile bank can be journaled")
+        self._journal = []
+        self._redo = []
+
+    def stop_journal(self):
+        self._journal = None
+        self._redo = []
+
+    @property
+    def journaling(self) -> bool:
+        return self._journal is not None
+
+    def mark(self) -> int:
+        """a point in the journal that rollback() can return to."""
+        return len(self._journal)
+
+    def can_undo(self) -> bool:
+        return bool(self._journal)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> bool:
+        """reverts the last journaled call; False when there is nothing to undo."""
+        if not self._journal:
+            return False
+        self._undo_entry()
+        self.dump_board()
+        return True
+
+    def redo(self) -> bool:
+        """re-applies the last undone call; False when there is nothing to redo."""
+        if not self._redo:
+            return False
+        entry = self._redo.pop()
+        for op in entry:
+            self._apply(op, forward=True)
+        self._journal.append(entry)
+        self.dump_board()
+        return True
+
+    def rollback(self, mark: int):
+        """undoes everything journaled since mark() returned `mark`."""
+        if len(self._journal) <= mark:
+            return
+        while len(self._journal) > mark:
+            self._undo_entry()
+        self.dump_board()
+
+    def _undo_entry(self):
+        entry = self._journal.pop()
+        for op in reversed(entry):
+            self._apply(op, forward=False)
+        self._redo.append(entry)
+
+    def _log(self, *op):
+        if self._entry is not None:
+            self._entry.append(op)
+
+    def _set(self, name, value, obj=None):
+        obj = self if obj is None else obj
+        old = getattr(obj, name)
+        if self._entry is not None and old != value:
+            self._entry.append(("attr", obj, name, old, value))
+        setattr(obj, name, value)
+
+    def _set_position(self, model_tile, center):
+        self._set("position", center, model_tile)
+
+    def _append_to(self, items, item):
+        self._log("insert", items, len(items), item)
+        items.append(item)
+
+    def _remove_from(self, items, item):
+        index = items.index(item)
+        self._log("delete", items, index, item)
+        del items[index]
+
+    def _occupied_cells(self):
+        rows, cols = np.nonzero(self.letter_codes)
+        board = self.board
+        return {(r, c): board[r][c] for r, c in zip(rows.tolist(), cols.tolist())}
+
+    def _log_rebuild(self, before):
+        """logs the cells a full validate() rebuild actually changed."""
+        board = self.board
+        after = self._occupied_cells()
+        for (r, c), old in before.items():
+            if after.get((r, c)) is not old:
+                self._entry.append(("cell", r, c, old, board[r][c]))
+        for (r, c), new in after.items():
+            if (r, c) not in before:
+                self._entry.append(("cell", r, c, None, new))
+
+    def _apply(self, op, forward: bool):
+        kind = op[0]
+        if kind == "attr":
+            _, obj, name, old, new = op
+            setattr(obj, name, new if forward else old)
+        elif kind == "insert" or kind == "delete":
+            _, items, index, item = op
+            if (kind == "insert") == forward:
+                items.insert(index, item)
+            else:
+                del items[index]
+        elif kind == "cell":
+            _, row, col, old, new = op
+            value = new if forward else old
+            self.board[row][col] = value
+            self.letter_codes[row, col] = value.code if value is not None else 0
+        elif kind == "sparse":
+            _, model_tile, old, new = op
+            cell = new if forward else old
+            if cell is None:
+                self.sparse_board.remove(model_tile)
+            else:
+                self.sparse_board.place(cell[0], cell[1], model_tile)
+        elif kind == "rng":
+            _, old, new = op
+            self.tile_bank.rng.setstate(new if forward else old)
+
+    def letter_context(self) -> np.ndarray:
+        """26 letter counts (A..Z) of the bench and board tiles together."""
+        codes = [t.code for t in self.tiles_on_bench]
+        if self.sparse_board is not None:
+            board = self.sparse_board.as_arrays()[2]
+        else:
+            board = self.letter_codes.ravel()
+        counts = np.bincount(board, minlength=27) + np.bincount(codes, minlength=27)
+        return counts[1:27]
+
+    def tile_utilities(self) -> np.ndarray:
+        """
+        how useful each bench tile is (in bench order, 0 to 1), from dictionary
+        letter and adjacent-pair statistics given the other bench and board
+        letters; see AnagramIndex.letter_utility. the lowest is the best dump.
+        """
+        from .anagram import default_index
+
+        letters = np.fromiter((t.code - 1 for t in self.tiles_on_bench), dtype=np.intp)
+        if not letters.size:
+            return np.zeros(0, dtype=np.float32)
+        return default_index().letter_utility(letters, self.letter_context())
+
+    def dump_candidate(self):
+        """the bench tile with the lowest utility, or None when no dump is possible."""
+        if not self.tiles_on_bench or not self.tile_bank.can_dump():
+            return None
+        return self.tiles_on_bench[int(np.argmin(self.tile_utilities()))]
 
     def get_game_state(self):
         return {
             "board_valid": self.board_valid, 
-            "board": self.board,
+            "board": self.board if self.sparse_board is None else self.sparse_board,
             "bench": self.tiles_on_bench, 
             "tiles_on_board": self.tiles_on_board, 
         }
@@ -239,6 +798,7 @@ class BananaGramlModel:
 
     def clean_board(self):
         self.board = [[None for i in x] for x in self.coordinates]
+        self.letter_codes.fill(0)
 
 
 class Coordinate:
@@ -262,6 +822,7 @@ class Coordinate:
 class ModelTile:
     def __init__(self, value: str, position):
         self.value = value
+        self.code = letter_code(value)
         self.position = position
         self.id = uuid.uuid4().__str__()
 
@@ -287,9 +848,25 @@ class ModelTile:
         return hash(self.id)
 
 
+class PlacedTile:
+    """
+    stand-in for the pygame Tile sprite when tiles are placed without a UI
+    (solvers, headless tooling). the model only ever reads .model_tile.
+    """
+
+    def __init__(self, model_tile: ModelTile):
+        self.model_tile = model_tile
+
+
 class TileBank:
-    def __init__(self):
-        self.bank = init_game_tiles()
+    """
+    the bank is shuffled once up front and peeled from the end, so the draw
+    order is fixed by the rng seed and can be read or skipped without replaying.
+    """
+
+    def __init__(self, rng: random.Random = None, letter_counts=None):
+        self.rng = rng if rng is not None else random.Random()
+        self.bank = init_game_tiles(self.rng, letter_counts)
 
     def get_bank_size(self):
         return self.bank.__len__()
@@ -315,58 +892,83 @@ class TileBank:
         removes a value from the tile bank and returns it
         """
         if self.can_peel():
-            index = random.randint(0, len(self.bank))
-            token = self.bank[index]
-            self.bank.remove(token)
-            return token
+            return self.bank.pop()
         return None
 
+    def upcoming(self, count: int = None) -> [str]:
+        """letters of the next `count` peels, in draw order."""
+        order = self.bank[::-1]
+        if count is not None:
+            order = order[:count]
+        return [tile.get_value() for tile in order]
+
+    def fast_forward(self, count: int) -> [ModelTile]:
+        """peels `count` tiles at once (or all that are left) and returns them."""
+        count = min(count, len(self.bank))
+        if count <= 0:
+            return []
+        drawn = self.bank[-count:][::-1]
+        del self.bank[-count:]
+        return drawn
+
     def dump(self, token):
         """
         if there are 3 tiles left in the bank, 3 tiles are selected at random.
         those 3 tiles are returned to the user in exchange for a token provided
         by the user.
         """
-        self.bank.append(token)
-        random.shuffle(self.bank)
-
-
-def init_game_tiles():
+        # the bank is already a random permutation, so dropping the token into
+        # a random slot keeps it one without reshuffling everything.
+        index = self.rng.randrange(len(self.bank) + 1)
+        self.bank.insert(index, token)
+        return index
+
+
+# standard bananagrams distribution (144 tiles).
+LETTER_COUNTS = {
+    "A": 13,
+    "B": 3,
+    "C": 3,
+    "D": 6,
+    "E": 18,
+    "F": 3,
+    "G": 4,
+    "H": 3,
+    "I": 12,
+    "J": 2,
+    "K": 2,
+    "L": 5,
+    "M": 3,
+    "N": 8,
+    "O": 11,
+    "P": 3,
+    "Q": 2,
+    "R": 9,
+    "S": 6,
+    "T": 9,
+    "U": 6,
+    "V": 3,
+    "W": 3,
+    "X": 2,
+    "Y": 3,
+    "Z": 2,
+}
+
+
+def init_game_tiles(rng: random.Random = None, letter_counts=None):
+    """
+    a shuffled bank. letter_counts ({letter: count}) replaces the standard
+    distribution, e.g. a small, vowel-heavy bank for early training.
+    """
     bananagrams_tiles = []
 
     # Create tiles based on letter frequency
-    letter_counts = {
-        "A": 13,
-        "B": 3,
-        "C": 3,
-        "D": 6,
-        "E": 18,
-        "F": 3,
-        "G": 4,
-        "H": 3,
-        "I": 12,
-        "J": 2,
-        "K": 2,
-        "L": 5,
-        "M": 3,
-        "N": 8,
-        "O": 11,
-        "P": 3,
-        "Q": 2,
-        "R": 9,
-        "S": 6,
-        "T": 9,
-        "U": 6,
-        "V": 3,
-        "W": 3,
-        "X": 2,
-        "Y": 3,
-        "Z": 2,
-    }
+    if letter_counts is None:
+        letter_counts = LETTER_COUNTS
 
     for letter, count in letter_counts.items():
         for _ in range(count):
             bananagrams_tiles.append(ModelTile(letter, position=(0, 0)))
 
-    random.shuffle(bananagrams_tiles)
+    (rng if rng is not None else random).shuffle(bananagrams_tiles)
     return bananagrams_tiles
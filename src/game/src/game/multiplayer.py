@@ -0,0 +1,114 @@
+"""
+- the real game: N players racing on their own boards while peeling from one
+  shared bunch. when any player clears their bench on a valid board, "Peel!"
+  hands every player one tile; once the bunch can't cover a full round of
+  peels, that player wins instead ("Bananas!").
+  peels and dumps go through one lock so they stay atomic when players are
+  stepped from several threads.
+"""
+import random
+import threading
+from typing import List, Optional
+
+from .model import BananaGramlModel, ModelTile, TileBank
+
+
+def starting_tiles_for(n_players: int) -> int:
+    """the official deal: 21 tiles for 2-4 players, 15 for 5-6, 11 for 7-8."""
+    if n_players <= 4:
+        return 21
+    if n_players <= 6:
+        return 15
+    return 11
+
+
+class PlayerModel(BananaGramlModel):
+    """one seat at a MultiplayerGame; peel() and dump() go through the shared bunch."""
+
+    def __init__(self, game: "MultiplayerGame", player_id: int, BOARD_DIMENSIONS, sparse: bool = False):
+        super().__init__(BOARD_DIMENSIONS, sparse=sparse, tile_bank=game.tile_bank)
+        self.game = game
+        self.player_id = player_id
+        self.write_board_dump = False
+
+    def peel(self):
+        # place_tile_on_board calls this when the bench empties on a valid board.
+        self.game.call_peel(self)
+
+    def dump(self, token):
+        self.game.dump(self, token)
+
+
+class MultiplayerGame:
+    def __init__(
+        self,
+        n_players: int,
+        BOARD_DIMENSIONS,
+        seed=None,
+        starting_tiles: Optional[int] = None,
+        sparse: bool = False,
+    ):
+        if n_players < 1:
+            raise ValueError("n_players must be at least 1")
+        self.n_players = n_players
+        self.dimensions = BOARD_DIMENSIONS
+        self.sparse = sparse
+        self.lock = threading.RLock()
+        self.starting_tiles = (
+            starting_tiles_for(n_players) if starting_tiles is None else starting_tiles
+        )
+        self.players: List[PlayerModel] = []
+        self.reset(seed)
+
+    def reset(self, seed=None) -> None:
+        with self.lock:
+            self.rng = random.Random(seed)
+            self.tile_bank = TileBank(self.rng)
+            self.winner: Optional[int] = None
+            self.peels = 0
+            self.dumps = 0
+            if len(self.players) != self.n_players:
+                self.players = [
+                    PlayerModel(self, i, self.dimensions, sparse=self.sparse)
+                    for i in range(self.n_players)
+                ]
+            for player in self.players:
+                # dealt below, round-robin like a real table.
+                player.reset(starting_tiles=0, tile_bank=self.tile_bank)
+            for _ in range(self.starting_tiles):
+                for player in self.players:
+                    token = self.tile_bank.peel()
+                    if token is not None:
+                        player.tiles_on_bench.append(token)
+
+    @property
+    def done(self) -> bool:
+        return self.winner is not None
+
+    def call_peel(self, player: PlayerModel) -> None:
+        with self.lock:
+            if self.winner is not None:
+                return
+            if self.tile_bank.get_current_size() < self.n_players:
+                self.winner = player.player_id
+                player.victory = True
+                return
+            # the caller draws first, then everyone else in seat order.
+            for offset in range(self.n_players):
+                seat = self.players[(player.player_id + offset) % self.n_players]
+                seat.tiles_on_bench.append(self.tile_bank.peel())
+            self.peels += 1
+
+    def dump(self, player: PlayerModel, token: ModelTile) -> bool:
+        """swap one bench tile for three from the bunch; False if it can't be done."""
+        with self.lock:
+            if self.winner is not None or token not in player.tiles_on_bench:
+                return False
+            if not self.tile_bank.can_dump():
+                return False
+            player.tiles_on_bench.remove(token)
+            # draw before returning the tile so a dump never hands it straight back.
+            player.tiles_on_bench.extend(self.tile_bank.fast_forward(3))
+            self.tile_bank.dump(token)
+            self.dumps += 1
+            return True
@@ -0,0 +1,235 @@
+"""
+- run extraction over the letter-code grid (BananaGramlModel.letter_codes:
+  1-26 per tile, 0 for an empty cell), the scan behind validate().
+  a scan returns every maximal horizontal / vertical run of length >= 2 as a
+  row of (row, col, direction, length), direction 0 going right and 1 going
+  down, in the order build_words meets them; or None when some tile has no
+  neighbour at all. unlike build_words it never reads past the board edge.
+- the scan is compiled with numba when numba is importable. otherwise (or with
+  BANANAGRAML_KERNELS=numpy) a NumPy version does the same in whole-array
+  operations. _scan_loops is the plain-Python source of the numba kernel.
+  only the compiled scan is faster than build_words over the board's tile
+  objects, so validate() uses it when ACCELERATED and keeps build_words
+  otherwise.
+- each run also gets its word key (wordkeys.py: 5 bits per letter code), which
+  the compiled scan packs as it walks the run and the NumPy path computes in
+  one gather, so validation never builds strings; only runs longer than
+  KEY_LETTERS are read back as text for the dictionary.
+- the batch forms take a (boards, rows, cols) stack, e.g. one grid per env of
+  a vectorized env, and look every distinct run up once for the whole batch.
+"""
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .model import is_word
+from .wordkeys import KEY_LETTERS, LONG_RUN, default_keys
+
+RIGHT, DOWN = 0, 1
+_NO_RUNS = np.zeros((0, 4), dtype=np.int32)
+_NO_KEYS = np.zeros(0, dtype=np.int64)
+
+
+def _scan_loops(codes, out, keys):
+    """
+    fills out[:n] with the runs of one grid and keys[:n] with their word keys
+    (LONG_RUN past KEY_LETTERS letters) and returns n, or -1 as soon as a tile
+    turns out isolated. out and keys need rows * cols rows.
+    """
+    rows, cols = codes.shape
+    n = 0
+    for i in range(rows):
+        for j in range(cols):
+            if codes[i, j] == 0:
+                continue
+            up = i > 0 and codes[i - 1, j] != 0
+            down = i + 1 < rows and codes[i + 1, j] != 0
+            left = j > 0 and codes[i, j - 1] != 0
+            right = j + 1 < cols and codes[i, j + 1] != 0
+            if not (up or down or left or right):
+                return -1
+            if down and not up:
+                key = 0
+                k = i
+                while k < rows and codes[k, j] != 0:
+                    key = key << 5 | codes[k, j]
+                    k += 1
+                out[n, 0] = i
+                out[n, 1] = j
+                out[n, 2] = DOWN
+                out[n, 3] = k - i
+                keys[n] = key if k - i <= KEY_LETTERS else LONG_RUN
+                n += 1
+            if right and not left:
+                key = 0
+                k = j
+                while k < cols and codes[i, k] != 0:
+                    key = key << 5 | codes[i, k]
+                    k += 1
+                out[n, 0] = i
+                out[n, 1] = j
+                out[n, 2] = RIGHT
+                out[n, 3] = k - j
+                keys[n] = key if k - j <= KEY_LETTERS else LONG_RUN
+                n += 1
+    return n
+
+
+def _segments(occupied: np.ndarray):
+    """
+    (line, start, length) of every run of 2+ True cells along the last axis
+    of a (lines, width) array.
+    """
+    lines, width = occupied.shape
+    padded = np.zeros((lines, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = occupied
+    edges = np.diff(padded, axis=1)
+    line, start = np.nonzero(edges == 1)
+    _, stop = np.nonzero(edges == -1)
+    length = stop - start
+    keep = length >= 2
+    return line[keep], start[keep], length[keep]
+
+
+def _scan_numpy(codes: np.ndarray) -> Optional[np.ndarray]:
+    occupied = codes != 0
+    if not occupied.any():
+        return _NO_RUNS
+    neighbours = np.zeros_like(occupied)
+    neighbours[1:] |= occupied[:-1]
+    neighbours[:-1] |= occupied[1:]
+    neighbours[:, 1:] |= occupied[:, :-1]
+    neighbours[:, :-1] |= occupied[:, 1:]
+    if (occupied & ~neighbours).any():
+        return None
+    row, col, length = _segments(occupied)
+    vcol, vrow, vlength = _segments(occupied.T)
+    runs = np.empty((row.size + vrow.size, 4), dtype=np.int32)
+    runs[: row.size] = np.column_stack((row, col, np.full_like(row, RIGHT), length))
+    runs[row.size :] = np.column_stack((vrow, vcol, np.full_like(vrow, DOWN), vlength))
+    # build_words' order: by cell, the vertical run before the horizontal one.
+    return runs[np.lexsort((-runs[:, 2], runs[:, 1], runs[:, 0]))]
+
+
+def _load_numba():
+    if os.environ.get("BANANAGRAML_KERNELS", "").lower() == "numpy":
+        return None, None
+    try:
+        import numba
+    except ImportError:
+        return None, None
+    scan = numba.njit(cache=True, nogil=True)(_scan_loops)
+
+    @numba.njit(nogil=True)
+    def scan_batch(grids, out, keys, counts):
+        for b in range(grids.shape[0]):
+            counts[b] = scan(grids[b], out[b], keys[b])
+
+    return scan, scan_batch
+
+
+_scan_jit, _scan_batch_jit = _load_numba()
+BACKEND = "numba" if _scan_jit is not None else "numpy"
+# True when the compiled scan beats build_words; validate() only switches then.
+ACCELERATED = _scan_jit is not None
+
+
+def _gather(codes: np.ndarray, runs: np.ndarray):
+    """the codes of every run, one after the other, and where each run ends."""
+    lengths = runs[:, 3].astype(np.intp)
+    ends = np.cumsum(lengths)
+    step = np.arange(int(ends[-1]), dtype=np.intp) - np.repeat(ends - lengths, lengths)
+    down = np.repeat(runs[:, 2] == DOWN, lengths)
+    rows = np.repeat(runs[:, 0], lengths) + step * down
+    cols = np.repeat(runs[:, 1], lengths) + step * ~down
+    return codes[rows, cols], lengths, ends
+
+
+def run_keys(codes: np.ndarray, runs: np.ndarray) -> np.ndarray:
+    """int64 word keys of runs read from the grid (LONG_RUN past KEY_LETTERS letters)."""
+    if runs is None or not len(runs):
+        return _NO_KEYS
+    letters, lengths, ends = _gather(codes, runs)
+    after = np.minimum(np.repeat(ends, lengths) - 1 - np.arange(letters.size), KEY_LETTERS)
+    keys = np.add.reduceat(letters.astype(np.int64) << (5 * after), ends - lengths)
+    keys[lengths > KEY_LETTERS] = LONG_RUN
+    return keys
+
+
+def run_strings(codes: np.ndarray, runs: np.ndarray) -> List[str]:
+    """the letters of each run, read from the grid in one gather."""
+    if runs is None or not len(runs):
+        return []
+    letters, lengths, ends = _gather(codes, runs)
+    text = (letters + 64).astype(np.uint8).tobytes().decode("ascii")
+    return [text[b - n : b] for n, b in zip(lengths.tolist(), ends.tolist())]
+
+
+def scan_runs(codes: np.ndarray) -> Optional[np.ndarray]:
+    """(n, 4) int32 runs of a (rows, cols) code grid, or None if a tile is isolated."""
+    found = scan_keys(codes)
+    return None if found is None else found[0]
+
+
+def scan_keys(codes: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """(runs, word keys) of a code grid, or None if a tile is isolated."""
+    if _scan_jit is None:
+        runs = _scan_numpy(codes)
+        return None if runs is None else (runs, run_keys(codes, runs))
+    out = np.empty((codes.size, 4), dtype=np.int32)
+    keys = np.empty(codes.size, dtype=np.int64)
+    n = _scan_jit(codes, out, keys)
+    return None if n < 0 else (out[:n], keys[:n])
+
+
+def scan_keys_batch(grids: np.ndarray) -> List[Optional[Tuple[np.ndarray, np.ndarray]]]:
+    """scan_keys for each grid of a (boards, rows, cols) stack, in one kernel call."""
+    grids = np.asarray(grids)
+    if _scan_batch_jit is None:
+        return [scan_keys(grid) for grid in grids]
+    boards, rows, cols = grids.shape
+    out = np.empty((boards, rows * cols, 4), dtype=np.int32)
+    keys = np.empty((boards, rows * cols), dtype=np.int64)
+    counts = np.empty(boards, dtype=np.int64)
+    _scan_batch_jit(grids, out, keys, counts)
+    return [None if n < 0 else (out[b, :n], keys[b, :n]) for b, n in enumerate(counts.tolist())]
+
+
+def _long_runs_are_words(codes: np.ndarray, runs: np.ndarray, keys: np.ndarray) -> bool:
+    long = keys == LONG_RUN
+    return all(is_word(run) for run in run_strings(codes, runs[long])) if long.any() else True
+
+
+def validate_codes(codes: np.ndarray) -> bool:
+    """no isolated tile and every run is a word; validate() for a dense grid."""
+    found = scan_keys(codes)
+    if found is None:
+        return False
+    runs, keys = found
+    known = default_keys().key_set
+    for key in keys.tolist():
+        if key not in known and key != LONG_RUN:
+            return False
+    return _long_runs_are_words(codes, runs, keys)
+
+
+def validate_batch(grids: np.ndarray) -> np.ndarray:
+    """
+    validate_codes for each grid of a stack: one scan, then every run key of
+    the batch looked up in one search over the sorted dictionary keys.
+    """
+    grids = np.asarray(grids)
+    found = scan_keys_batch(grids)
+    valid = np.array([f is not None for f in found], dtype=bool)
+    scanned = [b for b in np.flatnonzero(valid).tolist() if len(found[b][1])]
+    if not scanned:
+        return valid
+    keys = np.concatenate([found[b][1] for b in scanned])
+    ok = default_keys().contains(keys) | (keys == LONG_RUN)
+    owner = np.repeat(scanned, [len(found[b][1]) for b in scanned])
+    valid[np.unique(owner[~ok])] = False
+    for b in scanned:
+        if valid[b] and not _long_runs_are_words(grids[b], *found[b]):
+            valid[b] = False
+    return valid
@@ -0,0 +1,399 @@
+"""
+- a non-learned baseline player for BananaGramlModel.
+  moves are generated the way Scrabble move generators do it: every empty cell
+  touching a tile is an anchor, and each empty cell gets a cross-check set (the
+  letters that keep the perpendicular word in the dictionary). words are grown
+  left-to-right through the anchor with prefix pruning against the sorted
+  dictionary, and a beam search chains moves until the bench is empty or the
+  time budget runs out. openings on an empty board come straight from the
+  anagram index.
+"""
+import bisect
+import gc
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .anagram import default_index
+from .model import BananaGramlModel, dictionary
+
+ACROSS = (0, 1)
+DOWN = (1, 0)
+
+Cell = Tuple[int, int]
+Grid = Dict[Cell, str]
+
+_ALPHABET = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+_sorted_words: Optional[List[str]] = None
+
+
+def _words() -> List[str]:
+    global _sorted_words
+    if _sorted_words is None:
+        _sorted_words = sorted(dictionary)
+    return _sorted_words
+
+
+_tables_built = False
+
+
+def _build_tables() -> None:
+    """
+    builds the sorted word list and the anagram index, then moves them to the
+    collector's permanent generation (gc.freeze) once: they never die, and a
+    full collection walking them costs tens of ms mid-search.
+    """
+    global _tables_built
+    if not _tables_built:
+        _words()
+        default_index()
+        gc.freeze()
+        _tables_built = True
+
+
+@lru_cache(maxsize=1 << 18)
+def is_prefix(prefix: str) -> bool:
+    """true if some dictionary word starts with prefix."""
+    words = _words()
+    i = bisect.bisect_left(words, prefix)
+    return i < len(words) and words[i].startswith(prefix)
+
+
+@dataclass(frozen=True)
+class Move:
+    word: str
+    row: int
+    col: int
+    direction: Tuple[int, int]
+    # only the tiles that come off the bench: (row, col, letter)
+    placements: Tuple[Tuple[int, int, str], ...]
+    score: float
+
+
+def grid_from_model(model: BananaGramlModel) -> Grid:
+    """(row, col) -> letter for every tile currently on the board."""
+    return {cell: letter.upper() for cell, letter in model.board_letters()}
+
+
+def score_move(word: str, placements) -> float:
+    # tiles off the bench is what wins the game; word length breaks ties.
+    return len(placements) + 0.01 * len(word)
+
+
+class MoveGenerator:
+    """
+    generates every legal placement for one (grid, bench) state.
+
+    the outermost ring of the board is never played on: build_words reads
+    board[i + 1] and board[i - 1] without bounds checks, so tiles on the edge
+    either wrap around or raise. rows / cols of None mean an unbounded
+    (sparse) board.
+
+    past the deadline the word search unwinds at once and generate() returns
+    what was found so far (timed_out is then set).
+    """
+
+    def __init__(self, grid: Grid, rows: Optional[int], cols: Optional[int], bench: Counter, deadline=None):
+        self.grid = grid
+        self.rows = rows
+        self.cols = cols
+        self.bench = bench
+        self.deadline = deadline
+        self.timed_out = False
+        self.evaluations = 0
+        self._cross: Dict[Tuple[Cell, Tuple[int, int]], Optional[frozenset]] = {}
+        self._moves: Dict[Tuple, Move] = {}
+
+    def expired(self) -> bool:
+        if not self.timed_out and self.deadline is not None and time.perf_counter() > self.deadline:
+            self.timed_out = True
+        return self.timed_out
+
+    def playable(self, cell: Cell) -> bool:
+        if self.rows is None:
+            return True
+        r, c = cell
+        return 0 < r < self.rows - 1 and 0 < c < self.cols - 1
+
+    def anchors(self) -> List[Cell]:
+        grid = self.grid
+        out = set()
+        for (r, c) in grid:
+            for cell in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if cell not in grid and self.playable(cell):
+                    out.add(cell)
+        return sorted(out)
+
+    def cross_check(self, cell: Cell, direction) -> Optional[frozenset]:
+        """letters allowed in an empty cell, or None when nothing is perpendicular."""
+        key = (cell, direction)
+        if key in self._cross:
+            return self._cross[key]
+        dr, dc = direction[1], direction[0]
+        grid = self.grid
+        before = []
+        r, c = cell[0] - dr, cell[1] - dc
+        while (r, c) in grid:
+            before.append(grid[(r, c)])
+            r, c = r - dr, c - dc
+        after = []
+        r, c = cell[0] + dr, cell[1] + dc
+        while (r, c) in grid:
+            after.append(grid[(r, c)])
+            r, c = r + dr, c + dc
+        if not before and not after:
+            allowed = None
+        else:
+            head = "".join(reversed(before))
+            tail = "".join(after)
+            allowed = frozenset(
+                letter for letter in _ALPHABET if head + letter + tail in dictionary
+            )
+        self._cross[key] = allowed
+        return allowed
+
+    def generate(self, limit: Optional[int] = None) -> List[Move]:
+        """legal moves, best first; with limit only the best limit of them."""
+        if not self.grid:
+            self._opening(limit)
+        else:
+            anchors = self.anchors()
+            anchor_set = set(anchors)
+            for direction in (ACROSS, DOWN):
+                for anchor in anchors:
+                    if self.expired():
+                        break
+                    self._from_anchor(anchor, direction, anchor_set)
+        return sorted(self._moves.values(), key=lambda m: m.score, reverse=True)[:limit]
+
+    def _from_anchor(self, anchor: Cell, direction, anchor_set) -> None:
+        dr, dc = direction
+        grid = self.grid
+        prev = (anchor[0] - dr, anchor[1] - dc)
+        if prev in grid:
+            # the left part is fixed: it's whatever is already on the board.
+            letters = []
+            cell = prev
+            while cell in grid:
+                letters.append(grid[cell])
+                cell = (cell[0] - dr, cell[1] - dc)
+            partial = "".join(reversed(letters))
+            if is_prefix(partial):
+                start = (cell[0] + dr, cell[1] + dc)
+                self._extend(partial, anchor, anchor, direction, start, [])
+            return
+
+        limit = 0
+        cell = prev
+        while (
+            self.playable(cell)
+            and cell not in grid
+            and cell not in anchor_set
+            and limit < sum(self.bench.values()) - 1
+        ):
+            limit += 1
+            cell = (cell[0] - dr, cell[1] - dc)
+        self._left_part("", [], anchor, direction, limit)
+
+    def _left_part(self, partial: str, placed, anchor: Cell, direction, limit: int) -> None:
+        dr, dc = direction
+        n = len(partial)
+        start = (anchor[0] - n * dr, anchor[1] - n * dc)
+        self._extend(partial, anchor, anchor, direction, start, placed)
+        if limit == 0 or self.timed_out:
+            return
+        # a left part sits on empty cells with no perpendicular neighbours
+        # (otherwise they'd be anchors), so no cross-checks are needed.
+        for letter in list(self.bench):
+            if self.bench[letter] == 0 or not is_prefix(partial + letter):
+                continue
+            self.bench[letter] -= 1
+            self._left_part(partial + letter, placed + [letter], anchor, direction, limit - 1)
+            self.bench[letter] += 1
+
+    def _extend(self, partial, cell, anchor, direction, start, placed) -> None:
+        if self.expired():
+            return
+        dr, dc = direction
+        grid = self.grid
+        if cell in grid:
+            letter = grid[cell]
+            if is_prefix(partial + letter):
+                self._extend(
+                    partial + letter, (cell[0] + dr, cell[1] + dc),
+                    anchor, direction, start, placed,
+                )
+            return
+
+        if cell != anchor and len(partial) >= 2 and placed:
+            self.evaluations += 1
+            if partial in dictionary:
+                self._record(partial, start, direction, placed)
+        if not self.playable(cell):
+            return
+
+        allowed = self.cross_check(cell, direction)
+        for letter in list(self.bench):
+            if self.bench[letter] == 0:
+                continue
+            if allowed is not None and letter not in allowed:
+                continue
+            if not is_prefix(partial + letter):
+                continue
+            self.bench[letter] -= 1
+            self._extend(
+                partial + letter, (cell[0] + dr, cell[1] + dc),
+                anchor, direction, start, placed + [letter],
+            )
+            self.bench[letter] += 1
+
+    def _record(self, word: str, start: Cell, direction, placed_letters) -> None:
+        dr, dc = direction
+        placements = []
+        for k, letter in enumerate(word):
+            cell = (start[0] + k * dr, start[1] + k * dc)
+            if cell not in self.grid:
+                placements.append((cell[0], cell[1], letter))
+        key = (start, direction, word)
+        if key not in self._moves:
+            self._moves[key] = Move(
+                word=word,
+                row=start[0],
+                col=start[1],
+                direction=direction,
+                placements=tuple(placements),
+                score=score_move(word, placements),
+            )
+
+    def _opening(self, limit: Optional[int] = None) -> None:
+        # empty board: any word spellable from the bench, centred on the board.
+        max_len = None if self.cols is None else self.cols - 2
+        index = default_index()
+        found = index.spellable_indices(self.bench.elements(), max_len=max_len)
+        self.evaluations += int(found.size)
+        if limit is not None:
+            # an opening plays every letter, so the score only grows with
+            # length: keep the longest words, in index order among equals (as
+            # generate()'s stable sort would), before building any Move.
+            found = found[np.argsort(-index.lengths[found], kind="stable")[:limit]]
+        if self.rows is None:
+            row, mid = 0, 0
+        else:
+            row, mid = self.rows // 2, self.cols // 2
+        for i in found:
+            if self.expired():
+                break
+            word = index.words[i]
+            col = mid - len(word) // 2
+            if self.cols is not None:
+                col = max(1, col)
+            self._record(word, (row, col), ACROSS, list(word))
+
+
+def apply_move(grid: Grid, bench: Counter, move: Move) -> Tuple[Grid, Counter]:
+    """returns the (grid, bench) after playing move; the inputs are untouched."""
+    grid = dict(grid)
+    bench = Counter(bench)
+    for r, c, letter in move.placements:
+        grid[(r, c)] = letter
+        bench[letter] -= 1
+    return grid, +bench
+
+
+@dataclass
+class _Node:
+    grid: Grid
+    bench: Counter
+    plan: Tuple[Move, ...]
+    score: float
+
+
+class BeamSolver:
+    """
+    beam search over sequences of moves.
+
+    beam_width=1 is a plain greedy player. time_budget is in seconds and
+    covers the whole search: the deadline is checked inside move generation,
+    so a search overruns it by about one word-search step, and past it the
+    best plan found so far is returned.
+    """
+
+    def __init__(
+        self,
+        beam_width: int = 4,
+        max_depth: int = 6,
+        moves_per_state: int = 12,
+        time_budget: Optional[float] = 0.05,
+    ):
+        if beam_width < 1:
+            raise ValueError("beam_width must be at least 1")
+        if max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        self.beam_width = beam_width
+        self.max_depth = max_depth
+        self.moves_per_state = moves_per_state
+        self.time_budget = time_budget
+        self.evaluations = 0
+
+    def solve(self, model: BananaGramlModel) -> List[Move]:
+        """best sequence of moves found for the model's current board and bench."""
+        grid = grid_from_model(model)
+        bench = Counter(t.get_value().upper() for t in model.tiles_on_bench)
+        if model.sparse_board is not None:
+            rows = cols = None
+        else:
+            rows, cols = len(model.coordinates), len(model.coordinates[0])
+        return self.search(grid, bench, rows, cols)
+
+    def search(self, grid: Grid, bench: Counter, rows: Optional[int], cols: Optional[int]) -> List[Move]:
+        # the one-off sort and index build shouldn't eat the first search's budget.
+        _build_tables()
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+        self.evaluations = 0
+
+        beam = [_Node(grid, Counter(bench), (), 0.0)]
+        best = beam[0]
+        for _ in range(self.max_depth):
+            children = []
+            for node in beam:
+                if not node.bench:
+                    continue
+                gen = MoveGenerator(node.grid, rows, cols, Counter(node.bench), deadline)
+                moves = gen.generate(self.moves_per_state)
+                self.evaluations += gen.evaluations
+                for move in moves:
+                    g, b = apply_move(node.grid, node.bench, move)
+                    children.append(_Node(g, b, node.plan + (move,), node.score + move.score))
+                if gen.timed_out or (deadline is not None and time.perf_counter() > deadline):
+                    break
+            if not children:
+                break
+            children.sort(key=lambda n: n.score, reverse=True)
+            beam = children[: self.beam_width]
+            if beam[0].score > best.score:
+                best = beam[0]
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        return list(best.plan)
+
+    def best_move(self, model: BananaGramlModel) -> Optional[Move]:
+        plan = self.solve(model)
+        return plan[0] if plan else None
+
+
+def play_move(model: BananaGramlModel, move: Move) -> None:
+    """places move's tiles from the model's bench onto its board."""
+    for r, c, letter in move.placements:
+        tile = next(
+            (t for t in model.tiles_on_bench if t.get_value().upper() == letter), None
+        )
+        if tile is None:
+            raise ValueError(f"no {letter!r} tile on the bench for {move.word}")
+        model.place_tile_at(tile, r, c)
@@ -0,0 +1,208 @@
+"""
+- an unbounded board for BananaGramlModel: a hash of (row, col) -> tile with
+  a tracked bounding box and running centroid.
+  there are no edges to fall off, and every operation (validation, windowing)
+  touches only the tiles that are actually placed, never the grid area.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+Cell = Tuple[int, int]
+
+
+class SparseBoard:
+    def __init__(self):
+        self.cells: Dict[Cell, object] = {}
+        # model tile -> cell, so moving a tile doesn't need a search.
+        self._where: Dict[object, Cell] = {}
+        self._row_sum = 0
+        self._col_sum = 0
+        self._bbox: Optional[Tuple[int, int, int, int]] = None
+        self._bbox_stale = False
+        # (rows, cols, codes) arrays of the placed tiles, rebuilt lazily after
+        # a change so windowing is array indexing rather than a dict walk.
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, cell: Cell) -> bool:
+        return cell in self.cells
+
+    def get(self, cell: Cell):
+        return self.cells.get(cell)
+
+    def cell_of(self, model_tile) -> Optional[Cell]:
+        return self._where.get(model_tile)
+
+    def place(self, row: int, col: int, model_tile) -> None:
+        """puts a tile on (row, col), moving it if it's already on the board."""
+        cell = (row, col)
+        if cell in self.cells and self.cells[cell] != model_tile:
+            raise ValueError(f"cell {cell} is already occupied")
+        if model_tile in self._where:
+            self.remove(model_tile)
+        self.cells[cell] = model_tile
+        self._where[model_tile] = cell
+        self._arrays = None
+        self._row_sum += row
+        self._col_sum += col
+        if self._bbox is None:
+            self._bbox = (row, row, col, col)
+        elif not self._bbox_stale:
+            r0, r1, c0, c1 = self._bbox
+            self._bbox = (min(r0, row), max(r1, row), min(c0, col), max(c1, col))
+
+    def remove(self, model_tile):
+        cell = self._where.pop(model_tile, None)
+        if cell is None:
+            return None
+        del self.cells[cell]
+        self._arrays = None
+        self._row_sum -= cell[0]
+        self._col_sum -= cell[1]
+        if not self.cells:
+            self._bbox = None
+            self._bbox_stale = False
+        elif self._bbox is not None:
+            r0, r1, c0, c1 = self._bbox
+            # only a tile on the box's border can shrink it; recompute lazily.
+            if cell[0] in (r0, r1) or cell[1] in (c0, c1):
+                self._bbox_stale = True
+        return cell
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def bounding_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """(min_row, max_row, min_col, max_col), or None for an empty board."""
+        if not self.cells:
+            return None
+        if self._bbox_stale or self._bbox is None:
+            rows = [r for r, _ in self.cells]
+            cols = [c for _, c in self.cells]
+            self._bbox = (min(rows), max(rows), min(cols), max(cols))
+            self._bbox_stale = False
+        return self._bbox
+
+    def centroid(self) -> Optional[Tuple[float, float]]:
+        n = len(self.cells)
+        if n == 0:
+            return None
+        return (self._row_sum / n, self._col_sum / n)
+
+    def as_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(rows, cols, letter codes) of every placed tile, as parallel arrays."""
+        if self._arrays is None:
+            n = len(self.cells)
+            rows = np.fromiter((r for r, _ in self.cells), dtype=np.int64, count=n)
+            cols = np.fromiter((c for _, c in self.cells), dtype=np.int64, count=n)
+            codes = np.fromiter((t.code for t in self.cells.values()), dtype=np.uint8, count=n)
+            self._arrays = (rows, cols, codes)
+        return self._arrays
+
+    def window_codes(self, out: np.ndarray, center: Optional[Tuple[float, float]] = None) -> np.ndarray:
+        """
+        array form of window(): writes letter codes of the tiles inside an
+        out.shape window into `out` (zeros elsewhere) and returns it.
+        """
+        out.fill(0)
+        if center is None:
+            center = self.centroid()
+        if center is None:
+            return out
+        rows, cols = out.shape
+        r, c, codes = self.as_arrays()
+        wr = r - (int(round(center[0])) - rows // 2)
+        wc = c - (int(round(center[1])) - cols // 2)
+        keep = (wr >= 0) & (wr < rows) & (wc >= 0) & (wc < cols)
+        out[wr[keep], wc[keep]] = codes[keep]
+        return out
+
+    def letters(self) -> Iterator[Tuple[Cell, str]]:
+        for cell, tile in self.cells.items():
+            yield cell, tile.get_value()
+
+    def _run_from(self, cell: Cell, dr: int, dc: int) -> str:
+        cells = self.cells
+        r, c = cell
+        word = ""
+        while (r, c) in cells:
+            word += cells[(r, c)].get_value()
+            r, c = r + dr, c + dc
+        return word
+
+    def runs(self) -> List[str]:
+        """every maximal horizontal / vertical run of length >= 2."""
+        cells = self.cells
+        out = []
+        for (r, c) in cells:
+            if (r, c + 1) in cells and (r, c - 1) not in cells:
+                out.append(self._run_from((r, c), 0, 1))
+            if (r + 1, c) in cells and (r - 1, c) not in cells:
+                out.append(self._run_from((r, c), 1, 0))
+        return out
+
+    def _key_from(self, cell: Cell, dr: int, dc: int) -> Tuple[int, int]:
+        """(word key, length) of the run starting at cell; see wordkeys.py."""
+        cells = self.cells
+        r, c = cell
+        key = length = 0
+        while (r, c) in cells:
+            key = key << 5 | cells[(r, c)].code
+            length += 1
+            r, c = r + dr, c + dc
+        return key, length
+
+    def run_keys(self) -> List[int]:
+        """runs() as word keys, read from the tiles' letter codes without strings."""
+        cells = self.cells
+        out = []
+        for (r, c) in cells:
+            if (r, c + 1) in cells and (r, c - 1) not in cells:
+                out.append(self._key_from((r, c), 0, 1)[0])
+            if (r + 1, c) in cells and (r - 1, c) not in cells:
+                out.append(self._key_from((r, c), 1, 0)[0])
+        return out
+
+    def run_keys_through(self, row: int, col: int) -> List[int]:
+        """word keys of the runs (length >= 2) through a cell."""
+        cells = self.cells
+        out = []
+        for dr, dc in ((0, 1), (1, 0)):
+            r, c = row, col
+            while (r - dr, c - dc) in cells:
+                r, c = r - dr, c - dc
+            key, length = self._key_from((r, c), dr, dc)
+            if length >= 2:
+                out.append(key)
+        return out
+
+    def has_isolated_tile(self) -> bool:
+        cells = self.cells
+        for (r, c) in cells:
+            if (
+                (r + 1, c) not in cells
+                and (r - 1, c) not in cells
+                and (r, c + 1) not in cells
+                and (r, c - 1) not in cells
+            ):
+                return True
+        return False
+
+    def window(self, rows: int, cols: int, center: Optional[Tuple[float, float]] = None):
+        """
+        tiles inside a rows x cols window, as (window_row, window_col, letter).
+        the window is centred on `center` (defaults to the tile centroid).
+        """
+        if center is None:
+            center = self.centroid()
+        if center is None:
+            return
+        top = int(round(center[0])) - rows // 2
+        left = int(round(center[1])) - cols // 2
+        for (r, c), tile in self.cells.items():
+            wr, wc = r - top, c - left
+            if 0 <= wr < rows and 0 <= wc < cols:
+                yield wr, wc, tile.get_value()
@@ -0,0 +1,83 @@
+"""
+- dictionary words as integers, so a run can be looked up straight from the
+  letter codes on the board (1-26, as in BananaGramlModel.letter_codes)
+  without building a string: 5 bits per letter, first letter highest,
+      key = ((c0 << 5 | c1) << 5 | c2) ...
+  codes are never 0, so words of different lengths never share a key.
+- words of up to KEY_LETTERS (12) letters fit in 60 bits; their keys are kept
+  as a sorted int64 array for whole-array lookups (np.searchsorted), and -1
+  stands for "longer than that" in int64 key arrays. python ints don't
+  overflow, so the set used for one-at-a-time lookups holds every word.
+"""
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .model import dictionary, letter_code
+
+KEY_LETTERS = 12
+LONG_RUN = -1
+
+
+def word_key(word: str) -> int:
+    key = 0
+    for letter in word:
+        key = key << 5 | letter_code(letter)
+    return key
+
+
+def codes_key(codes: Iterable[int]) -> int:
+    key = 0
+    for code in codes:
+        key = key << 5 | int(code)
+    return key
+
+
+def key_word(key: int) -> str:
+    """the word a key spells (for logs and debugging)."""
+    letters = []
+    while key:
+        letters.append(chr(64 + (key & 31)))
+        key >>= 5
+    return "".join(reversed(letters))
+
+
+class WordKeys:
+    def __init__(self, words: Iterable[str]):
+        words = sorted({w.upper() for w in words if w.isascii() and w.isalpha()})
+        short = [w for w in words if len(w) <= KEY_LETTERS]
+        lengths = np.fromiter((len(w) for w in short), dtype=np.intp, count=len(short))
+        codes = np.frombuffer("".join(short).encode("ascii"), dtype=np.uint8).astype(np.int64) - 64
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        # each letter shifted by 5 bits per letter after it in its word.
+        after = np.repeat(ends, lengths) - 1 - np.arange(codes.size)
+        packed = codes << (5 * after)
+        self.keys = np.unique(np.add.reduceat(packed, starts)) if short else np.zeros(0, np.int64)
+        self.key_set = frozenset(self.keys.tolist()) | frozenset(
+            word_key(w) for w in words if len(w) > KEY_LETTERS
+        )
+
+    def __len__(self) -> int:
+        return len(self.key_set)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.key_set
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """membership of int64 keys in one search; LONG_RUN entries come back False."""
+        keys = np.asarray(keys, dtype=np.int64)
+        at = np.searchsorted(self.keys, keys)
+        np.minimum(at, len(self.keys) - 1, out=at)
+        return self.keys[at] == keys if len(self.keys) else np.zeros(keys.shape, bool)
+
+
+_default_keys: Optional[WordKeys] = None
+
+
+def default_keys() -> WordKeys:
+    """the keys of the game dictionary, built on first use."""
+    global _default_keys
+    if _default_keys is None:
+        _default_keys = WordKeys(dictionary)
+    return _default_keys
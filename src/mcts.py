@@ -0,0 +1,567 @@
+"""
+Monte Carlo tree search player over the headless cursor actions
+(``game.src.game.cursor``, the ``MultiplayerBananaGramlEnv`` action set).
+
+States are never copied: each simulation walks down the tree applying actions
+to the real model and cursor, then rolls the model back through its undo
+journal (``BananaGramlModel.start_journal``) and restores the cursor. Priors
+and leaf values come from an evaluator, normally a PPO checkpoint from
+``train.py`` (action probabilities and its value head); up to ``batch_size``
+leaves are gathered with virtual loss and evaluated in one forward pass. After
+a move the chosen child becomes the new root, so its subtree is reused.
+
+Games run across a process pool, as evaluation or as expert-iteration data::
+
+    python mcts.py --checkpoint checkpoints/PPO/ckpt_000020480.zip --episodes 16 --workers 4
+    python mcts.py --checkpoint runs/ppo.zip --out data/mcts --episodes 64 --simulations 400
+
+``--out`` writes ``datagen.py`` shards (``obs_*``, ``action``, ``reward``,
+``done``) plus ``policy_target`` (root visit distribution) and
+``value_target`` (discounted return). Without ``--checkpoint`` priors are
+uniform and leaves are valued 0, i.e. plain MCTS on the game rewards.
+Observations are built with the env options of ``--config``, so pass the
+checkpoint's training config; a policy trained on another observation space
+is refused up front.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import time
+from dataclasses import dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from datagen import init_headless_worker, load_index, resume_index, save_index, write_shard
+from env import R_PEEL, R_TILE_TO_BOARD, R_VICTORY, board_dimensions
+from game.src.game.cursor import N_ACTIONS, NEXT_TILE, PICK_UP, PLACE, CursorController
+from game.src.game.model import BananaGramlModel
+from multiplayer_env import CursorObserver
+
+
+# Single-player env actions (Discrete(7)) -> cursor actions, for checkpoints
+# trained on BananaGramlEnvironment: focus switch ~ next tile, interact ~ place / pick up.
+_ENV_TO_CURSOR = (0, 1, 2, 3, NEXT_TILE, PLACE, PICK_UP)
+
+# env_kwargs entries that shape the observation (CursorObserver's keywords).
+_OBSERVATION_OPTIONS = ("max_bench_tiles", "board_encoding", "obs_dtype", "crosshair_units", "board_window", "dump_helper")
+
+
+class UniformEvaluator:
+    """Uniform priors and zero values."""
+
+    def __call__(self, obs: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        n = next(iter(obs.values())).shape[0]
+        return np.full((n, N_ACTIONS), 1.0 / N_ACTIONS, dtype=np.float32), np.zeros(n, dtype=np.float32)
+
+
+class PolicyEvaluator:
+    """
+    Action probabilities and values from an SB3 policy. Policies over the
+    single-player ``Discrete(7)`` actions are mapped onto the cursor actions;
+    DUMP, which that env lacks, keeps ``dump_prior``. With ``observation_space``
+    (the space the search builds, ``CursorObserver.observation_space``) the
+    policy must have been trained on that same space.
+    """
+
+    def __init__(self, model, dump_prior: float = 0.02, observation_space=None):
+        self.policy = model.policy
+        self.policy.set_training_mode(False)
+        self.n_actions = int(model.action_space.n)
+        if self.n_actions not in (N_ACTIONS, len(_ENV_TO_CURSOR)):
+            raise ValueError(f"policy has {self.n_actions} actions; expected {N_ACTIONS} or {len(_ENV_TO_CURSOR)}")
+        if observation_space is not None:
+            mismatched = _space_mismatches(model.observation_space, observation_space)
+            if mismatched:
+                raise ValueError(
+                    "policy was trained on a different observation space than the search builds "
+                    "(pass the checkpoint's training config): " + "; ".join(mismatched)
+                )
+        self.dump_prior = dump_prior
+
+    def __call__(self, obs: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        import torch
+
+        with torch.no_grad():
+            obs_t, _ = self.policy.obs_to_tensor(obs)
+            probs = self.policy.get_distribution(obs_t).distribution.probs.cpu().numpy()
+            values = self.policy.predict_values(obs_t).cpu().numpy().reshape(-1)
+        if self.n_actions == N_ACTIONS:
+            return probs, values
+        priors = np.full((probs.shape[0], N_ACTIONS), self.dump_prior, dtype=np.float32)
+        np.add.at(priors, (slice(None), list(_ENV_TO_CURSOR)), probs)
+        return priors, values
+
+
+def _space_mismatches(expected, got) -> List[str]:
+    """keys whose spaces differ between two Dict observation spaces, one line each."""
+    expected, got = expected.spaces, got.spaces
+    lines = []
+    for key in sorted(set(expected) | set(got)):
+        if key not in got:
+            lines.append(f"{key}: expected by the policy, not built")
+        elif key not in expected:
+            lines.append(f"{key}: built, unknown to the policy")
+        elif expected[key] != got[key]:
+            lines.append(f"{key}: policy {expected[key]}, built {got[key]}")
+    return lines
+
+
+class Node:
+    __slots__ = ("prior", "reward", "terminal", "visits", "value_sum", "virtual", "children")
+
+    def __init__(self, prior: float):
+        self.prior = prior
+        self.reward = 0.0  # reward for the action leading here
+        self.terminal = False
+        self.visits = 0
+        self.value_sum = 0.0
+        self.virtual = 0
+        self.children: Optional[Dict[int, Node]] = None
+
+    @property
+    def expanded(self) -> bool:
+        return self.children is not None
+
+    def value(self) -> float:
+        return self.value_sum / self.visits if self.visits else 0.0
+
+
+class _MinMax:
+    """Running bounds used to scale Q values (game rewards are not in [0, 1])."""
+
+    def __init__(self):
+        self.low = math.inf
+        self.high = -math.inf
+
+    def update(self, value: float) -> None:
+        self.low = min(self.low, value)
+        self.high = max(self.high, value)
+
+    def normalize(self, value: float) -> float:
+        if self.high > self.low:
+            return (value - self.low) / (self.high - self.low)
+        return value
+
+
+def step_reward(outcome: Optional[str], model: BananaGramlModel, peeled: bool) -> float:
+    """``MultiplayerBananaGramlEnv`` rewards for one cursor action."""
+    reward = 0.0
+    if outcome == "placed":
+        reward += R_TILE_TO_BOARD
+        if peeled:
+            reward += R_PEEL
+    elif outcome == "picked_up":
+        reward -= R_TILE_TO_BOARD
+    if model.victory:
+        reward += R_VICTORY
+    return reward
+
+
+def apply_action(cursor: CursorController, action: int) -> float:
+    model = cursor.model
+    remaining = model.tile_bank.get_current_size()
+    outcome = cursor.apply(action)
+    peeled = model.tile_bank.get_current_size() < remaining and outcome == "placed"
+    return step_reward(outcome, model, peeled)
+
+
+class MCTS:
+    """
+    PUCT search with virtual-loss leaf batching and subtree reuse.
+
+    ``simulations`` is per call to ``search``, counted on top of what a reused
+    root already holds. ``dirichlet_alpha`` / ``noise_frac`` add root noise for
+    self-play data; leave ``noise_frac`` at 0 for evaluation. ``observer``
+    builds the evaluator's observations (default env options if None).
+    """
+
+    def __init__(
+        self,
+        evaluator,
+        *,
+        simulations: int = 200,
+        batch_size: int = 16,
+        c_puct: float = 1.5,
+        discount: float = 0.99,
+        observer: Optional[CursorObserver] = None,
+        dirichlet_alpha: float = 0.3,
+        noise_frac: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if simulations < 1:
+            raise ValueError("simulations must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.evaluator = evaluator
+        self.simulations = simulations
+        self.batch_size = batch_size
+        self.c_puct = c_puct
+        self.discount = discount
+        self.observer = observer if observer is not None else CursorObserver()
+        self.dirichlet_alpha = dirichlet_alpha
+        self.noise_frac = noise_frac
+        self.rng = np.random.default_rng(seed)
+        self.root: Optional[Node] = None
+        self.stats = _MinMax()
+        self.evaluations = 0
+
+    def reset(self) -> None:
+        self.root = None
+        self.stats = _MinMax()
+
+    def advance(self, action: int) -> None:
+        """Keep the chosen child's subtree as the next root."""
+        if self.root is not None and self.root.children:
+            self.root = self.root.children.get(action)
+        else:
+            self.root = None
+
+    @staticmethod
+    def _expand(node: Node, legal: List[int], priors: np.ndarray) -> None:
+        """children for the legal actions, with priors renormalized over them."""
+        if not legal:
+            node.children = {}
+            return
+        p = priors[legal].astype(np.float64)
+        total = p.sum()
+        p = p / total if total > 0 else np.full(len(legal), 1.0 / len(legal))
+        node.children = {a: Node(float(q)) for a, q in zip(legal, p)}
+
+    def _add_noise(self, node: Node) -> None:
+        if self.noise_frac <= 0 or not node.children:
+            return
+        noise = self.rng.dirichlet([self.dirichlet_alpha] * len(node.children))
+        for child, n in zip(node.children.values(), noise):
+            child.prior = (1 - self.noise_frac) * child.prior + self.noise_frac * n
+
+    def _score(self, parent: Node, child: Node) -> float:
+        n = child.visits + child.virtual
+        if child.visits:
+            # virtual visits count as losses (normalized value 0).
+            q = self.stats.normalize(child.reward + self.discount * child.value()) * child.visits / n
+        else:
+            q = 0.0
+        u = self.c_puct * child.prior * math.sqrt(parent.visits + parent.virtual + 1) / (1 + n)
+        return q + u
+
+    def _select(self, cursor: CursorController) -> Tuple[List[Node], Node]:
+        node = self.root
+        path = [node]
+        while node.expanded and node.children and not node.terminal:
+            action, node = max(node.children.items(), key=lambda kv: self._score(path[-1], kv[1]))
+            if node.visits == 0 and not node.expanded:
+                node.reward = apply_action(cursor, action)
+                node.terminal = bool(cursor.model.victory)
+            else:
+                apply_action(cursor, action)
+            path.append(node)
+        return path, node
+
+    def _backup(self, path: List[Node], value: float, virtual: bool) -> None:
+        for node in reversed(path):
+            node.value_sum += value
+            node.visits += 1
+            if virtual:
+                node.virtual -= 1
+            self.stats.update(node.reward + self.discount * node.value())
+            value = node.reward + self.discount * value
+
+    def search(self, cursor: CursorController) -> Node:
+        """Run the simulations from the cursor's current state; returns the root."""
+        model = cursor.model
+        model.start_journal()
+        origin = cursor.state()
+
+        if self.root is None or not self.root.expanded:
+            self.root = Node(1.0)
+            priors, values = self.evaluator(self._stack([self.observer(cursor)]))
+            self.evaluations += 1
+            self._expand(self.root, cursor.legal_actions(), priors[0])
+            self.root.visits, self.root.value_sum = 1, float(values[0])
+        self._add_noise(self.root)
+
+        done = 0
+        while done < self.simulations:
+            # gather up to batch_size distinct leaves; virtual loss steers later
+            # selections in the batch away from the paths already taken.
+            batch: List[Tuple[List[Node], List[int]]] = []
+            observations = []
+            pending = set()
+            while done + len(batch) < self.simulations and len(batch) < self.batch_size:
+                path, leaf = self._select(cursor)
+                if leaf.terminal or leaf.expanded:
+                    # a win, or a state with no legal actions.
+                    legal = None
+                elif id(leaf) in pending:
+                    legal = None
+                else:
+                    legal = cursor.legal_actions()
+                    observations.append(self.observer(cursor))
+                model.rollback(0)
+                cursor.restore(origin)
+                if legal is None:
+                    if id(leaf) in pending:
+                        break
+                    self._backup(path, 0.0, virtual=False)
+                    done += 1
+                    continue
+                for node in path:
+                    node.virtual += 1
+                pending.add(id(leaf))
+                batch.append((path, legal))
+            if not batch:
+                continue
+            priors, values = self.evaluator(self._stack(observations))
+            self.evaluations += len(batch)
+            for (path, legal), p, v in zip(batch, priors, values):
+                self._expand(path[-1], legal, p)
+                self._backup(path, float(v), virtual=True)
+            done += len(batch)
+
+        model.stop_journal()
+        return self.root
+
+    def visit_distribution(self, root: Optional[Node] = None) -> np.ndarray:
+        root = self.root if root is None else root
+        pi = np.zeros(N_ACTIONS, dtype=np.float32)
+        for action, child in (root.children or {}).items():
+            pi[action] = child.visits
+        total = pi.sum()
+        return pi / total if total > 0 else pi
+
+    def choose(self, temperature: float = 0.0) -> int:
+        """Most visited root action, or sampled from visits ** (1 / temperature)."""
+        pi = self.visit_distribution()
+        if temperature <= 0:
+            return int(np.argmax(pi))
+        weights = pi ** (1.0 / temperature)
+        return int(self.rng.choice(N_ACTIONS, p=weights / weights.sum()))
+
+    def _stack(self, observations: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        return {k: np.stack([o[k] for o in observations]) for k in self.observer.keys}
+
+
+@dataclass(frozen=True)
+class GameTask:
+    game_id: int
+    seed: int
+    checkpoint: Optional[str]
+    simulations: int
+    batch_size: int
+    c_puct: float
+    noise_frac: float
+    temperature: float
+    temperature_moves: int
+    max_steps: int
+    starting_tiles: int
+    # CursorObserver keywords: the observation options of the checkpoint's env.
+    observation: Dict[str, Any]
+    board_backend: str
+    record: bool
+
+
+_EVALUATOR = None
+
+
+def _evaluator(checkpoint: Optional[str], observer: CursorObserver):
+    global _EVALUATOR
+    if _EVALUATOR is None:
+        if checkpoint is None:
+            _EVALUATOR = UniformEvaluator()
+        else:
+            from stable_baselines3 import PPO
+
+            _EVALUATOR = PolicyEvaluator(
+                PPO.load(checkpoint, device="cpu"),
+                observation_space=observer.observation_space,
+            )
+    return _EVALUATOR
+
+
+def play_game(task: GameTask) -> Dict[str, Any]:
+    """One game with MCTS choosing every action; returns stats (and samples if recording)."""
+    model = BananaGramlModel(board_dimensions, sparse=task.board_backend == "sparse")
+    model.write_board_dump = False
+    model.reset(seed=task.seed, starting_tiles=task.starting_tiles)
+    cursor = CursorController(model)
+    observer = CursorObserver(**task.observation)
+    planner = MCTS(
+        _evaluator(task.checkpoint, observer),
+        simulations=task.simulations,
+        batch_size=task.batch_size,
+        c_puct=task.c_puct,
+        observer=observer,
+        noise_frac=task.noise_frac,
+        seed=task.seed,
+    )
+    columns: Dict[str, List[Any]] = {f"obs_{k}": [] for k in observer.keys}
+    columns.update(action=[], reward=[], done=[], policy_target=[])
+
+    start = time.perf_counter()
+    steps = 0
+    for steps in range(1, task.max_steps + 1):
+        if task.record:
+            obs = observer(cursor)
+        planner.search(cursor)
+        temperature = task.temperature if steps <= task.temperature_moves else 0.0
+        action = planner.choose(temperature)
+        if task.record:
+            for k in observer.keys:
+                columns[f"obs_{k}"].append(obs[k])
+            columns["policy_target"].append(planner.visit_distribution())
+        reward = apply_action(cursor, action)
+        planner.advance(action)
+        columns["action"].append(action)
+        columns["reward"].append(reward)
+        columns["done"].append(bool(model.victory) or steps == task.max_steps)
+        if model.victory:
+            break
+    elapsed = time.perf_counter() - start
+
+    result: Dict[str, Any] = {
+        "game_id": task.game_id,
+        "seed": task.seed,
+        "victory": bool(model.victory),
+        "tiles_placed": len(model.tiles_on_board),
+        "steps": steps,
+        "return": float(sum(columns["reward"])),
+        "evaluations_per_sec": planner.evaluations / elapsed if elapsed > 0 else 0.0,
+    }
+    if task.record:
+        arrays = {f"obs_{k}": np.stack(columns[f"obs_{k}"]) for k in observer.keys}
+        arrays["action"] = np.asarray(columns["action"], dtype=np.int64)
+        arrays["reward"] = np.asarray(columns["reward"], dtype=np.float32)
+        arrays["done"] = np.asarray(columns["done"], dtype=np.bool_)
+        arrays["policy_target"] = np.stack(columns["policy_target"]).astype(np.float32)
+        returns = np.zeros(len(arrays["reward"]), dtype=np.float32)
+        running = 0.0
+        for t in range(len(returns) - 1, -1, -1):
+            running = arrays["reward"][t] + planner.discount * running
+            returns[t] = running
+        arrays["value_target"] = returns
+        result["arrays"] = arrays
+    return result
+
+
+def _init_worker(threads: int) -> None:
+    init_headless_worker()
+    import torch
+
+    torch.set_num_threads(threads)
+
+
+def run_games(tasks: Sequence[GameTask], *, workers: int, threads_per_worker: int = 1, out_dir: Optional[Path] = None):
+    """Play ``tasks`` across a spawn pool; with ``out_dir`` each game becomes one shard."""
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        index = load_index(out_dir)
+        settings: Dict[str, Any] = {}
+        if tasks:
+            task = tasks[0]
+            settings.update(
+                obs_keys=list(CursorObserver(**task.observation).keys),
+                env_kwargs=dict(
+                    task.observation,
+                    board_backend=task.board_backend,
+                    starting_tiles_on_bench=task.starting_tiles,
+                ),
+                max_episode_steps=task.max_steps,
+            )
+        resume_index(out_dir, index, format="npz", policy="mcts", **settings)
+    results = []
+    ctx = get_context("spawn")
+    with ctx.Pool(processes=max(1, workers), initializer=_init_worker, initargs=(threads_per_worker,)) as pool:
+        for result in pool.imap_unordered(play_game, tasks):
+            arrays = result.pop("arrays", None)
+            if out_dir is not None and arrays is not None:
+                path = write_shard(arrays, out_dir, result["game_id"], "npz")
+                index["shards"] = [s for s in index["shards"] if s["shard_id"] != result["game_id"]]
+                index["shards"].append({
+                    "shard_id": result["game_id"],
+                    "path": path.name,
+                    "transitions": int(arrays["action"].shape[0]),
+                    "episodes": 1,
+                    "seed": result["seed"],
+                })
+                index["shards"].sort(key=lambda s: s["shard_id"])
+                save_index(out_dir, index)
+            results.append(result)
+            print(
+                f"game {result['game_id']}: victory={result['victory']} tiles={result['tiles_placed']} "
+                f"steps={result['steps']} return={result['return']:.1f} "
+                f"evals/s={result['evaluations_per_sec']:.0f} ({len(results)}/{len(tasks)})"
+            )
+    results.sort(key=lambda r: r["game_id"])
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    from training_config import env_kwargs, load_training_config
+
+    parser = argparse.ArgumentParser(description="Play BananaGraml with MCTS over a PPO prior.")
+    parser.add_argument("--checkpoint", type=str, default=None, help="SB3 PPO .zip for priors and values.")
+    parser.add_argument("--episodes", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--simulations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=16, help="Leaves per evaluator call.")
+    parser.add_argument("--c-puct", type=float, default=1.5)
+    parser.add_argument("--noise-frac", type=float, default=0.0, help="Root Dirichlet noise (self-play).")
+    parser.add_argument("--temperature", type=float, default=0.0)
+    parser.add_argument("--temperature-moves", type=int, default=0, help="Moves sampled at --temperature.")
+    parser.add_argument("--max-steps", type=int, default=None, help="Default: max_episode_steps.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", type=str, default=None, help="Training JSON for env settings.")
+    parser.add_argument("--out", type=str, default=None, help="Write expert-iteration shards here.")
+    parser.add_argument("--json", type=str, default=None, help="Also write per-game results to this file.")
+    args = parser.parse_args(argv)
+
+    cfg = load_training_config(args.config)
+    kwargs = env_kwargs(cfg)
+    observation = {k: kwargs[k] for k in _OBSERVATION_OPTIONS}
+    tasks = [
+        GameTask(
+            game_id=i,
+            seed=args.seed + i,
+            checkpoint=args.checkpoint,
+            simulations=args.simulations,
+            batch_size=args.batch_size,
+            c_puct=args.c_puct,
+            noise_frac=args.noise_frac,
+            temperature=args.temperature,
+            temperature_moves=args.temperature_moves,
+            max_steps=args.max_steps or cfg.max_episode_steps,
+            starting_tiles=cfg.starting_tiles_on_bench,
+            observation=observation,
+            board_backend=cfg.board_backend,
+            record=args.out is not None,
+        )
+        for i in range(args.episodes)
+    ]
+    results = run_games(
+        tasks,
+        workers=min(args.workers, len(tasks)),
+        threads_per_worker=args.threads_per_worker,
+        out_dir=Path(args.out) if args.out else None,
+    )
+    wins = sum(r["victory"] for r in results)
+    print(
+        f"win_rate={wins / max(1, len(results)):.3f} "
+        f"tiles={np.mean([r['tiles_placed'] for r in results]):.2f} "
+        f"return={np.mean([r['return'] for r in results]):.1f}"
+    )
+    if args.json:
+        import json
+
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Env-side training metrics, aggregated where they happen and written in batches.
+
+Each ``BananaGramlEnvironment`` keeps running sums in an ``EnvMetrics`` (a few
+float adds per step, nothing per-step is stored; env_metrics.py, which imports
+neither torch nor SB3). Every ``metrics_freq`` timesteps ``MetricsCallback``
+pops the sums from all envs of the ``VecEnv`` in one ``env_method`` call,
+merges them into one set of means and hands them to a ``MetricsWriter``; its
+background thread writes whatever has queued up to TensorBoard every
+``metrics_flush_secs`` seconds, next to SB3's own event file for the run.
+Scalars (under ``env/``):
+
+    step_ms              mean env.step() wall time
+    placements, pickups, dumps
+                         per step
+    invalid_board        share of steps ending on an invalid board
+    episode_words        dictionary words on the board when an episode ends
+    episode_tiles        tiles on the board when an episode ends
+    win_rate             share of episodes won
+    episodes             episodes finished since the last write
+    steps_per_sec        all envs together, over the last interval
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+from stable_baselines3.common.callbacks import BaseCallback
+
+from env_metrics import EnvMetrics, merge_metrics, to_scalars  # noqa: F401
+
+
+class MetricsWriter:
+    """
+    Writes queued ``(step, scalars)`` batches to TensorBoard from a daemon
+    thread, flushing every ``flush_secs``. ``write`` never blocks training:
+    when the queue is full the batch is dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, log_dir: str, *, flush_secs: float = 10.0, max_queue: int = 256):
+        from torch.utils.tensorboard import SummaryWriter
+
+        self._writer = SummaryWriter(log_dir=log_dir, flush_secs=max(1, int(flush_secs)))
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._flush_secs = flush_secs
+        self._stop = threading.Event()
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, step: int, scalars: Dict[str, float]) -> None:
+        try:
+            self._queue.put_nowait((step, scalars))
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> None:
+        wrote = False
+        while True:
+            try:
+                step, scalars = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            for tag, value in scalars.items():
+                self._writer.add_scalar(tag, value, step)
+            wrote = True
+        if wrote:
+            self._writer.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._flush_secs):
+            self._drain()
+        self._drain()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._writer.close()
+
+
+class MetricsCallback(BaseCallback):
+    """
+    Every ``freq`` timesteps, merge the envs' ``pop_metrics()`` and queue them on
+    a ``MetricsWriter`` in the run's TensorBoard directory. Without TensorBoard
+    they go through the SB3 logger instead.
+    """
+
+    def __init__(self, freq: int, *, flush_secs: float = 10.0, verbose: int = 0):
+        super().__init__(verbose)
+        self.freq = freq
+        self.flush_secs = flush_secs
+        self.writer: Optional[MetricsWriter] = None
+        self._last_step = 0
+        self._last_time = 0.0
+
+    def _on_training_start(self) -> None:
+        log_dir = self.logger.get_dir()
+        formats = {type(f).__name__ for f in self.logger.output_formats}
+        if log_dir is not None and "TensorBoardOutputFormat" in formats:
+            self.writer = MetricsWriter(log_dir, flush_secs=self.flush_secs)
+        # drop anything the envs gathered before training started.
+        self.training_env.env_method("pop_metrics")
+        self._last_step = self.num_timesteps
+        self._last_time = time.perf_counter()
+
+    def _on_step(self) -> bool:
+        if self.num_timesteps - self._last_step >= self.freq:
+            self._collect()
+        return True
+
+    def _collect(self) -> None:
+        now = time.perf_counter()
+        scalars = to_scalars(merge_metrics(self.training_env.env_method("pop_metrics")))
+        if now > self._last_time:
+            scalars["env/steps_per_sec"] = (self.num_timesteps - self._last_step) / (now - self._last_time)
+        self._last_step, self._last_time = self.num_timesteps, now
+        if self.writer is not None:
+            self.writer.write(self.num_timesteps, scalars)
+        else:
+            for tag, value in scalars.items():
+                self.logger.record(tag, value)
+
+    def _on_training_end(self) -> None:
+        if self.num_timesteps != self._last_step:
+            self._collect()
+        if self.writer is not None:
+            self.writer.close()
+            if self.verbose and self.writer.dropped:
+                print(f"metrics: dropped {self.writer.dropped} batches")
+            self.writer = None
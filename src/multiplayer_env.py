@@ -0,0 +1,417 @@
+"""
+Multi-agent BananaGraml: N headless players racing on one shared bunch.
+
+Follows the PettingZoo ``ParallelEnv`` API (``reset`` / ``step`` on dicts keyed
+by agent name). PettingZoo is optional; when it is installed the env subclasses
+``ParallelEnv`` so its wrappers and API tests apply.
+
+There is no pygame UI per player, so actions drive a model-level cursor
+(``game.src.game.cursor.CursorController``)::
+
+    0 up, 1 down, 2 left, 3 right      move the cursor one cell
+    4                                  select the next bench tile
+    5                                  place the selected bench tile at the cursor
+    6                                  take the tile under the cursor back to the bench
+    7                                  dump the selected bench tile
+
+Observations use the same keys, shapes and units as ``BananaGramlEnvironment``
+so single-player policies can be dropped in.
+
+``MultiplayerVecEnv`` runs many tables at once for training, split across
+worker processes (one per core by default). Each step takes an
+``(n_games, n_players)`` action array and returns observations stacked the
+same way::
+
+    vec = MultiplayerVecEnv(64, n_players=4)
+    obs = vec.reset(seed=0)
+    obs, rewards, terminated, truncated, infos = vec.step(actions)
+    vec.close()
+"""
+
+from __future__ import annotations
+
+import os
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import gymnasium as gym
+import numpy as np
+
+from env import (
+    R_PEEL,
+    R_TILE_TO_BOARD,
+    R_VICTORY,
+    _BOARD_VALID_OBS,
+    _BOARD_ENCODINGS,
+    _CROSSHAIR_CELLS,
+    _CROSSHAIR_UNITS,
+    _OBS_DTYPES,
+    _ONE_HOT_CODES,
+    _crop_codes,
+    _encode_bench_codes,
+    _encode_board_codes,
+    board_dimensions,
+    observation_space,
+)
+from game.main import GameConfig
+from game.src.game.cursor import N_ACTIONS, CursorController
+from game.src.game.multiplayer import MultiplayerGame
+
+try:
+    from pettingzoo import ParallelEnv as _ParallelEnvBase
+except ImportError:  # optional dependency
+    _ParallelEnvBase = object
+
+
+class CursorObserver:
+    """
+    ``BananaGramlEnvironment`` observations of a cursor's model, for the env
+    options given (the observation keywords of ``env_kwargs``); the cursor
+    cell stands in for the crosshair. Each call returns fresh arrays.
+    """
+
+    def __init__(
+        self,
+        max_bench_tiles: int = 32,
+        *,
+        board_encoding: str = "codes",
+        obs_dtype: str = "float32",
+        crosshair_units: str = "pixels",
+        board_window: Optional[Tuple[int, int]] = None,
+        dump_helper: bool = False,
+    ):
+        if max_bench_tiles < 1:
+            raise ValueError("max_bench_tiles must be at least 1")
+        if board_encoding not in _BOARD_ENCODINGS:
+            raise ValueError(f"board_encoding must be one of {_BOARD_ENCODINGS}, got {board_encoding!r}")
+        if obs_dtype not in _OBS_DTYPES:
+            raise ValueError(f"obs_dtype must be one of {tuple(_OBS_DTYPES)}, got {obs_dtype!r}")
+        if crosshair_units not in _CROSSHAIR_UNITS:
+            raise ValueError(f"crosshair_units must be one of {_CROSSHAIR_UNITS}, got {crosshair_units!r}")
+        if board_window is not None:
+            board_window = tuple(int(n) for n in board_window)
+        self.max_bench_tiles = max_bench_tiles
+        self._board_encoding = board_encoding
+        self._crosshair_units = crosshair_units
+        self._board_window = board_window
+        self._dump_helper = dump_helper
+        self.observation_space = observation_space(
+            max_bench_tiles,
+            board_encoding=board_encoding,
+            obs_dtype=obs_dtype,
+            crosshair_units=crosshair_units,
+            board_window=board_window,
+            dump_helper=dump_helper,
+        )
+        self.keys = tuple(self.observation_space.spaces)
+
+    def _codes(self, cursor: CursorController, out: np.ndarray) -> np.ndarray:
+        player = cursor.model
+        if self._board_window is None:
+            return _encode_board_codes(player, out)
+        if player.sparse_board is not None:
+            return player.sparse_board.window_codes(out, center=(cursor.row, cursor.col))
+        return _crop_codes(player.letter_codes, cursor.row, cursor.col, out)
+
+    def _cross_hair(self, cursor: CursorController, out: np.ndarray) -> np.ndarray:
+        # Same top-left pixel units as Game.cross_hair_position.
+        x, y = cursor.col * GameConfig.DIVIDER, cursor.row * GameConfig.DIVIDER
+        if self._crosshair_units == "pixels":
+            out[0], out[1] = x, y
+        elif self._crosshair_units == "normalized":
+            out[0] = min(x / GameConfig.SCREEN_WIDTH, 1.0)
+            out[1] = min(y / GameConfig.SCREEN_HEIGHT, 1.0)
+        else:
+            out[0] = min(cursor.col, _CROSSHAIR_CELLS[0])
+            out[1] = min(cursor.row, _CROSSHAIR_CELLS[1])
+        return out
+
+    def __call__(self, cursor: CursorController) -> Dict[str, Any]:
+        spaces = self.observation_space.spaces
+        player = cursor.model
+        grid = np.zeros(spaces["board_grid"].shape, dtype=spaces["board_grid"].dtype)
+        if self._board_encoding == "codes":
+            self._codes(cursor, grid)
+        else:
+            codes = self._codes(cursor, np.zeros(grid.shape[1:], dtype=np.uint8))
+            np.equal(codes, _ONE_HOT_CODES, out=grid, casting="unsafe")
+        bench = np.zeros(spaces["bench_letters"].shape, dtype=spaces["bench_letters"].dtype)
+        cross = np.zeros(2, dtype=spaces["cross_hair_position"].dtype)
+        obs = {
+            "board_grid": grid,
+            "bench_letters": _encode_bench_codes(player.tiles_on_bench, bench),
+            "cross_hair_position": self._cross_hair(cursor, cross),
+            "board_valid": _BOARD_VALID_OBS[1 if player.board_valid else 0],
+        }
+        if self._dump_helper:
+            utility = np.zeros(self.max_bench_tiles, dtype=np.float32)
+            utilities = player.tile_utilities()[: self.max_bench_tiles]
+            utility[: utilities.size] = utilities
+            obs["bench_utility"] = utility
+        return obs
+
+
+def cursor_observation(cursor: CursorController, max_bench_tiles: int) -> Dict[str, Any]:
+    """A ``BananaGramlEnvironment``-style observation (default options) of a cursor's model."""
+    return CursorObserver(max_bench_tiles)(cursor)
+
+
+class MultiplayerBananaGramlEnv(_ParallelEnvBase):
+    metadata = {"name": "bananagraml_multiplayer_v0", "render_modes": []}
+
+    def __init__(
+        self,
+        n_players: int = 2,
+        *,
+        starting_tiles: Optional[int] = None,
+        max_bench_tiles: int = 32,
+        max_steps: int = 1000,
+        move_repeat: int = 1,
+        move_until_tile: bool = False,
+    ):
+        if max_bench_tiles < 1:
+            raise ValueError("max_bench_tiles must be at least 1")
+        self.possible_agents = [f"player_{i}" for i in range(n_players)]
+        self.agents = list(self.possible_agents)
+        self.game = MultiplayerGame(n_players, board_dimensions, starting_tiles=starting_tiles)
+        self._max_bench_tiles = max_bench_tiles
+        self._max_steps = max_steps
+        self._steps = 0
+        self._np_random = np.random.default_rng()
+
+        self._observer = CursorObserver(max_bench_tiles)
+        self._observation_space = self._observer.observation_space
+        self._action_space = gym.spaces.Discrete(N_ACTIONS)
+        self._cursors = {
+            agent: CursorController(player, move_repeat=move_repeat, move_until_tile=move_until_tile)
+            for agent, player in zip(self.possible_agents, self.game.players)
+        }
+
+    def observation_space(self, agent: str) -> gym.spaces.Dict:
+        return self._observation_space
+
+    def action_space(self, agent: str) -> gym.spaces.Discrete:
+        return self._action_space
+
+    def reset(self, seed: Optional[int] = None, options: Optional[dict] = None):
+        if seed is not None:
+            self._np_random = np.random.default_rng(seed)
+        self.game.reset(seed=int(self._np_random.integers(2**63 - 1)))
+        self.agents = list(self.possible_agents)
+        self._steps = 0
+        for cursor in self._cursors.values():
+            cursor.reset()
+        observations = {a: self._observe(a) for a in self.agents}
+        infos = {a: {} for a in self.agents}
+        return observations, infos
+
+    def _player(self, agent: str):
+        return self._cursors[agent].model
+
+    def _apply(self, agent: str, action: int) -> float:
+        peels = self.game.peels
+        outcome = self._cursors[agent].apply(action)
+        reward = 0.0
+        if outcome == "placed":
+            reward += R_TILE_TO_BOARD
+            if self.game.peels > peels:
+                reward += R_PEEL
+        elif outcome == "picked_up":
+            reward -= R_TILE_TO_BOARD
+        return reward
+
+    def step(self, actions: Dict[str, Any]):
+        # Simultaneous moves are applied in a random order each step so no
+        # seat always wins ties on the shared bunch.
+        order = [a for a in self.agents if a in actions]
+        self._np_random.shuffle(order)
+        rewards = {a: 0.0 for a in self.agents}
+        for agent in order:
+            if self.game.done:
+                break
+            rewards[agent] += self._apply(agent, int(actions[agent]))
+        self._steps += 1
+
+        if self.game.done:
+            winner = self.possible_agents[self.game.winner]
+            for agent in self.agents:
+                rewards[agent] += R_VICTORY if agent == winner else -R_VICTORY
+        terminations = {a: self.game.done for a in self.agents}
+        truncated = not self.game.done and self._steps >= self._max_steps
+        truncations = {a: truncated for a in self.agents}
+        observations = {a: self._observe(a) for a in self.agents}
+        infos = {
+            a: {"winner": self.game.winner, "peels": self.game.peels, "bank": self.game.tile_bank.get_current_size()}
+            for a in self.agents
+        }
+        if self.game.done or truncated:
+            self.agents = []
+        return observations, rewards, terminations, truncations, infos
+
+    def _observe(self, agent: str) -> Dict[str, Any]:
+        return self._observer(self._cursors[agent])
+
+    def render(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+def _stack_agents(env: MultiplayerBananaGramlEnv, observations: Dict[str, Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """one table's observations as (n_players, ...) arrays, seats in possible_agents order."""
+    agents = env.possible_agents
+    return {k: np.stack([observations[a][k] for a in agents]) for k in observations[agents[0]]}
+
+
+def _stack_games(tables: Sequence[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    return {k: np.stack([t[k] for t in tables]) for k in tables[0]}
+
+
+class _Tables:
+    """
+    a slice of a MultiplayerVecEnv's games, stepped one after the other. each
+    worker process owns one; with workers=0 the vec env holds one itself.
+    """
+
+    def __init__(self, n_games: int, n_players: int, env_kwargs: Dict[str, Any]):
+        self.envs = [MultiplayerBananaGramlEnv(n_players, **env_kwargs) for _ in range(n_games)]
+
+    def reset(self, seeds: Sequence[Optional[int]]) -> Dict[str, np.ndarray]:
+        return _stack_games([_stack_agents(env, env.reset(seed=seed)[0]) for env, seed in zip(self.envs, seeds)])
+
+    def step(self, actions: np.ndarray):
+        tables, rewards, terminated, truncated, infos = [], [], [], [], []
+        for env, row in zip(self.envs, actions):
+            agents = env.possible_agents
+            obs, reward, term, trunc, info = env.step(dict(zip(agents, row.tolist())))
+            stacked = _stack_agents(env, obs)
+            rewards.append([reward[a] for a in agents])
+            terminated.append(term[agents[0]])
+            truncated.append(trunc[agents[0]])
+            info = dict(info[agents[0]])
+            if not env.agents:
+                # finished: start the next game at once, as SB3 vec envs do.
+                info["final_observation"] = stacked
+                stacked = _stack_agents(env, env.reset()[0])
+            tables.append(stacked)
+            infos.append(info)
+        return (
+            _stack_games(tables),
+            np.asarray(rewards, dtype=np.float32),
+            np.asarray(terminated, dtype=np.bool_),
+            np.asarray(truncated, dtype=np.bool_),
+            infos,
+        )
+
+
+def _tables_worker(conn, n_games: int, n_players: int, env_kwargs: Dict[str, Any]) -> None:
+    from datagen import init_headless_worker
+
+    init_headless_worker()
+    tables = _Tables(n_games, n_players, env_kwargs)
+    try:
+        while True:
+            command, payload = conn.recv()
+            if command == "reset":
+                conn.send(tables.reset(payload))
+            elif command == "step":
+                conn.send(tables.step(payload))
+            else:
+                return
+    except (EOFError, KeyboardInterrupt):
+        return
+    finally:
+        conn.close()
+
+
+class MultiplayerVecEnv:
+    """
+    ``n_games`` independent ``MultiplayerBananaGramlEnv`` tables stepped as
+    one batch. Games are split into contiguous slices, one per worker process
+    (``workers``, default one per core; 0 steps them in this process). A
+    finished game is reset straight away and its last observation is kept in
+    its info as ``final_observation``.
+    """
+
+    def __init__(self, n_games: int, n_players: int = 2, *, workers: Optional[int] = None, **env_kwargs):
+        if n_games < 1:
+            raise ValueError("n_games must be at least 1")
+        self.n_games = n_games
+        self.n_players = n_players
+        probe = MultiplayerBananaGramlEnv(n_players, **env_kwargs)
+        self.possible_agents = list(probe.possible_agents)
+        self.observation_space = probe.observation_space(self.possible_agents[0])
+        self.action_space = probe.action_space(self.possible_agents[0])
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(max(0, workers), n_games)
+        self._local: Optional[_Tables] = None
+        self._conns = []
+        self._procs = []
+        if workers == 0:
+            self._local = _Tables(n_games, n_players, env_kwargs)
+            self._slices = [(0, n_games)]
+            return
+        sizes = [n_games // workers + (1 if w < n_games % workers else 0) for w in range(workers)]
+        bounds = np.cumsum([0] + sizes).tolist()
+        self._slices = list(zip(bounds[:-1], bounds[1:]))
+        ctx = get_context("spawn")
+        for size in sizes:
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_tables_worker, args=(child, size, n_players, env_kwargs), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def reset(self, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Reset every game; with ``seed`` game ``i`` is seeded ``seed + i``."""
+        seeds = [None if seed is None else seed + i for i in range(self.n_games)]
+        if self._local is not None:
+            return self._local.reset(seeds)
+        for conn, (lo, hi) in zip(self._conns, self._slices):
+            conn.send(("reset", seeds[lo:hi]))
+        return _concat([conn.recv() for conn in self._conns])
+
+    def step(self, actions: np.ndarray):
+        """
+        ``actions``: (n_games, n_players) cursor actions. Returns observations
+        as (n_games, n_players, ...) arrays, rewards (n_games, n_players),
+        terminated and truncated (n_games,) and one info dict per game.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.n_games, self.n_players):
+            raise ValueError(f"actions must have shape {(self.n_games, self.n_players)}, got {actions.shape}")
+        if self._local is not None:
+            return self._local.step(actions)
+        for conn, (lo, hi) in zip(self._conns, self._slices):
+            conn.send(("step", actions[lo:hi]))
+        parts = [conn.recv() for conn in self._conns]
+        infos: List[Dict[str, Any]] = []
+        for part in parts:
+            infos.extend(part[4])
+        return (
+            _concat([part[0] for part in parts]),
+            np.concatenate([part[1] for part in parts]),
+            np.concatenate([part[2] for part in parts]),
+            np.concatenate([part[3] for part in parts]),
+            infos,
+        )
+
+    def close(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        self._conns, self._procs = [], []
+
+
+def _concat(parts: Sequence[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
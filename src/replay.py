@@ -0,0 +1,346 @@
+"""
+Compact binary episode logs for ``BananaGramlEnvironment`` and a player for them.
+
+Games are deterministic given the model seed, the env options and the action
+stream, so that is all a log stores, plus a small state digest every
+``checkpoint_every`` steps and at the end of each episode so replays can prove
+they reproduced the game. Recording costs one byte per step; turn it on with the
+env's ``record_dir`` (or ``"record_dir"`` in the training JSON).
+
+File layout (little-endian)::
+
+    b"BGRL" u16 version  u32 len  json {"env_kwargs": ..., "rendered": bool}
+    episode*:
+        b"EP"  u32 len  json {"model_seed": int, "curriculum": {...} | null}
+        u32 n_actions   u8 action * n_actions
+        u32 n_checkpoints  (u32 step  u32 len  digest) * n_checkpoints
+
+Each episode is written with a single ``write`` when it ends, so a killed run
+loses at most the episode in progress; readers stop at a truncated tail.
+
+Player::
+
+    python replay.py runs/logs/1234_ab12cd34.bgr                      # list episodes
+    python replay.py runs/logs/1234_ab12cd34.bgr --verify             # replay all at max speed
+    python replay.py runs/logs/1234_ab12cd34.bgr --episode 3 --render --seek 120
+
+Render keys: space play/pause, right/left step +-1, up/down +-50, home/end, q quit.
+Seeking backwards re-simulates headlessly from the start of the episode.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+MAGIC = b"BGRL"
+EPISODE_MAGIC = b"EP"
+VERSION = 1
+
+_U32 = struct.Struct("<I")
+_CHECKPOINT = struct.Struct("<II")
+_DIGEST_HEAD = struct.Struct("<HBBhhBBH")
+_DIGEST_CELL = struct.Struct("<hhB")
+
+
+def state_digest(env) -> bytes:
+    """Compact snapshot of what a replay must reproduce: board, bench, bank, cursor."""
+    model, game = env.model, env.game
+    from game.src.game.model import letter_code
+
+    bench = bytes(t.code for t in model.tiles_on_bench)
+    cells = b"".join(
+        _DIGEST_CELL.pack(r, c, letter_code(ch)) for (r, c), ch in model.board_letters()
+    )
+    x, y = game.cross_hair_position
+    head = _DIGEST_HEAD.pack(
+        model.tile_bank.get_current_size(),
+        int(model.victory),
+        int(model.board_valid),
+        int(x),
+        int(y),
+        int(game.focus_area == "BENCH"),
+        min(game.bench_cross_hair_position_index, 255),
+        len(bench),
+    )
+    return head + bench + cells
+
+
+class EpisodeRecorder:
+    """Buffers one episode at a time in memory and appends it to ``path`` when it ends."""
+
+    def __init__(self, path: str | Path, env_kwargs: Dict[str, Any], *, rendered: bool, checkpoint_every: int = 100):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_every = checkpoint_every
+        header = json.dumps({"env_kwargs": env_kwargs, "rendered": rendered}).encode()
+        with open(self.path, "wb") as f:
+            f.write(MAGIC + struct.pack("<H", VERSION) + _U32.pack(len(header)) + header)
+        self._meta: Optional[bytes] = None
+        self._actions = bytearray()
+        self._checkpoints: List[Tuple[int, bytes]] = []
+
+    @classmethod
+    def in_dir(cls, record_dir: str | Path, env_kwargs: Dict[str, Any], **kwargs: Any) -> "EpisodeRecorder":
+        """One file per env: ``<pid>_<random>.bgr`` so vec envs never share a file."""
+        name = f"{os.getpid()}_{uuid.uuid4().hex[:8]}.bgr"
+        return cls(Path(record_dir) / name, env_kwargs, **kwargs)
+
+    def begin(self, model_seed: int, curriculum: Optional[Dict[str, Any]]) -> None:
+        self._meta = json.dumps({"model_seed": model_seed, "curriculum": curriculum}).encode()
+        self._actions = bytearray()
+        self._checkpoints = []
+
+    def step(self, action: int, env) -> None:
+        if self._meta is None:
+            return
+        self._actions.append(action)
+        if self.checkpoint_every > 0 and len(self._actions) % self.checkpoint_every == 0:
+            self._checkpoints.append((len(self._actions), state_digest(env)))
+
+    def end(self, env) -> None:
+        """Close the current episode (if it has any steps) and append it to the file."""
+        if self._meta is None:
+            return
+        meta, self._meta = self._meta, None
+        if not self._actions:
+            return
+        n = len(self._actions)
+        if not self._checkpoints or self._checkpoints[-1][0] != n:
+            self._checkpoints.append((n, state_digest(env)))
+        parts = [EPISODE_MAGIC, _U32.pack(len(meta)), meta, _U32.pack(n), bytes(self._actions)]
+        parts.append(_U32.pack(len(self._checkpoints)))
+        for step, digest in self._checkpoints:
+            parts.append(_CHECKPOINT.pack(step, len(digest)))
+            parts.append(digest)
+        with open(self.path, "ab") as f:
+            f.write(b"".join(parts))
+
+
+@dataclass
+class EpisodeLog:
+    index: int
+    model_seed: int
+    curriculum: Optional[Dict[str, Any]]
+    actions: bytes
+    checkpoints: Dict[int, bytes] = field(default_factory=dict)
+
+
+def read_log(path: str | Path) -> Tuple[Dict[str, Any], List[EpisodeLog]]:
+    """Header and every complete episode in ``path``."""
+    data = Path(path).read_bytes()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a BananaGraml replay log")
+    (version,) = struct.unpack_from("<H", data, 4)
+    if version != VERSION:
+        raise ValueError(f"unsupported replay log version {version}")
+    (n,) = _U32.unpack_from(data, 6)
+    header = json.loads(data[10 : 10 + n])
+    pos = 10 + n
+    episodes: List[EpisodeLog] = []
+    try:
+        while pos < len(data):
+            if data[pos : pos + 2] != EPISODE_MAGIC:
+                raise ValueError(f"corrupt episode record at byte {pos}")
+            (n,) = _U32.unpack_from(data, pos + 2)
+            pos += 6
+            meta = json.loads(data[pos : pos + n])
+            pos += n
+            (n,) = _U32.unpack_from(data, pos)
+            actions = data[pos + 4 : pos + 4 + n]
+            if len(actions) != n:
+                break
+            pos += 4 + n
+            (count,) = _U32.unpack_from(data, pos)
+            pos += 4
+            checkpoints = {}
+            for _ in range(count):
+                step, n = _CHECKPOINT.unpack_from(data, pos)
+                pos += _CHECKPOINT.size
+                checkpoints[step] = data[pos : pos + n]
+                pos += n
+            if pos > len(data):
+                break
+            episodes.append(EpisodeLog(len(episodes), meta["model_seed"], meta["curriculum"], actions, checkpoints))
+    except (struct.error, json.JSONDecodeError, UnicodeDecodeError):
+        pass  # truncated tail from a run that was killed mid-write
+    return header, episodes
+
+
+def make_env(header: Dict[str, Any]):
+    """An env built like the recording one (without recording itself)."""
+    from env import BananaGramlEnvironment
+
+    kwargs = dict(header["env_kwargs"])
+    kwargs.pop("record_dir", None)
+    # Game.render() moves bench sprites, so playback renders only if recording did.
+    return BananaGramlEnvironment(render_mode="human" if header["rendered"] else None, **kwargs)
+
+
+def start_episode(env, episode: EpisodeLog) -> None:
+    if episode.curriculum is not None:
+        env.set_curriculum(**episode.curriculum)
+    env.reset(options={"model_seed": episode.model_seed})
+
+
+def replay_episode(env, episode: EpisodeLog, until: Optional[int] = None) -> List[int]:
+    """Replay ``episode`` (up to step ``until``); returns the checkpoint steps that differ."""
+    start_episode(env, episode)
+    mismatches = []
+    for step, action in enumerate(episode.actions[:until], start=1):
+        env.step(action)
+        expected = episode.checkpoints.get(step)
+        if expected is not None and state_digest(env) != expected:
+            mismatches.append(step)
+    return mismatches
+
+
+def _draw_state(screen, env, font, step: int, total: int) -> None:
+    """Read-only view of the model, for logs recorded headless (see make_env)."""
+    import pygame
+
+    from game.main import GameConfig
+
+    model, game = env.model, env.game
+    d = GameConfig.DIVIDER
+    screen.fill(GameConfig.BACKGROUND_COLOR)
+    if model.victory:
+        tile_color = "yellow"
+    else:
+        tile_color = "green" if model.board_valid else "red"
+    for (r, c), ch in model.board_letters():
+        rect = pygame.Rect(c * d, r * d, d - 2, d - 2)
+        pygame.draw.rect(screen, tile_color, rect)
+        text = font.render(ch, True, GameConfig.FONT_COLOR)
+        screen.blit(text, text.get_rect(center=rect.center))
+    y = GameConfig.SCREEN_HEIGHT - GameConfig.BENCH_HEIGHT + 30
+    for k, tile in enumerate(model.tiles_on_bench):
+        rect = pygame.Rect(20 + k * 25, y, 20, 20)
+        pygame.draw.rect(screen, GameConfig.TILE_COLOR, rect)
+        if game.focus_area == "BENCH" and k == game.bench_cross_hair_position_index:
+            pygame.draw.rect(screen, "red", rect, 2)
+        text = font.render(tile.get_value(), True, GameConfig.FONT_COLOR)
+        screen.blit(text, text.get_rect(center=rect.center))
+    if game.focus_area == "BOARD":
+        x, cy = game.cross_hair_position
+        pygame.draw.rect(screen, "red", pygame.Rect(x, cy, d, d), 2)
+    info = font.render(f"step {step}/{total}  bank {model.tile_bank.get_current_size()}", True, "white")
+    screen.blit(info, (GameConfig.SCREEN_WIDTH - 260, y))
+    pygame.display.flip()
+
+
+def play(header: Dict[str, Any], episode: EpisodeLog, *, seek: int = 0, fps: float = 15.0) -> None:
+    """Visual playback with seeking. Backward seeks re-simulate from the episode start."""
+    import pygame
+
+    env = make_env(header)
+    total = len(episode.actions)
+    font = pygame.font.Font(None, 24)
+    step = 0
+
+    def goto(target: int) -> None:
+        nonlocal step
+        target = max(0, min(target, total))
+        if target < step:
+            start_episode(env, episode)
+            step = 0
+        for action in episode.actions[step:target]:
+            env.step(action)
+        step = target
+
+    start_episode(env, episode)
+    goto(seek)
+    playing = False
+    try:
+        while env._display_alive:
+            # Drain input before every env.step, which consumes the event queue itself.
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_q):
+                    return
+                if event.type != pygame.KEYDOWN:
+                    continue
+                if event.key == pygame.K_SPACE:
+                    playing = not playing
+                elif event.key == pygame.K_RIGHT:
+                    goto(step + 1)
+                elif event.key == pygame.K_LEFT:
+                    goto(step - 1)
+                elif event.key == pygame.K_UP:
+                    goto(step + 50)
+                elif event.key == pygame.K_DOWN:
+                    goto(step - 50)
+                elif event.key == pygame.K_HOME:
+                    goto(0)
+                elif event.key == pygame.K_END:
+                    goto(total)
+            if playing:
+                if step >= total:
+                    playing = False
+                else:
+                    goto(step + 1)
+            if not env._display_alive:
+                break
+            if header["rendered"]:
+                env.render()
+            else:
+                _draw_state(pygame.display.get_surface(), env, font, step, total)
+            time.sleep(1.0 / fps)
+    finally:
+        env.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect, verify or play BananaGraml replay logs.")
+    parser.add_argument("log", type=str)
+    parser.add_argument("--episode", type=int, default=None)
+    parser.add_argument("--verify", action="store_true", help="Replay headlessly and check every checkpoint.")
+    parser.add_argument("--render", action="store_true", help="Play one episode in a window.")
+    parser.add_argument("--seek", type=int, default=0, help="Start playback at this step.")
+    parser.add_argument("--fps", type=float, default=15.0)
+    args = parser.parse_args(argv)
+
+    header, episodes = read_log(args.log)
+    if args.episode is not None:
+        episodes = [e for e in episodes if e.index == args.episode]
+        if not episodes:
+            parser.error(f"no episode {args.episode} in {args.log}")
+
+    if args.render:
+        play(header, episodes[0], seek=args.seek, fps=args.fps)
+        return
+
+    if args.verify:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        env = make_env(header)
+        steps, failed = 0, 0
+        start = time.perf_counter()
+        try:
+            for ep in episodes:
+                bad = replay_episode(env, ep)
+                steps += len(ep.actions)
+                if bad:
+                    failed += 1
+                    print(f"episode {ep.index}: diverged at step {bad[0]}")
+        finally:
+            env.close()
+        elapsed = time.perf_counter() - start
+        rate = steps / elapsed if elapsed > 0 else 0.0
+        print(f"{len(episodes)} episodes, {steps} steps, {failed} diverged, {rate:.0f} steps/s")
+        return
+
+    for ep in episodes:
+        print(
+            f"episode {ep.index}: {len(ep.actions)} steps, seed {ep.model_seed}, "
+            f"{len(ep.checkpoints)} checkpoints"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Stream shuffled mini-batches from shards written by ``datagen.py``.
+
+``npy`` shards are memory-mapped, so only the rows of each batch are ever read
+into RAM and several processes reading the same shards share the OS page cache
+instead of holding private copies. ``npz`` shards are compressed and cannot be
+mapped; they are decompressed one shuffle window at a time.
+
+Batches are ``{"obs": {board_grid, bench_letters, cross_hair_position,
+board_valid}, "action", "reward", "done"}`` so ``obs`` can go straight into
+``policy.obs_to_tensor`` for the ``BananaGramlEnvironment`` dict space.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from datagen import INDEX_FILE, load_index
+
+
+_DONE = object()
+
+
+class ReplayShards:
+    """
+    Read-only view over the shards listed in one ``index.json``.
+
+    ``rank`` / ``world_size`` split the shard list between worker processes.
+    Pickling drops open maps; each process re-opens them lazily on first use.
+    """
+
+    def __init__(self, root: str | Path, *, rank: int = 0, world_size: int = 1):
+        if not 0 <= rank < world_size:
+            raise ValueError(f"rank must be in [0, {world_size}), got {rank}")
+        self.root = Path(root)
+        index = load_index(self.root)
+        if not index["shards"]:
+            raise FileNotFoundError(f"No shards listed in {self.root / INDEX_FILE}")
+        self.format = index.get("format", "npz")
+        self.entries = index["shards"][rank::world_size]
+        self.lengths = np.array([e["transitions"] for e in self.entries], dtype=np.int64)
+        self._open: Dict[int, Dict[str, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return int(self.lengths.sum())
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state["_open"] = {}
+        return state
+
+    def shard(self, i: int) -> Dict[str, np.ndarray]:
+        arrays = self._open.get(i)
+        if arrays is None:
+            path = self.root / self.entries[i]["path"]
+            if self.format == "npy":
+                arrays = {p.stem: np.load(p, mmap_mode="r") for p in path.glob("*.npy")}
+            else:
+                with np.load(path) as npz:
+                    arrays = {k: npz[k] for k in npz.files}
+            self._open[i] = arrays
+        return arrays
+
+    def release(self, i: int) -> None:
+        self._open.pop(i, None)
+
+
+def _gather(arrays: Dict[int, Dict[str, np.ndarray]], shard_ids: np.ndarray, rows: np.ndarray) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"obs": {}}
+    # Sorting rows per shard keeps mmap reads mostly sequential.
+    order = np.lexsort((rows, shard_ids))
+    shard_ids, rows = shard_ids[order], rows[order]
+    parts: Dict[str, List[np.ndarray]] = {}
+    for s in np.unique(shard_ids):
+        sel = rows[shard_ids == s]
+        for key, arr in arrays[s].items():
+            parts.setdefault(key, []).append(arr[sel])
+    # Undo the sort so batches stay shuffled.
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(order.size)
+    for key, chunks in parts.items():
+        value = np.concatenate(chunks)[inverse]
+        if key.startswith("obs_"):
+            out["obs"][key[len("obs_"):]] = value
+        else:
+            out[key] = value
+    return out
+
+
+class ReplayLoader:
+    """
+    Iterate shuffled mini-batches, produced ahead of time by a background thread.
+
+    Shards are visited in random order, ``window`` at a time; rows inside a
+    window are shuffled together. Larger windows mix better at the cost of
+    keeping more shards open.
+    """
+
+    def __init__(
+        self,
+        shards: ReplayShards,
+        *,
+        batch_size: int = 256,
+        window: int = 8,
+        prefetch: int = 4,
+        drop_last: bool = False,
+        seed: Optional[int] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.shards = shards
+        self.batch_size = batch_size
+        self.window = window
+        self.prefetch = max(1, prefetch)
+        self.drop_last = drop_last
+        self.rng = np.random.default_rng(seed)
+
+    def _batches(self) -> Iterator[Dict[str, Any]]:
+        try:
+            yield from self._windows()
+        finally:
+            # also when the consumer stops early and the generator is closed.
+            for i in range(len(self.shards.entries)):
+                self.shards.release(i)
+
+    def _windows(self) -> Iterator[Dict[str, Any]]:
+        order = self.rng.permutation(len(self.shards.entries))
+        carry_ids = np.empty(0, dtype=np.int64)
+        carry_rows = np.empty(0, dtype=np.int64)
+        for w in range(0, order.size, self.window):
+            ids = order[w : w + self.window]
+            live = set(int(i) for i in np.unique(carry_ids)) | set(int(i) for i in ids)
+            arrays = {i: self.shards.shard(i) for i in live}
+            shard_ids = np.concatenate([carry_ids] + [np.full(self.shards.lengths[i], i) for i in ids])
+            rows = np.concatenate([carry_rows] + [np.arange(self.shards.lengths[i]) for i in ids])
+            perm = self.rng.permutation(rows.size)
+            shard_ids, rows = shard_ids[perm], rows[perm]
+            full = rows.size - rows.size % self.batch_size
+            for b in range(0, full, self.batch_size):
+                yield _gather(arrays, shard_ids[b : b + self.batch_size], rows[b : b + self.batch_size])
+            # Leftover rows roll into the next window rather than forming a short batch.
+            carry_ids, carry_rows = shard_ids[full:], rows[full:]
+            keep = set(int(i) for i in np.unique(carry_ids))
+            for i in live - keep:
+                self.shards.release(i)
+        if carry_rows.size and not self.drop_last:
+            arrays = {int(i): self.shards.shard(int(i)) for i in np.unique(carry_ids)}
+            yield _gather(arrays, carry_ids, carry_rows)
+
+    @staticmethod
+    def _put(q: queue.Queue, stop: threading.Event, item: Any) -> bool:
+        """put that gives up once the consumer has stopped; False if it did."""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, q: queue.Queue, stop: threading.Event) -> None:
+        batches = self._batches()
+        try:
+            for batch in batches:
+                if not self._put(q, stop, batch):
+                    return
+            self._put(q, stop, _DONE)
+        except BaseException as exc:  # surfaced in the consumer thread
+            self._put(q, stop, exc)
+        finally:
+            batches.close()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        q: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        worker = threading.Thread(target=self._produce, args=(q, stop), daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = q.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            worker.join(timeout=1.0)
+
+
+def load_replay(
+    root: str | Path,
+    *,
+    batch_size: int = 256,
+    seed: Optional[int] = None,
+    rank: int = 0,
+    world_size: int = 1,
+    **kwargs: Any,
+) -> ReplayLoader:
+    """Shorthand for ``ReplayLoader(ReplayShards(root, ...), ...)``."""
+    shards = ReplayShards(root, rank=rank, world_size=world_size)
+    return ReplayLoader(shards, batch_size=batch_size, seed=seed, **kwargs)
+
@@ -0,0 +1,288 @@
+"""
+Asyncio game server: hosts many headless ``BananaGramlModel`` sessions in one
+process so remote agents, tournaments and the pygame client (``client.py``) can
+play without a local window.
+
+Protocol: newline-delimited JSON over a local TCP socket. Every request may carry
+an ``"id"`` that is echoed back. Requests::
+
+    {"op": "new", "seed": 1, "tiles": 21, "sparse": false}  -> {"session": 3, "state": {...}}
+    {"op": "act", "session": 3, "action": 5}                -> {"diff": {...}}
+    {"op": "act", "session": 3, "actions": [0, 0, 5]}       -> {"diff": {...}}
+    {"op": "place", "session": 3, "letter": "A", "row": 10, "col": 20}
+    {"op": "state", "session": 3}                           -> {"state": {...}}
+    {"op": "close", "session": 3}
+    {"op": "ping"}
+
+Actions are the ``CursorController`` ones (0-3 move, 4 next tile, 5 place,
+6 pick up, 7 dump). Replies to actions are diffs against the last state sent
+for that session, with only the keys that changed::
+
+    add: [[row, col, letter], ...]   del: [[row, col], ...]
+    bench: "AEX"   valid: 0/1   win: 0/1   bank: 120   cur: [row, col, selected]
+
+Sessions belong to the connection that created them and are dropped when it
+closes. Per-session state is the model plus the set of board cells last sent.
+Every model allocates the fixed-size board grid and letter-code array, so a
+session's memory does not shrink with fewer tiles. Diffs rescan the whole grid
+for a dense session (the default); a sparse session only walks its tiles.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, Optional, Set, Tuple
+
+from env import board_dimensions
+from game.src.game.cursor import N_ACTIONS, CursorController
+from game.src.game.model import BananaGramlModel
+
+MAX_LINE_BYTES = 64 * 1024
+MAX_ACTIONS_PER_REQUEST = 1024
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+class Session:
+    __slots__ = ("id", "model", "cursor", "_cells", "_bench", "_valid", "_victory", "_bank", "_cur")
+
+    def __init__(self, session_id: int, *, seed: Optional[int], tiles: int, sparse: bool):
+        self.id = session_id
+        self.model = BananaGramlModel(board_dimensions, seed=seed, sparse=sparse)
+        self.model.write_board_dump = False
+        bank = len(self.model.tile_bank.bank)
+        if not 0 <= tiles <= bank:
+            raise ProtocolError(f"tiles must be in [0, {bank}], got {tiles}")
+        self.model.init_bench(tiles)
+        self.cursor = CursorController(self.model)
+        self._cells: Set[Tuple[int, int, str]] = set()
+        self._bench = ""
+        self._valid = None
+        self._victory = None
+        self._bank = None
+        self._cur = None
+
+    def _current(self):
+        model = self.model
+        cells = {(r, c, ch) for (r, c), ch in model.board_letters()}
+        bench = "".join(t.get_value() for t in model.tiles_on_bench)
+        cur = (self.cursor.row, self.cursor.col, self.cursor.selected)
+        return cells, bench, int(model.board_valid), int(model.victory), model.tile_bank.get_current_size(), cur
+
+    def state(self) -> Dict[str, Any]:
+        """Full state; also becomes the baseline for the next diff."""
+        cells, bench, valid, victory, bank, cur = self._current()
+        self._cells, self._bench, self._valid, self._victory, self._bank, self._cur = (
+            cells, bench, valid, victory, bank, cur,
+        )
+        return {
+            "cells": sorted([r, c, ch] for r, c, ch in cells),
+            "bench": bench,
+            "valid": valid,
+            "win": victory,
+            "bank": bank,
+            "cur": list(cur),
+        }
+
+    def diff(self) -> Dict[str, Any]:
+        cells, bench, valid, victory, bank, cur = self._current()
+        out: Dict[str, Any] = {}
+        added = cells - self._cells
+        removed = self._cells - cells
+        if added:
+            out["add"] = sorted([r, c, ch] for r, c, ch in added)
+        if removed:
+            # A cell whose letter changed shows up in both; only report real removals.
+            still = {(r, c) for r, c, _ in added}
+            gone = sorted([r, c] for r, c, _ in removed if (r, c) not in still)
+            if gone:
+                out["del"] = gone
+        if bench != self._bench:
+            out["bench"] = bench
+        if valid != self._valid:
+            out["valid"] = valid
+        if victory != self._victory:
+            out["win"] = victory
+        if bank != self._bank:
+            out["bank"] = bank
+        if cur != self._cur:
+            out["cur"] = list(cur)
+        self._cells, self._bench, self._valid, self._victory, self._bank, self._cur = (
+            cells, bench, valid, victory, bank, cur,
+        )
+        return out
+
+    def act(self, action: int) -> None:
+        if not 0 <= action < N_ACTIONS:
+            raise ProtocolError(f"action must be in [0, {N_ACTIONS}), got {action}")
+        self.cursor.apply(action)
+
+    def place(self, letter: str, row: int, col: int) -> None:
+        model = self.model
+        letter = letter.upper()
+        if model.sparse_board is None:
+            rows, cols = len(model.coordinates), len(model.coordinates[0])
+            if not (0 < row < rows - 1 and 0 < col < cols - 1):
+                raise ProtocolError(f"cell ({row}, {col}) is off the playable board")
+        if model.tile_at(row, col) is not None:
+            raise ProtocolError(f"cell ({row}, {col}) is occupied")
+        tile = next((t for t in model.tiles_on_bench if t.get_value().upper() == letter), None)
+        if tile is None:
+            raise ProtocolError(f"no {letter!r} on the bench")
+        model.place_tile_at(tile, row, col)
+
+
+class GameServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        *,
+        max_sessions: int = 10_000,
+        max_sessions_per_client: int = 1_000,
+        idle_timeout: Optional[float] = 600.0,
+    ):
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.max_sessions_per_client = max_sessions_per_client
+        self.idle_timeout = idle_timeout
+        self.sessions: Dict[int, Session] = {}
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=MAX_LINE_BYTES
+        )
+        sock = self._server.sockets[0].getsockname()
+        self.port = sock[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        owned: Set[int] = set()
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except (asyncio.TimeoutError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                reply = self.dispatch(line, owned)
+                writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+                # Backpressure: a slow reader can't make us buffer unbounded replies.
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for sid in owned:
+                self.sessions.pop(sid, None)
+            writer.close()
+            await writer.wait_closed()
+
+    def dispatch(self, line: bytes, owned: Set[int]) -> Dict[str, Any]:
+        request_id = None
+        try:
+            msg = json.loads(line)
+            if not isinstance(msg, dict):
+                raise ProtocolError("request must be a JSON object")
+            request_id = msg.get("id")
+            reply = self._dispatch(msg, owned)
+            reply["ok"] = True
+        except Exception as exc:
+            # Any bad request (e.g. int() of a huge float: OverflowError) is an
+            # error reply; it must never take the connection down.
+            reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        if request_id is not None:
+            reply["id"] = request_id
+        return reply
+
+    def _session(self, msg: Dict[str, Any], owned: Set[int]) -> Session:
+        sid = int(msg["session"])
+        if sid not in owned or sid not in self.sessions:
+            raise ProtocolError(f"unknown session {sid}")
+        return self.sessions[sid]
+
+    def _dispatch(self, msg: Dict[str, Any], owned: Set[int]) -> Dict[str, Any]:
+        op = msg.get("op")
+        if op == "ping":
+            return {"sessions": len(self.sessions)}
+        if op == "new":
+            if len(self.sessions) >= self.max_sessions or len(owned) >= self.max_sessions_per_client:
+                raise ProtocolError("session limit reached")
+            seed = msg.get("seed")
+            session = Session(
+                next(self._ids),
+                seed=None if seed is None else int(seed),
+                tiles=int(msg.get("tiles", 21)),
+                sparse=bool(msg.get("sparse", False)),
+            )
+            self.sessions[session.id] = session
+            owned.add(session.id)
+            return {"session": session.id, "state": session.state()}
+        if op == "act":
+            session = self._session(msg, owned)
+            actions = msg["actions"] if "actions" in msg else [msg["action"]]
+            if len(actions) > MAX_ACTIONS_PER_REQUEST:
+                raise ProtocolError(f"at most {MAX_ACTIONS_PER_REQUEST} actions per request")
+            for action in actions:
+                session.act(int(action))
+            return {"diff": session.diff()}
+        if op == "place":
+            session = self._session(msg, owned)
+            session.place(str(msg["letter"]), int(msg["row"]), int(msg["col"]))
+            return {"diff": session.diff()}
+        if op == "state":
+            return {"state": self._session(msg, owned).state()}
+        if op == "close":
+            session = self._session(msg, owned)
+            owned.discard(session.id)
+            self.sessions.pop(session.id, None)
+            return {}
+        raise ProtocolError(f"unknown op {op!r}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve BananaGraml sessions over local TCP.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=10_000)
+    parser.add_argument("--idle-timeout", type=float, default=600.0)
+    args = parser.parse_args(argv)
+
+    server = GameServer(
+        args.host,
+        args.port,
+        max_sessions=args.max_sessions,
+        idle_timeout=args.idle_timeout,
+    )
+
+    async def _run() -> None:
+        await server.start()
+        print(f"serving on {server.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Run several PPO trainings in parallel, one ``TrainingConfig`` per run, and
+collect their results into one summary.
+
+Each pool worker is pinned to its own slice of the CPUs this process may use
+and caps torch (and OpenMP/BLAS) at ``--threads-per-run`` threads, so N runs
+share the machine instead of each spinning up a thread per core::
+
+    python sweep.py --runs 3 --seed-base 4200 --timesteps 90000 --tb-dir ./tensorboard_logs
+    python sweep.py --grid max_bench_tiles=16,32 --set starting_tiles_on_bench=11 --workers 2
+
+``--set key=value`` applies to every run; ``--grid key=v1,v2`` multiplies the
+runs by each value. Keys are ``TrainingConfig`` fields.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from datagen import init_headless_worker
+from training_config import load_training_config, override_config
+
+
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@dataclass(frozen=True)
+class RunSpec:
+    run_name: str
+    overrides: Dict[str, Any] = field(default_factory=dict)
+    config_path: Optional[str] = None
+
+
+def _parse_value(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return raw
+
+
+def _parse_assignments(items: Sequence[str], *, multi: bool) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for item in items:
+        key, sep, raw = item.partition("=")
+        if not sep or not key:
+            raise ValueError(f"expected key=value, got {item!r}")
+        out[key] = [_parse_value(v) for v in raw.split(",")] if multi else _parse_value(raw)
+    return out
+
+
+def build_runs(
+    *,
+    runs: int,
+    seed_base: int,
+    name_prefix: str = "parallel",
+    fixed: Optional[Dict[str, Any]] = None,
+    grid: Optional[Dict[str, List[Any]]] = None,
+    config_path: Optional[str] = None,
+) -> List[RunSpec]:
+    """``runs`` seeds for every point of ``grid``, each with ``fixed`` applied."""
+    fixed = dict(fixed or {})
+    grid = dict(grid or {})
+    keys = sorted(grid)
+    specs: List[RunSpec] = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        point = dict(zip(keys, values))
+        tag = "".join(f"_{k}={v}" for k, v in point.items())
+        for i in range(1, runs + 1):
+            overrides = {**fixed, **point, "random_seed": seed_base + i}
+            specs.append(RunSpec(f"{name_prefix}{tag}_{i}", overrides, config_path))
+    return specs
+
+
+def partition_cpus(cpus: Sequence[int], workers: int) -> List[List[int]]:
+    """Split ``cpus`` into ``workers`` contiguous slices; slices repeat if CPUs run short."""
+    cpus = sorted(cpus)
+    if workers >= len(cpus):
+        return [[cpus[w % len(cpus)]] for w in range(workers)]
+    size, extra = divmod(len(cpus), workers)
+    slices, start = [], 0
+    for w in range(workers):
+        end = start + size + (1 if w < extra else 0)
+        slices.append(cpus[start:end])
+        start = end
+    return slices
+
+
+def _init_worker(slot_counter, cpu_slices: List[List[int]], threads: int) -> None:
+    init_headless_worker()
+    # Must be set before torch (and its OpenMP runtime) is imported.
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    with slot_counter.get_lock():
+        slot = slot_counter.value
+        slot_counter.value += 1
+    if hasattr(os, "sched_setaffinity") and cpu_slices:
+        os.sched_setaffinity(0, cpu_slices[slot % len(cpu_slices)])
+
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:  # already fixed once parallel work has run
+        pass
+
+
+def _run(spec: RunSpec) -> Dict[str, Any]:
+    from train import run_training
+
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    result: Dict[str, Any] = {"run_name": spec.run_name, "overrides": spec.overrides, "cpus": cpus}
+    try:
+        cfg = override_config(load_training_config(spec.config_path), **spec.overrides)
+        result.update(run_training(cfg, run_name=spec.run_name))
+        result["status"] = "ok"
+    except Exception:
+        result["status"] = "failed"
+        result["error"] = traceback.format_exc()
+    return result
+
+
+def sweep(
+    specs: Sequence[RunSpec],
+    *,
+    workers: int,
+    threads_per_run: int = 1,
+    cpus: Optional[Sequence[int]] = None,
+) -> List[Dict[str, Any]]:
+    """Run every spec across a spawn pool and return their results in spec order."""
+    if not specs:
+        return []
+    workers = max(1, min(workers, len(specs)))
+    if cpus is None:
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    cpu_slices = partition_cpus(cpus, workers) if cpus else []
+
+    # spawn: forked workers would inherit the parent's pygame and torch thread pools.
+    ctx = get_context("spawn")
+    slot_counter = ctx.Value("i", 0)
+    order = {spec.run_name: i for i, spec in enumerate(specs)}
+    results: List[Dict[str, Any]] = []
+    with ctx.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(slot_counter, cpu_slices, threads_per_run),
+    ) as pool:
+        for result in pool.imap_unordered(_run, specs):
+            results.append(result)
+            print(f"{result['run_name']}: {result['status']} ({len(results)}/{len(specs)})")
+    results.sort(key=lambda r: order[r["run_name"]])
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a pinned, thread-capped PPO sweep.")
+    parser.add_argument("--config", type=str, default=None, help="Base training JSON.")
+    parser.add_argument("--runs", type=int, default=3, help="Seeds per grid point.")
+    parser.add_argument("--seed-base", type=int, default=4200)
+    parser.add_argument("--name-prefix", type=str, default="parallel")
+    parser.add_argument("--timesteps", type=int, default=None, help="Overrides total_timesteps.")
+    parser.add_argument("--tb-dir", type=str, default=None, help="Overrides tensorboard_log.")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--grid", action="append", default=[], metavar="KEY=V1,V2")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent runs (default: one per run).")
+    parser.add_argument("--threads-per-run", type=int, default=1)
+    parser.add_argument("--summary", type=str, default=None, help="Summary JSON (default: <tb-dir>/sweep_summary.json).")
+    args = parser.parse_args(argv)
+
+    fixed = {"headless": True}
+    fixed.update(_parse_assignments(args.set, multi=False))
+    if args.timesteps is not None:
+        fixed["total_timesteps"] = args.timesteps
+    if args.tb_dir is not None:
+        fixed["tensorboard_log"] = args.tb_dir
+    grid = _parse_assignments(args.grid, multi=True)
+
+    # Fail on a bad key before any process is started.
+    base = load_training_config(args.config)
+    override_config(base, **fixed, **{k: v[0] for k, v in grid.items()})
+
+    specs = build_runs(
+        runs=args.runs,
+        seed_base=args.seed_base,
+        name_prefix=args.name_prefix,
+        fixed=fixed,
+        grid=grid,
+        config_path=args.config,
+    )
+    results = sweep(
+        specs,
+        workers=args.workers or len(specs),
+        threads_per_run=args.threads_per_run,
+    )
+
+    tb_dir = fixed.get("tensorboard_log", base.tensorboard_log) or "."
+    summary_path = Path(args.summary) if args.summary else Path(tb_dir) / "sweep_summary.json"
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for r in results:
+        if r["status"] != "ok":
+            print(f"{r['run_name']}: FAILED\n{r['error']}")
+            continue
+        rew = "-" if r["ep_rew_mean"] is None else f"{r['ep_rew_mean']:.2f}"
+        print(
+            f"{r['run_name']}: steps={r['timesteps']} ep_rew_mean={rew} "
+            f"steps/s={r['steps_per_sec']:.1f} cpus={r['cpus']}"
+        )
+    print(f"summary: {summary_path}")
+
+
+if __name__ == "__main__":
+    main()
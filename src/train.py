@@ -1,13 +1,23 @@
 import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
 
 from gymnasium.wrappers import TimeLimit
 from stable_baselines3 import PPO
 from stable_baselines3.common.monitor import Monitor
 from stable_baselines3.common.utils import set_random_seed
-from stable_baselines3.common.vec_env import DummyVecEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
 
+from checkpoints import CheckpointCallback, load_checkpoint, resolve_checkpoint
+from curriculum import CurriculumCallback, parse_stages
 from env import BananaGramlEnvironment
-from training_config import TrainingConfig, load_training_config
+from game.main import use_offscreen_driver
+from metrics import MetricsCallback
+from replay_loader import load_replay
+from training_config import TrainingConfig, env_kwargs, load_training_config, override_config
 
 
 def _make_vec_env(cfg: TrainingConfig):
@@ -16,8 +26,7 @@ def _make_vec_env(cfg: TrainingConfig):
             TimeLimit(
                 BananaGramlEnvironment(
                     render_mode=None if cfg.headless else "human",
-                    starting_tiles_on_bench=cfg.starting_tiles_on_bench,
-                    max_bench_tiles=cfg.max_bench_tiles,
+                    **env_kwargs(cfg),
                 ),
                 max_episode_steps=cfg.max_episode_steps,
             ),
@@ -27,6 +36,131 @@ def _make_vec_env(cfg: TrainingConfig):
     return _thunk
 
 
+def behaviour_clone(
+    model: PPO,
+    data_dir: str,
+    *,
+    epochs: int = 1,
+    batch_size: int = 256,
+    seed: int | None = None,
+) -> None:
+    """Fit the policy head to logged actions (datagen.py shards) before PPO."""
+    import torch
+
+    policy = model.policy
+    policy.set_training_mode(True)
+    for epoch in range(epochs):
+        loader = load_replay(data_dir, batch_size=batch_size, seed=None if seed is None else seed + epoch)
+        total, batches = 0.0, 0
+        for batch in loader:
+            obs, _ = policy.obs_to_tensor(batch["obs"])
+            actions = torch.as_tensor(batch["action"], device=policy.device)
+            _, log_prob, _ = policy.evaluate_actions(obs, actions)
+            loss = -log_prob.mean()
+            policy.optimizer.zero_grad()
+            loss.backward()
+            policy.optimizer.step()
+            total += float(loss.item())
+            batches += 1
+        if model.verbose:
+            print(f"bc epoch {epoch + 1}/{epochs}: nll={total / max(1, batches):.4f}")
+    policy.set_training_mode(False)
+
+
+def run_training(
+    cfg: TrainingConfig,
+    *,
+    run_name: str = "PPO",
+    bc_data: Optional[str] = None,
+    bc_epochs: int = 1,
+    bc_batch_size: int = 256,
+    resume: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Train one PPO run from ``cfg`` and return a JSON-friendly summary of it.
+
+    ``resume`` is a checkpoint directory or ``ckpt_*.zip``; training then continues
+    to ``cfg.total_timesteps`` on the same step counter and TensorBoard run.
+    """
+    if cfg.random_seed is not None:
+        set_random_seed(cfg.random_seed, using_cuda=False)
+
+    venv = DummyVecEnv([_make_vec_env(cfg)])
+    saved_state: Dict[str, Any] = {}
+    if resume is not None:
+        saved_state = resolve_checkpoint(resume)[2].get("state", {})
+        model, venv = load_checkpoint(
+            resume,
+            venv,
+            verbose=cfg.ppo_verbose,
+            tensorboard_log=cfg.tensorboard_log,
+        )
+    else:
+        if cfg.normalize_reward:
+            venv = VecNormalize(venv, norm_obs=False, norm_reward=True)
+        model = PPO(
+            "MultiInputPolicy",
+            venv,
+            verbose=cfg.ppo_verbose,
+            tensorboard_log=cfg.tensorboard_log,
+            seed=cfg.random_seed,
+        )
+    resumed_from = int(model.num_timesteps)
+
+    callbacks = []
+    checkpoint_state = {}
+    if cfg.curriculum:
+        # A resumed run picks up the saved stage and its success window.
+        curriculum = CurriculumCallback(
+            parse_stages(cfg.curriculum),
+            verbose=cfg.ppo_verbose,
+            state=saved_state.get("curriculum"),
+        )
+        # Queued before learn() resets the envs, so the first episodes use that stage.
+        curriculum.apply(venv)
+        callbacks.append(curriculum)
+        checkpoint_state["curriculum"] = curriculum.state
+    if cfg.checkpoint_dir is not None and cfg.checkpoint_freq > 0:
+        callbacks.append(CheckpointCallback(
+            Path(cfg.checkpoint_dir) / run_name,
+            cfg.checkpoint_freq,
+            run_name=run_name,
+            keep=cfg.checkpoints_to_keep,
+            state=checkpoint_state,
+            verbose=cfg.ppo_verbose,
+        ))
+    if cfg.metrics_freq > 0:
+        callbacks.append(MetricsCallback(cfg.metrics_freq, flush_secs=cfg.metrics_flush_secs, verbose=cfg.ppo_verbose))
+    if bc_data and resume is None:
+        behaviour_clone(
+            model,
+            bc_data,
+            epochs=bc_epochs,
+            batch_size=bc_batch_size,
+            seed=cfg.random_seed,
+        )
+    start = time.perf_counter()
+    model.learn(
+        total_timesteps=max(0, cfg.total_timesteps - resumed_from),
+        callback=callbacks,
+        tb_log_name=run_name,
+        reset_num_timesteps=resume is None,
+    )
+    elapsed = time.perf_counter() - start
+    episodes = list(model.ep_info_buffer or [])
+    venv.close()
+    return {
+        "run_name": run_name,
+        "seed": cfg.random_seed,
+        "resumed_from": resumed_from,
+        "timesteps": int(model.num_timesteps),
+        "wall_time_s": elapsed,
+        "steps_per_sec": (model.num_timesteps - resumed_from) / elapsed if elapsed > 0 else 0.0,
+        "ep_rew_mean": float(np.mean([e["r"] for e in episodes])) if episodes else None,
+        "ep_len_mean": float(np.mean([e["l"] for e in episodes])) if episodes else None,
+    }
+
+
 def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Train PPO on BananaGraml.")
     parser.add_argument(
@@ -35,21 +169,54 @@ def main(argv: list[str] | None = None) -> None:
         default=None,
         help="Path to training JSON (default: src/training_config.json next to training_config.py).",
     )
+    parser.add_argument("--run-name", type=str, default="PPO", help="TensorBoard run name.")
+    parser.add_argument("--seed", type=int, default=None, help="Overrides random_seed.")
+    parser.add_argument("--timesteps", type=int, default=None, help="Overrides total_timesteps.")
+    parser.add_argument("--tb-dir", type=str, default=None, help="Overrides tensorboard_log.")
+    parser.add_argument("--torch-threads", type=int, default=None, help="Cap torch intra-op threads.")
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="",
+        default=None,
+        help="Continue from a checkpoint dir or ckpt_*.zip (bare flag: <checkpoint_dir>/<run-name>).",
+    )
+    parser.add_argument(
+        "--bc-data",
+        type=str,
+        default=None,
+        help="Directory of datagen.py shards to behaviour-clone from before PPO.",
+    )
+    parser.add_argument("--bc-epochs", type=int, default=1)
+    parser.add_argument("--bc-batch-size", type=int, default=256)
     args = parser.parse_args(argv)
 
-    cfg = load_training_config(args.config)
-    if cfg.random_seed is not None:
-        set_random_seed(cfg.random_seed, using_cuda=False)
+    if args.torch_threads is not None:
+        import torch
 
-    venv = DummyVecEnv([_make_vec_env(cfg)])
-    model = PPO(
-        "MultiInputPolicy",
-        venv,
-        verbose=cfg.ppo_verbose,
-        tensorboard_log=cfg.tensorboard_log,
+        torch.set_num_threads(args.torch_threads)
+
+    cfg = override_config(
+        load_training_config(args.config),
+        random_seed=args.seed,
+        total_timesteps=args.timesteps,
+        tensorboard_log=args.tb_dir,
+    )
+    if cfg.headless:
+        use_offscreen_driver()
+    resume = args.resume
+    if resume == "":
+        if cfg.checkpoint_dir is None:
+            parser.error("--resume without a path needs checkpoint_dir in the config")
+        resume = str(Path(cfg.checkpoint_dir) / args.run_name)
+    run_training(
+        cfg,
+        run_name=args.run_name,
+        bc_data=args.bc_data,
+        bc_epochs=args.bc_epochs,
+        bc_batch_size=args.bc_batch_size,
+        resume=resume,
     )
-    model.learn(total_timesteps=cfg.total_timesteps)
-    venv.close()
 
 
 if __name__ == "__main__":
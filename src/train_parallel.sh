@@ -2,10 +2,12 @@
 # Run several training jobs in parallel; compare in one TensorBoard UI.
 #
 #   chmod +x train_parallel.sh
-#   ./train_parallel.sh
+#   ./train_parallel.sh [RUNS] [TIMESTEPS]
 #   tensorboard --logdir ./tensorboard_logs
 #
-# Uses BANANAGRAML_HEADLESS=1 so pygame does not open N windows.
+# sweep.py pins each run to its own CPUs, caps torch at THREADS_PER_RUN
+# threads and runs headless, then writes $TB_ROOT/sweep_summary.json.
+# BANANAGRAML_HEADLESS=1 keeps anything else started from here offscreen too.
 
 set -euo pipefail
 cd "$(dirname "$0")"
@@ -13,22 +15,17 @@ cd "$(dirname "$0")"
 RUNS="${1:-3}"
 TS="${2:-90000}"
 TB_ROOT="${TB_ROOT:-./tensorboard_logs}"
+THREADS_PER_RUN="${THREADS_PER_RUN:-1}"
 
-# export BANANAGRAML_HEADLESS="${BANANAGRAML_HEADLESS:-1}"
+export BANANAGRAML_HEADLESS="${BANANAGRAML_HEADLESS:-1}"
 
-pids=()
-for i in $(seq 1 "$RUNS"); do
-  name="parallel_${i}"
-  seed=$((4200 + i))
-  echo "Starting $name seed=$seed timesteps=$TS"
-  python train.py --run-name "$name" --seed "$seed" --timesteps "$TS" --tb-dir "$TB_ROOT" &
-  pids+=($!)
-done
-
-echo "Waiting on PIDs: ${pids[*]}"
-for pid in "${pids[@]}"; do
-  wait "$pid"
-done
+echo "Starting $RUNS runs, timesteps=$TS"
+python sweep.py \
+  --runs "$RUNS" \
+  --seed-base 4200 \
+  --timesteps "$TS" \
+  --tb-dir "$TB_ROOT" \
+  --threads-per-run "$THREADS_PER_RUN"
 
 echo "All runs finished. Compare runs:"
 echo "  tensorboard --logdir $(pwd)/$TB_ROOT"
@@ -3,14 +3,17 @@ Load training / RL settings from ``training_config.json`` (or a path you pass in
 
 Edit the JSON to change runs without touching code. Unknown keys are ignored so you
 can add notes in a copy of the file if you use a strict JSON parser elsewhere.
+``BANANAGRAML_HEADLESS=1`` in the environment forces ``headless`` on (no windows,
+the envs draw offscreen) whatever the file says.
 """
 
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import os
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Mapping, Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 
 _CONFIG_DIR = Path(__file__).resolve().parent
@@ -27,6 +30,23 @@ class TrainingConfig:
     random_seed: Optional[int]
     ppo_verbose: int
     tensorboard_log: Optional[str]
+    board_backend: str
+    board_encoding: str
+    obs_dtype: str
+    crosshair_units: str
+    board_window: Optional[Tuple[int, int]]
+    move_repeat: int
+    move_until_tile: bool
+    dump_helper: bool
+    curriculum: Optional[Tuple[Dict[str, Any], ...]]
+    record_dir: Optional[str]
+    record_checkpoint_every: int
+    checkpoint_dir: Optional[str]
+    checkpoint_freq: int
+    checkpoints_to_keep: int
+    normalize_reward: bool
+    metrics_freq: int
+    metrics_flush_secs: float
 
 
 def _defaults() -> dict[str, Any]:
@@ -39,6 +59,23 @@ def _defaults() -> dict[str, Any]:
         "random_seed": None,
         "ppo_verbose": 1,
         "tensorboard_log": "tensorboard_logs/default",
+        "board_backend": "dense",
+        "board_encoding": "codes",
+        "obs_dtype": "float32",
+        "crosshair_units": "pixels",
+        "board_window": None,
+        "move_repeat": 1,
+        "move_until_tile": False,
+        "dump_helper": False,
+        "curriculum": None,
+        "record_dir": None,
+        "record_checkpoint_every": 100,
+        "checkpoint_dir": "checkpoints",
+        "checkpoint_freq": 0,
+        "checkpoints_to_keep": 3,
+        "normalize_reward": False,
+        "metrics_freq": 0,
+        "metrics_flush_secs": 10.0,
     }
 
 
@@ -61,16 +98,93 @@ def load_training_config(path: Optional[str | Path] = None) -> TrainingConfig:
         for key, value in raw.items():
             if key in data:
                 data[key] = value
+    if _as_bool(os.environ.get("BANANAGRAML_HEADLESS", False)):
+        data["headless"] = True
 
+    return _from_mapping(data)
+
+
+def override_config(cfg: TrainingConfig, **overrides: Any) -> TrainingConfig:
+    """
+    Return a copy of ``cfg`` with ``overrides`` applied (``None`` values are skipped).
+
+    Values go through the same coercion as the JSON file, so CLI strings such as
+    ``"20000"`` or ``"true"`` are accepted. Unknown keys raise ``ValueError``.
+    """
+    data = asdict(cfg)
+    unknown = sorted(set(overrides) - set(data))
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(unknown)}")
+    for key, value in overrides.items():
+        if value is not None:
+            data[key] = value
+    return _from_mapping(data)
+
+
+def env_kwargs(cfg: TrainingConfig) -> Dict[str, Any]:
+    """Keyword arguments for ``BananaGramlEnvironment`` (everything but ``render_mode``)."""
+    return {
+        "starting_tiles_on_bench": cfg.starting_tiles_on_bench,
+        "max_bench_tiles": cfg.max_bench_tiles,
+        "board_backend": cfg.board_backend,
+        "board_encoding": cfg.board_encoding,
+        "obs_dtype": cfg.obs_dtype,
+        "crosshair_units": cfg.crosshair_units,
+        "board_window": cfg.board_window,
+        "move_repeat": cfg.move_repeat,
+        "move_until_tile": cfg.move_until_tile,
+        "dump_helper": cfg.dump_helper,
+        "record_dir": cfg.record_dir,
+        "record_checkpoint_every": cfg.record_checkpoint_every,
+    }
+
+
+def _as_pair(value: Any) -> Tuple[int, int]:
+    if isinstance(value, str):
+        value = value.replace("x", ",").split(",")
+    rows, cols = value
+    return int(rows), int(cols)
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def _from_mapping(data: Mapping[str, Any]) -> TrainingConfig:
     return TrainingConfig(
         total_timesteps=int(data["total_timesteps"]),
-        headless=bool(data["headless"]),
+        headless=_as_bool(data["headless"]),
         max_episode_steps=int(data["max_episode_steps"]),
         starting_tiles_on_bench=int(data["starting_tiles_on_bench"]),
         max_bench_tiles=int(data["max_bench_tiles"]),
-        random_seed=None if data["random_seed"] is None else int(data["random_seed"]),
+        random_seed=None if data["random_seed"] in (None, "") else int(data["random_seed"]),
         ppo_verbose=int(data["ppo_verbose"]),
         tensorboard_log=None
         if data.get("tensorboard_log") in (None, "")
         else str(data["tensorboard_log"]),
+        board_backend=str(data["board_backend"]),
+        board_encoding=str(data["board_encoding"]),
+        obs_dtype=str(data["obs_dtype"]),
+        crosshair_units=str(data["crosshair_units"]),
+        board_window=None
+        if data.get("board_window") in (None, "")
+        else _as_pair(data["board_window"]),
+        move_repeat=int(data["move_repeat"]),
+        move_until_tile=_as_bool(data["move_until_tile"]),
+        dump_helper=_as_bool(data["dump_helper"]),
+        curriculum=None
+        if not data.get("curriculum")
+        else tuple(dict(stage) for stage in data["curriculum"]),
+        record_dir=None if data.get("record_dir") in (None, "") else str(data["record_dir"]),
+        record_checkpoint_every=int(data["record_checkpoint_every"]),
+        checkpoint_dir=None
+        if data.get("checkpoint_dir") in (None, "")
+        else str(data["checkpoint_dir"]),
+        checkpoint_freq=int(data["checkpoint_freq"]),
+        checkpoints_to_keep=int(data["checkpoints_to_keep"]),
+        normalize_reward=_as_bool(data["normalize_reward"]),
+        metrics_freq=int(data["metrics_freq"]),
+        metrics_flush_secs=float(data["metrics_flush_secs"]),
     )
@@ -0,0 +1,370 @@
+"""
+Fuzz the board validators against a plain reference and time them.
+
+Random boards (crossword-style growth from dictionary words, then letter
+swaps, extra and removed tiles, plus random scatters) are checked by:
+
+    reference    every tile has a neighbour and every maximal run of 2+ is a word
+    full         BananaGramlModel.validate() on a dense board (build_words, or
+                 the compiled run scan in runs.py when numba is installed)
+    incremental  the dense model's board_valid after each place_tile_at
+                 (validate_after_placing where it applies)
+    undo         board_valid after undoing every placement again (undo journal)
+    sparse       BananaGramlModel.validate() on the sparse backend
+    --validator  any module:function(grid, rows, cols) -> bool, grid being
+                 {(row, col): letter}
+
+and any disagreement with the reference is printed with the board::
+
+    python validation_fuzz.py --boards 2000 --seed 0
+    python validation_fuzz.py --edges --validator my_validators:numpy_validate
+
+Dense validation reads past the outer ring (``board[i + 1]`` raises on the
+last row / column, ``board[i - 1]`` wraps to the far side), so boards normally
+stay off it. ``--edges`` adds boards touching the ring; production results
+there are reported as edge divergences and only fail the run with ``--strict``.
+Exit status is 1 when any validator disagrees with the reference.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from env import board_dimensions
+from game.src.game.model import BananaGramlModel, ModelTile, PlacedTile, dictionary
+
+Cell = Tuple[int, int]
+Grid = Dict[Cell, str]
+Validator = Callable[[Grid, int, int], bool]
+
+_ROWS = board_dimensions[1] // board_dimensions[2]
+_COLS = board_dimensions[0] // board_dimensions[2]
+_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def reference_runs(grid: Grid) -> List[str]:
+    runs = []
+    for (r, c) in grid:
+        for dr, dc in ((0, 1), (1, 0)):
+            if (r - dr, c - dc) in grid or (r + dr, c + dc) not in grid:
+                continue
+            word, i, j = "", r, c
+            while (i, j) in grid:
+                word += grid[(i, j)]
+                i, j = i + dr, j + dc
+            runs.append(word)
+    return runs
+
+
+def reference_valid(grid: Grid, rows: int = _ROWS, cols: int = _COLS) -> bool:
+    """the rules as written, with no board edges to trip over."""
+    for (r, c) in grid:
+        if not any(n in grid for n in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))):
+            return False
+    return all(run.upper() in dictionary for run in reference_runs(grid))
+
+
+def _center(model: BananaGramlModel, row: int, col: int):
+    if model.sparse_board is not None:
+        d = model.divider
+        return (col * d + d // 2, row * d + d // 2)
+    return model.coordinates[row][col].get_center()
+
+
+def build_model(grid: Grid, sparse: bool = False) -> BananaGramlModel:
+    """a model with `grid` on its board, not yet validated."""
+    model = BananaGramlModel(board_dimensions, seed=0, sparse=sparse)
+    model.write_board_dump = False
+    for (r, c), letter in grid.items():
+        tile = PlacedTile(ModelTile(letter, None))
+        tile.model_tile.set_position(_center(model, r, c))
+        model.tiles_on_board.append(tile)
+        if sparse:
+            model.sparse_board.place(r, c, tile.model_tile)
+    return model
+
+
+def _production(grid: Grid, sparse: bool) -> Tuple[Optional[bool], float]:
+    """(result or None if it raised, seconds spent in validate())."""
+    model = build_model(grid, sparse)
+    start = time.perf_counter()
+    try:
+        result = model.validate()
+    except IndexError:
+        result = None
+    return result, time.perf_counter() - start
+
+
+def full_validate(grid: Grid) -> Tuple[Optional[bool], float]:
+    return _production(grid, sparse=False)
+
+
+def sparse_validate(grid: Grid) -> Tuple[Optional[bool], float]:
+    return _production(grid, sparse=True)
+
+
+def incremental_check(grid: Grid, rng: random.Random) -> Tuple[List[Tuple[Grid, Optional[bool]]], int, float]:
+    """
+    places the tiles one at a time in random order; returns the boards seen
+    along the way with board_valid after each (None if a placement raised),
+    then checks that undoing every placement gives the same answers back.
+    the first `placed` steps are placements, the rest undos.
+    """
+    model = BananaGramlModel(board_dimensions, seed=0)
+    model.write_board_dump = False
+    model.reset(seed=0)
+    cells = list(grid)
+    rng.shuffle(cells)
+    model.tiles_on_bench = [ModelTile(grid[cell], None) for cell in cells]
+    model.start_journal()
+    seen: List[Tuple[Grid, Optional[bool]]] = []
+    partial: Grid = {}
+    elapsed = 0.0
+    for cell, tile in zip(cells, list(model.tiles_on_bench)):
+        partial[cell] = grid[cell]
+        start = time.perf_counter()
+        try:
+            model.place_tile_at(tile, *cell)
+            result = model.board_valid
+        except IndexError:
+            result = None
+        elapsed += time.perf_counter() - start
+        seen.append((dict(partial), result))
+        if result is None:
+            break
+    undone: List[Tuple[Grid, Optional[bool]]] = []
+    for k in range(len(seen) - 1, 0, -1):
+        model.undo()
+        undone.append((seen[k - 1][0], model.board_valid))
+    return seen + [(g, v) for g, v in undone], len(seen), elapsed
+
+
+# --- board generation ------------------------------------------------------
+
+
+class BoardGenerator:
+    def __init__(self, rng: random.Random, *, edges: bool = False):
+        self.rng = rng
+        self.edges = edges
+        words = [w for w in dictionary if 2 <= len(w) <= 6 and w.isalpha()]
+        words.sort()
+        self.words = words
+        self.by_letter: Dict[str, List[str]] = defaultdict(list)
+        for w in words:
+            for letter in set(w):
+                self.by_letter[letter].append(w)
+
+    def _in_bounds(self, r: int, c: int) -> bool:
+        if self.edges:
+            return 0 <= r < _ROWS and 0 <= c < _COLS
+        return 0 < r < _ROWS - 1 and 0 < c < _COLS - 1
+
+    def crossword(self, steps: int) -> Grid:
+        rng = self.rng
+        grid: Grid = {}
+        word = rng.choice(self.words)
+        r = rng.randrange(1, _ROWS - 1)
+        c = rng.randrange(1, max(2, _COLS - 1 - len(word)))
+        for k, letter in enumerate(word):
+            if self._in_bounds(r, c + k):
+                grid[(r, c + k)] = letter
+        for _ in range(steps):
+            if not grid:
+                break
+            (r, c), letter = rng.choice(list(grid.items()))
+            word = rng.choice(self.by_letter[letter])
+            at = rng.choice([k for k, ch in enumerate(word) if ch == letter])
+            dr, dc = rng.choice(((0, 1), (1, 0)))
+            cells = [(r + (k - at) * dr, c + (k - at) * dc) for k in range(len(word))]
+            if all(self._in_bounds(*cell) and grid.get(cell, word[k]) == word[k] for k, cell in enumerate(cells)):
+                for k, cell in enumerate(cells):
+                    grid[cell] = word[k]
+        return grid
+
+    def mutate(self, grid: Grid) -> Grid:
+        rng = self.rng
+        grid = dict(grid)
+        for _ in range(rng.randint(1, 3)):
+            kind = rng.random()
+            if kind < 0.4 and grid:
+                grid[rng.choice(list(grid))] = rng.choice(_ALPHABET)
+            elif kind < 0.7 and grid:
+                del grid[rng.choice(list(grid))]
+            elif grid:
+                r, c = rng.choice(list(grid))
+                dr, dc = rng.choice(((0, 1), (1, 0), (0, -1), (-1, 0)))
+                if self._in_bounds(r + dr, c + dc):
+                    grid.setdefault((r + dr, c + dc), rng.choice(_ALPHABET))
+        return grid
+
+    def scatter(self) -> Grid:
+        rng = self.rng
+        grid: Grid = {}
+        r0, c0 = rng.randrange(1, _ROWS - 4), rng.randrange(1, _COLS - 4)
+        for _ in range(rng.randint(1, 10)):
+            r, c = r0 + rng.randrange(4), c0 + rng.randrange(4)
+            if self._in_bounds(r, c):
+                grid[(r, c)] = rng.choice(_ALPHABET)
+        return grid
+
+    def ring(self) -> Grid:
+        """a word along (or just off) the outer ring."""
+        rng = self.rng
+        word = rng.choice(self.words)
+        side = rng.randrange(4)
+        if side == 0:
+            return {(0, 3 + k): ch for k, ch in enumerate(word)}
+        if side == 1:
+            return {(_ROWS - 1, 3 + k): ch for k, ch in enumerate(word)}
+        if side == 2:
+            return {(3 + k, 0): ch for k, ch in enumerate(word) if 3 + k < _ROWS}
+        return {(3 + k, _COLS - 1): ch for k, ch in enumerate(word) if 3 + k < _ROWS}
+
+    def board(self) -> Grid:
+        rng = self.rng
+        kind = rng.random()
+        if self.edges and kind < 0.1:
+            return self.ring()
+        if kind < 0.25:
+            return self.scatter()
+        grid = self.crossword(rng.randint(0, 8))
+        return self.mutate(grid) if kind < 0.7 else grid
+
+
+def touches_ring(grid: Grid) -> bool:
+    return any(r in (0, _ROWS - 1) or c in (0, _COLS - 1) for r, c in grid)
+
+
+def show(grid: Grid) -> str:
+    if not grid:
+        return "(empty)"
+    r0 = min(r for r, _ in grid)
+    r1 = max(r for r, _ in grid)
+    c0 = min(c for _, c in grid)
+    c1 = max(c for _, c in grid)
+    lines = [f"rows {r0}-{r1}, cols {c0}-{c1}"]
+    for r in range(r0, r1 + 1):
+        lines.append("".join(grid.get((r, c), ".") for c in range(c0, c1 + 1)))
+    return "\n".join(lines)
+
+
+def load_validator(spec: str) -> Validator:
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"--validator expects module:function, got {spec!r}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def fuzz(
+    boards: int,
+    *,
+    seed: int = 0,
+    edges: bool = False,
+    strict: bool = False,
+    extra: Optional[Dict[str, Validator]] = None,
+    show_limit: int = 5,
+) -> Dict[str, object]:
+    rng = random.Random(seed)
+    gen = BoardGenerator(rng, edges=edges)
+    extra = dict(extra or {})
+    names = ["full", "incremental", "undo", "sparse", *extra]
+    mismatches: Counter = Counter()
+    edge_divergence: Counter = Counter()
+    timings: Counter = Counter()
+    checked: Counter = Counter()
+    verdicts: Counter = Counter()
+    shown = 0
+    # one-off costs (word key table, numba compilation) stay out of the timings.
+    for sparse in (False, True):
+        _production({(1, 1): "A", (1, 2): "T"}, sparse)
+
+    def report(name: str, grid: Grid, want: bool, got) -> None:
+        nonlocal shown
+        on_ring = touches_ring(grid)
+        if on_ring and not strict and name in ("full", "incremental", "undo"):
+            edge_divergence["raised" if got is None else "wrong"] += 1
+            return
+        mismatches[name] += 1
+        if shown < show_limit:
+            shown += 1
+            print(f"[{name}] expected {want}, got {'IndexError' if got is None else got}\n{show(grid)}\n")
+
+    for _ in range(boards):
+        grid = gen.board()
+        start = time.perf_counter()
+        want = reference_valid(grid)
+        timings["reference"] += time.perf_counter() - start
+        checked["reference"] += 1
+        verdicts[want] += 1
+
+        for name, fn in (("full", full_validate), ("sparse", sparse_validate)):
+            got, spent = fn(grid)
+            timings[name] += spent
+            checked[name] += 1
+            if got != want:
+                report(name, grid, want, got)
+
+        steps, placed, spent = incremental_check(grid, rng)
+        timings["incremental"] += spent
+        checked["incremental"] += placed
+        for k, (partial, got) in enumerate(steps):
+            expected = reference_valid(partial)
+            if got != expected:
+                report("incremental" if k < placed else "undo", partial, expected, got)
+        checked["undo"] += len(steps) - placed
+
+        for name, fn in extra.items():
+            start = time.perf_counter()
+            try:
+                got = fn(grid, _ROWS, _COLS)
+            except Exception as exc:  # a candidate validator may fail in any way
+                got = None
+                print(f"[{name}] raised {exc!r}")
+            timings[name] += time.perf_counter() - start
+            checked[name] += 1
+            if got != want:
+                report(name, grid, want, got)
+
+    throughput = {
+        name: checked[name] / timings[name] if timings[name] > 0 else 0.0
+        for name in ["reference", *[n for n in names if n != "undo"]]
+    }
+    return {
+        "boards": boards,
+        "valid": verdicts[True],
+        "invalid": verdicts[False],
+        "mismatches": {name: mismatches[name] for name in names},
+        "edge_divergence": dict(edge_divergence),
+        "checks_per_sec": throughput,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Fuzz board validators against a reference.")
+    parser.add_argument("--boards", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--edges", action="store_true", help="Also generate boards touching the outer ring.")
+    parser.add_argument("--strict", action="store_true", help="Count edge divergences as failures.")
+    parser.add_argument("--validator", action="append", default=[], metavar="MODULE:FUNCTION")
+    parser.add_argument("--show", type=int, default=5, help="Failing boards to print.")
+    args = parser.parse_args(argv)
+
+    extra = {spec: load_validator(spec) for spec in args.validator}
+    result = fuzz(args.boards, seed=args.seed, edges=args.edges, strict=args.strict, extra=extra, show_limit=args.show)
+
+    print(f"boards: {result['boards']} (valid {result['valid']} / invalid {result['invalid']})")
+    print("mismatches: " + " ".join(f"{k}={v}" for k, v in result["mismatches"].items()))
+    if result["edge_divergence"]:
+        print("edge divergences (outer ring): " + " ".join(f"{k}={v}" for k, v in result["edge_divergence"].items()))
+    print("checks/sec: " + " ".join(f"{k}={v:,.0f}" for k, v in result["checks_per_sec"].items()))
+    sys.exit(1 if any(result["mismatches"].values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Episode videos from offscreen envs, encoded off the stepping thread.
+
+An env made with ``render_mode="rgb_array"`` draws into an offscreen surface
+(SDL dummy driver, no window) and only when ``render()`` is called, so the
+caller renders just the episodes it records::
+
+    recorder = VideoRecorder("videos", every=10)
+    if recorder.wants(episode):
+        frames = [env.render()]
+        ...  # frames.append(env.render()) after each step
+        recorder.submit(f"episode_{episode:05d}", frames)
+    recorder.close()
+
+``submit`` hands the frames to a background thread that writes a GIF (needs
+Pillow) or, with ``fmt="frames"`` or without Pillow, a directory of PNGs.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+_FORMATS = ("gif", "frames")
+
+
+class VideoRecorder:
+    """
+    Writes submitted episodes under ``out_dir`` from a daemon thread.
+    ``every``: record episodes 0, every, 2*every, ... (0 records none).
+    ``submit`` blocks only when ``max_queue`` episodes are already waiting.
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        *,
+        every: int = 10,
+        fps: int = 10,
+        fmt: str = "gif",
+        max_queue: int = 8,
+    ):
+        if fmt not in _FORMATS:
+            raise ValueError(f"fmt must be one of {_FORMATS}, got {fmt!r}")
+        if every < 0:
+            raise ValueError("every must be non-negative")
+        if fmt == "gif":
+            try:
+                import PIL.Image  # noqa: F401
+            except ImportError:
+                print("video: Pillow is not installed, writing PNG frames instead of GIFs")
+                fmt = "frames"
+        self.out_dir = out_dir
+        self.every = every
+        self.fps = fps
+        self.fmt = fmt
+        self.written: List[str] = []
+        self.errors = 0
+        os.makedirs(out_dir, exist_ok=True)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="video-writer", daemon=True)
+        self._thread.start()
+
+    def wants(self, episode: int) -> bool:
+        return self.every > 0 and episode % self.every == 0
+
+    def submit(self, name: str, frames: Sequence[np.ndarray]) -> None:
+        if frames:
+            self._queue.put((name, list(frames)))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            name, frames = item
+            try:
+                self.written.append(self._write(name, frames))
+            except Exception as exc:  # a bad clip shouldn't take the run down
+                self.errors += 1
+                print(f"video: could not write {name}: {exc!r}")
+
+    def _write(self, name: str, frames: List[np.ndarray]) -> str:
+        if self.fmt == "gif":
+            from PIL import Image
+
+            path = os.path.join(self.out_dir, name + ".gif")
+            images = [Image.fromarray(frame) for frame in frames]
+            images[0].save(
+                path,
+                save_all=True,
+                append_images=images[1:],
+                duration=max(1, round(1000 / self.fps)),
+                loop=0,
+            )
+            return path
+
+        import pygame
+
+        path = os.path.join(self.out_dir, name)
+        os.makedirs(path, exist_ok=True)
+        for i, frame in enumerate(frames):
+            surface = pygame.surfarray.make_surface(np.transpose(frame, (1, 0, 2)))
+            pygame.image.save(surface, os.path.join(path, f"frame_{i:05d}.png"))
+        return path
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Writes whatever is still queued, then stops the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)